@@ -50,9 +50,9 @@ else:
 
     # Load core modules - these will register with the already initialized registry
     try:
-        from src.VOICE.voice import detect_wake_word, record_audio, transcribe_audio, tts_speak, wait_for_tts_completion, is_tts_available, list_audio_devices
+        from src.VOICE.voice import detect_wake_word, record_audio, transcribe_audio, tts_speak, wait_for_tts_completion, is_tts_available, list_audio_devices, stop_speaking
         # --- VORTEX.PY CHANGE: Import the renamed function ---
-        from src.Boring.boring import call_ai_provider, add_user_input, display_startup_message, initialize_ai_client_for_loop
+        from src.Boring.boring import run_turn, display_startup_message, initialize_ai_client_for_loop, register_intent, TurnCancelledError
         from src.Boring.debug_logger import log_debug_event
         # -----------------------------------------------------
         from src.Capabilities.debug_mode import set_debug_mode, get_debug_mode
@@ -66,19 +66,20 @@ else:
          sys.exit(1)
 
 # Define an async wrapper for our tts_speak function to maintain compatibility
-async def speak_text(text, wait_for_completion=False):
+async def speak_text(text, wait_for_completion=False, cancel_token=None):
     """
     Speak text using TTS engine. If TTS is unavailable, prints to console.
 
     Args:
         text: The text to speak
         wait_for_completion: If True, wait for TTS to complete before returning
+        cancel_token: The turn's CancellationToken; speech stops when it fires
     """
     if not text: # Don't try to speak empty strings
         return
 
     if is_tts_available():
-        tts_speak(text) # Add to the TTS queue
+        tts_speak(text, cancel_token=cancel_token) # Add to the TTS queue
         await asyncio.sleep(0.1) # Small delay to ensure the queue processing has started
         if wait_for_completion:
             # Wait in small chunks to keep the event loop responsive
@@ -89,6 +90,20 @@ async def speak_text(text, wait_for_completion=False):
         print(f"{COLOR_YELLOW}[TTS UNAVAILABLE] VORTEX would say: {text}{COLOR_RESET}")
 
 
+# Voice commands answered locally, without a round trip to the AI provider
+register_intent(
+    "list_audio_devices",
+    [r"(?:list|show)(?: the| my)? (?:audio )?devices", r"(?:list|show)(?: the| my)? microphones", r"audio devices"],
+    handler=lambda: list_audio_devices(),
+    reply="I've listed the available audio devices in the console.",
+)
+register_intent(
+    "stop_speaking",
+    [r"stop(?: talking| speaking)?", r"(?:be )?quiet", r"shut up", r"silence"],
+    handler=lambda: stop_speaking(),
+    reply="Okay.",
+)
+
 # ANSI Color Codes for Terminal Output
 COLOR_BLUE = "\033[94m"
 COLOR_GREEN = "\033[92m"
@@ -98,14 +113,14 @@ COLOR_RESET = "\033[0m"
 
 async def process_input(user_input):
     """
-    Adds user input to history, calls the configured AI Provider's API,
-    and processes the response.
+    Adds user input to the local session's history, calls the configured
+    AI Provider's API, and processes the response. A new utterance barges in on
+    a turn that is still running; the interrupted turn returns None.
     """
-    add_user_input(user_input)  # Add user input to conversation history
-
-    # --- VORTEX.PY CHANGE: Call the renamed function ---
-    response = await call_ai_provider()
-    # -------------------------------------------------
+    try:
+        response = await run_turn(user_input, interrupt=True)  # Runs as the "local" session
+    except TurnCancelledError:
+        return None
 
     return response # Return the response text (or None/error message)
 
@@ -346,6 +361,11 @@ if __name__ == "__main__":
                 except Exception as cleanup_e:
                     print(f"{COLOR_RED}[WARN] Error during AI client cleanup: {cleanup_e}{COLOR_RESET}")
                 finally:
+                    try:
+                        from src.Boring.capability_executor import shutdown_capability_executor
+                        shutdown_capability_executor()
+                    except Exception as executor_e:
+                        print(f"{COLOR_RED}[WARN] Error shutting down capability executor: {executor_e}{COLOR_RESET}")
                     loop.close()
                     
         except KeyboardInterrupt:
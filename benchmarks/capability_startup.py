@@ -0,0 +1,50 @@
+# benchmarks/capability_startup.py
+"""
+Measures how long initialize_capabilities() takes with every capability module
+imported at startup (VORTEX_LAZY_CAPABILITIES=false) versus registered from the
+manifest and imported on first use, with the manifest scanned from source every
+time or read from its cache. Each mode runs in a fresh interpreter so no module is
+already imported; background warm-up is turned off.
+
+Run from the repository root:
+    python benchmarks/capability_startup.py
+"""
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 3
+
+CHILD = """
+import io, sys, json, time, contextlib
+started = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    from src.Boring.capabilities import initialize_capabilities, get_initialization_status
+    initialize_capabilities()
+elapsed = time.perf_counter() - started
+status = get_initialization_status()
+print(json.dumps({"seconds": elapsed, "functions": status["registered_functions"], "imported": status["loaded_modules"]}))
+"""
+
+def measure(lazy, cache_path=""):
+    env = dict(os.environ, VORTEX_LAZY_CAPABILITIES=str(lazy).lower(), VORTEX_CAPABILITY_WARMUP="", VORTEX_MANIFEST_CACHE=cache_path)
+    env.setdefault("OPENAI_API_KEY", "sk-benchmark") # Some modules create an OpenAI client at import
+    results = []
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return min(results, key=lambda result: result["seconds"])
+
+def main():
+    cache_path = os.path.join(tempfile.mkdtemp(), "capability_manifest.json")
+    modes = [("eager", False, ""), ("lazy, scanned", True, ""), ("lazy, cached", True, cache_path)]
+    print(f"{'mode':<14} {'startup (best of ' + str(RUNS) + ')':>22} {'functions':>10} {'modules imported':>17}")
+    for name, lazy, cache in modes:
+        result = measure(lazy, cache) # The first cached run writes the cache; best-of picks a warm one
+        print(f"{name:<14} {result['seconds'] * 1000:>19.1f} ms {result['functions']:>10} {result['imported']:>17}")
+
+if __name__ == "__main__":
+    main()
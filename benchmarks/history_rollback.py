@@ -0,0 +1,51 @@
+# benchmarks/history_rollback.py
+"""
+Compares the per-turn cost of protecting the conversation history against failed
+requests: copying every message before each request (the old approach) versus
+recording a checkpoint length and truncating on rollback (ConversationHistory).
+
+Run from the repository root:
+    python benchmarks/history_rollback.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.Boring.sessions import ConversationHistory
+from src.Boring.messages import Message
+
+SESSION_SIZES = (10, 100, 1000, 5000)
+REQUESTS_PER_TURN = 3   # e.g. tool call request, tool follow-up, one retry
+TURNS = 2000
+
+def build_history(size):
+    history = ConversationHistory([{"role": "system", "content": "You are VORTEX."}])
+    for i in range(size - 1):
+        role = "user" if i % 2 == 0 else "assistant"
+        history.append({"role": role, "content": f"message {i} " + "lorem ipsum " * 20})
+    return history
+
+def turn_with_copies(history):
+    for _ in range(REQUESTS_PER_TURN):
+        history_before_call = [Message(msg.role, msg.content, msg.tool_calls, msg.tool_call_id, msg.name) for msg in history]
+        history.append({"role": "assistant", "content": "partial"})
+        history[:] = history_before_call
+
+def turn_with_checkpoint(history):
+    for _ in range(REQUESTS_PER_TURN):
+        checkpoint = history.checkpoint()
+        history.append({"role": "assistant", "content": "partial"})
+        history.rollback(checkpoint)
+
+def main():
+    print(f"{'messages':>10} {'copy (us/turn)':>16} {'checkpoint (us/turn)':>22} {'speedup':>9}")
+    for size in SESSION_SIZES:
+        history = build_history(size)
+        copy_time = min(timeit.repeat(lambda: turn_with_copies(history), number=TURNS // 10, repeat=3)) / (TURNS // 10)
+        checkpoint_time = min(timeit.repeat(lambda: turn_with_checkpoint(history), number=TURNS, repeat=3)) / TURNS
+        assert len(history) == size
+        print(f"{size:>10} {copy_time * 1e6:>16.2f} {checkpoint_time * 1e6:>22.2f} {copy_time / checkpoint_time:>8.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/message_memory.py
+"""
+Compares the memory held by a conversation history stored as plain dicts (the old
+representation, one dict per message and per tool call) versus the __slots__
+Message/ToolCall model, for the same mix of user, assistant, tool-call and tool
+result messages. If the OpenAI SDK is installed, its message objects are measured
+too, since those used to end up in the history directly.
+
+Run from the repository root:
+    python benchmarks/message_memory.py
+"""
+import os
+import sys
+import json
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.Boring.messages import Message, ToolCall
+
+MESSAGES = 1000
+CONTENT = "lorem ipsum " * 20
+
+# Contents are shared between all representations so only the containers are measured
+CONTENTS = [f"message {i} " + CONTENT for i in range(MESSAGES)]
+ARGUMENTS = [json.dumps({"query": f"item {i}", "limit": 5}) for i in range(MESSAGES)]
+
+def build_dicts():
+    history = []
+    for i in range(MESSAGES):
+        kind = i % 4
+        if kind == 0:
+            history.append({"role": "user", "content": CONTENTS[i]})
+        elif kind == 1:
+            history.append({"role": "assistant", "tool_calls": [
+                {"id": f"call_{i}", "type": "function", "function": {"name": "search", "arguments": ARGUMENTS[i]}}
+            ]})
+        elif kind == 2:
+            history.append({"role": "tool", "name": "search", "content": CONTENTS[i], "tool_call_id": f"call_{i - 1}"})
+        else:
+            history.append({"role": "assistant", "content": CONTENTS[i]})
+    return history
+
+def build_messages():
+    history = []
+    for i in range(MESSAGES):
+        kind = i % 4
+        if kind == 0:
+            history.append(Message("user", CONTENTS[i]))
+        elif kind == 1:
+            history.append(Message("assistant", tool_calls=[ToolCall(f"call_{i}", "search", ARGUMENTS[i])]))
+        elif kind == 2:
+            history.append(Message("tool", CONTENTS[i], tool_call_id=f"call_{i - 1}", name="search"))
+        else:
+            history.append(Message("assistant", CONTENTS[i]))
+    return history
+
+def build_sdk_objects():
+    from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
+    history = []
+    for i in range(MESSAGES):
+        kind = i % 4
+        if kind == 0:
+            history.append({"role": "user", "content": CONTENTS[i]})
+        elif kind == 1:
+            history.append(ChatCompletionMessage(role="assistant", content=None, tool_calls=[
+                ChatCompletionMessageToolCall(id=f"call_{i}", type="function", function={"name": "search", "arguments": ARGUMENTS[i]})
+            ]))
+        elif kind == 2:
+            history.append({"role": "tool", "name": "search", "content": CONTENTS[i], "tool_call_id": f"call_{i - 1}"})
+        else:
+            history.append(ChatCompletionMessage(role="assistant", content=CONTENTS[i]))
+    return history
+
+def measure(build):
+    build() # Warm up imports and interned strings
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    history = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return size, history
+
+def main():
+    rows = [("dicts", build_dicts), ("Message", build_messages)]
+    try:
+        import openai # noqa: F401
+        rows.insert(1, ("OpenAI SDK objects", build_sdk_objects))
+    except ImportError:
+        pass
+
+    print(f"{'representation':<20} {'KiB / 1000 msgs':>16} {'bytes / msg':>12}")
+    baseline = None
+    for name, build in rows:
+        size, history = measure(build)
+        assert len(history) == MESSAGES
+        baseline = baseline or size
+        print(f"{name:<20} {size / 1024 * 1000 / MESSAGES:>16.1f} {size / MESSAGES:>12.0f}  ({size / baseline:.0%} of dicts)")
+
+if __name__ == "__main__":
+    main()
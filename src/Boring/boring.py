@@ -1,18 +1,37 @@
 # src/Boring/boring.py
-import openai
-import ollama
 import json
 import os
 import asyncio
 import inspect
+import time
+import threading
 import re # For stripping <think> tags
 import tiktoken # For history limiting
 from dotenv import load_dotenv
 from src.Boring.capabilities import get_function_registry, get_function_schemas
 import src.Boring.capabilities as capabilities
-from src.Capabilities.local.memory import retrieve_memory # Ensure this handles errors gracefully
 from src.Capabilities.debug_mode import set_debug_mode, get_debug_mode
 from .debug_logger import log_debug_event, register_frontend_debug_emitter # MOVED log_debug_event
+from .capability_executor import run_capability, CapabilityTimeoutError, CAPABILITY_DEFAULT_TIMEOUT
+from .tool_router import select_tools, sticky_tools
+from .sessions import SessionManager, ConversationHistory, ThreadSafeAsyncLock, LOCAL_SESSION_ID
+from .session_store import session_store, SESSION_PERSIST_ENABLED
+from .scheduler import turn_scheduler, SchedulerBusyError, SchedulerTimeoutError, get_scheduler_metrics
+from .provider_client import ProviderClient, ProviderUnavailableError, backoff_delay
+from .providers import create_adapter, PROVIDER_REQUEST_TIMEOUT
+from .messages import Message
+from .prompt_assembler import assemble_prompt, memory_context_message, prompt_cache_stats, get_prompt_cache_stats
+from .response_cache import response_cache, tool_catalog_fingerprint, get_response_cache_stats, RESPONSE_CACHE_ENABLED
+from .usage import usage_store, get_usage_summary
+from .trace import trace_recorder, current_trace
+from .tool_budget import ToolBudget, original_result, is_shortened, RETRIEVE_TOOL_NAME
+from .tool_memo import ToolMemo
+from .cascade import cascade_router, get_cascade_stats, small_adapter_settings, CASCADE_ENABLED, CASCADE_SMALL_PROVIDER, CASCADE_SMALL_TIMEOUT, SMALL_TIER
+from .intents import intent_router, register_intent, get_intent_stats
+from .turn_pipeline import TurnContext, SpeculativeTurn, get_pipeline_stats
+from .cancellation import CancellationToken, TurnCancelledError, turn_tokens, BARGE_IN_ENABLED
+from .coalescer import input_coalescer, get_coalescer_stats, COALESCE_ENABLED
+from .deadline import Deadline, deadline_stats, get_deadline_stats, PREPARE_TIMEOUT, PROVIDER_MIN_TIMEOUT, TOOL_MIN_TIMEOUT, FINAL_ANSWER_RESERVE
 
 # ------------------------------
 # Debug Logging Setup
@@ -29,80 +48,71 @@ from .debug_logger import log_debug_event, register_frontend_debug_emitter # MOV
 # ------------------------------
 VORTEX_VERSION = "Alpha"
 load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-AI_PROVIDER = os.getenv("AI_PROVIDER", "openai").lower()
-OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "qwq:32b")
-OLLAMA_SERVER = os.getenv("OLLAMA_SERVER")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+AI_PROVIDER = os.getenv("AI_PROVIDER", "openai").lower() # Model/server settings live in providers.py
 
 # ------------------------------
 # AI Client Initialization (Deferred)
 # ------------------------------
-ai_client = None
+AI_FAILOVER_PROVIDER = os.getenv("AI_FAILOVER_PROVIDER", "").lower() # Optional second provider, e.g. "ollama"
+
+ai_client = None  # Adapter for AI_PROVIDER
+ai_adapters = {}  # Provider name -> connected adapter, including the failover provider when configured
+
+# Retries with backoff, optional hedging, and failover between the configured providers
+provider_client = ProviderClient([AI_PROVIDER, AI_FAILOVER_PROVIDER])
 
 def initialize_ai_client_for_loop():
-    """Initializes the AI client. Should be called from the asyncio event loop thread."""
+    """Initializes the AI provider adapter(s). Should be called from the asyncio event loop thread."""
     global ai_client
     if ai_client is not None: # Prevent re-initialization
         log_debug_event("AI client already initialized.")
         return
 
     log_debug_event(f"Initializing AI client for provider: {AI_PROVIDER}")
+    adapter = create_adapter(AI_PROVIDER)
+    adapter.connect()
+    adapter.warm_up()
+    ai_client = ai_adapters[AI_PROVIDER] = adapter
 
-    if AI_PROVIDER == "openai":
-        if not OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY missing for AI_PROVIDER='openai'")
-        ai_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
-        print(f"[CONFIG] Using AI Provider: OpenAI (Model: {OPENAI_MODEL})")
-    elif AI_PROVIDER == "ollama":
+    # The failover provider is optional; VORTEX still runs without it
+    if AI_FAILOVER_PROVIDER and AI_FAILOVER_PROVIDER != AI_PROVIDER:
         try:
-            ollama_options = {}
-            if OLLAMA_SERVER:
-                ollama_options['host'] = OLLAMA_SERVER
-            
-            # Create client with explicit timeout
-            ai_client = ollama.AsyncClient(
-                **ollama_options,
-                timeout=60.0  # 60 second timeout
-            )
-            # Sync check for connectivity (this is fine here as it's part of init)
-            try:
-                sync_client = ollama.Client(**ollama_options) # For sync check only
-                models = sync_client.list()
-                if isinstance(models, dict) and 'models' in models:
-                    model_names = [m.get('name', str(m)) for m in models['models']]
-                    print(f"[CONFIG] Using AI Provider: Ollama (Model: {OLLAMA_MODEL}, Server: {OLLAMA_SERVER or 'Default'}) - Connection OK")
-                    print(f"Available models: {model_names}")
-                else:
-                    print(f"[CONFIG] Using AI Provider: Ollama (Model: {OLLAMA_MODEL}, Server: {OLLAMA_SERVER or 'Default'}) - Connection OK")
-            except Exception as conn_err:
-                 print(f"[WARN] Ollama connection check failed (Server: {OLLAMA_SERVER or 'Default'}): {conn_err}. Proceeding...")
+            failover_adapter = create_adapter(AI_FAILOVER_PROVIDER)
+            failover_adapter.connect()
+            failover_adapter.warm_up()
+            ai_adapters[AI_FAILOVER_PROVIDER] = failover_adapter
+            print(f"[CONFIG] Failover provider: {failover_adapter.describe()}")
         except Exception as e:
-            # Log the error before raising, to ensure it's visible
-            log_debug_event(f"Failed to initialize Ollama client: {e}", is_error=True)
-            raise RuntimeError(f"Failed to initialize Ollama client: {e}")
-    else:
-        raise ValueError(f"Unsupported AI_PROVIDER: {AI_PROVIDER}. Choose 'openai' or 'ollama'.")
-
-    if ai_client is None:
-        # This case should ideally be caught by the specific provider logic
-        log_debug_event(f"AI client remained None after initialization attempt for {AI_PROVIDER}", is_error=True)
-        raise RuntimeError(f"AI Client could not be initialized for provider: {AI_PROVIDER}")
+            print(f"{COLOR_YELLOW}[WARN] Failover provider '{AI_FAILOVER_PROVIDER}' unavailable: {e}{COLOR_RESET}")
+
+    # The cascade's small model is optional too; without it every turn uses AI_PROVIDER
+    if CASCADE_ENABLED:
+        try:
+            small_adapter = create_adapter(CASCADE_SMALL_PROVIDER, **small_adapter_settings())
+            small_adapter.connect()
+            small_adapter.warm_up()
+            ai_adapters[SMALL_TIER] = small_adapter
+            print(f"[CONFIG] Cascade small model: {small_adapter.describe()}")
+        except Exception as e:
+            print(f"{COLOR_YELLOW}[WARN] Cascade small model unavailable: {e}{COLOR_RESET}")
     log_debug_event("AI client initialization complete.")
 
 async def cleanup_ai_client():
     """Cleanup function to properly close AI client connections."""
     global ai_client
-    if ai_client is not None:
+    for provider, adapter in list(ai_adapters.items()):
         try:
-            if AI_PROVIDER == "ollama":
-                # Close all connections in the Ollama client's connection pool
-                await ai_client.aclose()
-            log_debug_event("AI client cleanup completed successfully.")
+            await adapter.close()
+            log_debug_event(f"AI client cleanup completed successfully ({provider}).")
         except Exception as e:
-            log_debug_event(f"Error during AI client cleanup: {e}", is_error=True)
-        finally:
-            ai_client = None
+            log_debug_event(f"Error during AI client cleanup ({provider}): {e}", is_error=True)
+    ai_adapters.clear()
+    ai_client = None
+    await asyncio.to_thread(trace_recorder.flush)
+
+def get_provider_stats():
+    """Returns per-provider health, latency, hedging and failover statistics."""
+    return provider_client.stats()
 
 # ------------------------------
 # ANSI Escape Codes for Colors
@@ -133,12 +143,48 @@ def load_system_prompt():
     log_debug_event("Using default system prompt.")
     return default_prompt
 
-conversation_history = []
-def initialize_conversation_history():
-    """Initializes conversation history with the system prompt."""
-    global conversation_history
-    conversation_history = [{"role": "system", "content": load_system_prompt()}]
-initialize_conversation_history() # Initial call
+def new_conversation_history():
+    """Returns a fresh conversation history containing only the system prompt."""
+    return ConversationHistory([Message("system", load_system_prompt())])
+
+def restore_conversation_history(session_id):
+    """Rebuilds a session's history from its log (summary plus recent tail), or None if there is none."""
+    restored = session_store.load(session_id)
+    if not restored:
+        return None
+    history = new_conversation_history()
+    history.extend(restored)
+    return history
+
+# Each session (CLI, web cookie, socket sid) gets its own isolated history,
+# restored from its session log on first use after a restart
+session_manager = SessionManager(new_conversation_history, restore=restore_conversation_history if SESSION_PERSIST_ENABLED else None)
+
+def get_conversation_history(session_id=LOCAL_SESSION_ID):
+    """Returns the live conversation history list for a session."""
+    return session_manager.get(session_id).history
+
+def initialize_conversation_history(session_id=LOCAL_SESSION_ID):
+    """Resets a session's conversation history to just the system prompt."""
+    _reset_session(session_manager.get(session_id))
+
+def _reset_session(session):
+    session_manager.reset_session(session)
+    if SESSION_PERSIST_ENABLED:
+        session_store.reset(session.session_id)
+
+async def _persist_session(session):
+    """Appends the messages added since the last save to the session's log (fsync runs off the event loop)."""
+    if not SESSION_PERSIST_ENABLED:
+        return
+    new_messages = session.history[session.persisted_len:]
+    if not new_messages:
+        return
+    try:
+        await asyncio.to_thread(session_store.append, session.session_id, new_messages)
+        session.persisted_len = len(session.history)
+    except Exception as e:
+        log_debug_event(f"Failed to persist session {session.session_id}: {e}", is_error=True)
 
 # ------------------------------
 # Tokenizer for Debug Info Only
@@ -172,103 +218,364 @@ def estimate_tokens(text):
 # ------------------------------
 # AI Call & Function Processing
 # ------------------------------
-async def _call_openai(conversation_history, tools_param=None, tool_choice_param=None):
-    """Helper function to call the OpenAI API with the given parameters."""
-    if not ai_client: 
-        raise ConnectionError("OpenAI client missing")
-        
-    log_debug_event(f"Calling OpenAI API with {len(conversation_history)} messages.")
-        
-    response = await asyncio.wait_for(ai_client.chat.completions.create(
-        model=OPENAI_MODEL,
-        messages=conversation_history,
-        tools=tools_param,
-        tool_choice=tool_choice_param), 
-        timeout=60
-    )
-    
-    assistant_message = response.choices[0].message
-    return {
-        "content": assistant_message.content,
-        "tool_calls": assistant_message.tool_calls
-    }
-
-async def _call_ollama(conversation_history, tools_param=None):
-    """Helper function to call the Ollama API with the given parameters."""
-    if not ai_client: 
-        raise ConnectionError("Ollama client missing")
-        
-    log_debug_event(f"Calling Ollama API with {len(conversation_history)} messages.")
-    
-    # Create options for better context maintenance
-    ollama_options = {
-        'num_ctx': 8192,  # Larger context window
-        'top_k': 40,      # Consider more tokens
-        'top_p': 0.9,     # Nucleus sampling
-        'repeat_penalty': 1.1  # Reduce repetition
-    }
-    
-    # Increase context size if we have many tools
-    if tools_param and len(tools_param) > 5:
-        ollama_options["num_ctx"] = 16384
-        log_debug_event(f"Increased Ollama context window to 16384 due to {len(tools_param)} tools")
-    
-    # Following Ollama docs with added options for better context maintenance
-    response = await ai_client.chat(
-        model=OLLAMA_MODEL,
-        messages=conversation_history,
-        tools=tools_param,
-        stream=False,
-        options=ollama_options
+async def _request_completion(provider, conversation_history, tools_param=None, tool_choice_param=None, timeout=None):
+    """Sends one request through a provider's adapter. Retries and failover are handled by provider_client."""
+    adapter = ai_adapters.get(provider)
+    if adapter is None:
+        raise ConnectionError(f"{provider} client missing")
+    trace = current_trace()
+    started = time.monotonic()
+    try:
+        response = await adapter.chat(conversation_history, tools_param, tool_choice_param, timeout=timeout)
+    except asyncio.CancelledError:
+        if trace: trace.record("provider_call", provider=provider, latency_ms=round((time.monotonic() - started) * 1000, 1), cancelled=True)
+        raise # Losing hedge or abandoned turn; not a provider failure
+    except Exception as e:
+        usage_store.record_llm_call(provider, adapter.model, time.monotonic() - started, error=e)
+        if trace: trace.record("provider_call", provider=provider, latency_ms=round((time.monotonic() - started) * 1000, 1), error=f"{type(e).__name__}: {e}")
+        raise
+    usage_store.record_llm_call(provider, adapter.model, time.monotonic() - started, usage=response.get("usage"))
+    if trace: trace.record("provider_call", provider=provider, model=adapter.model, latency_ms=round((time.monotonic() - started) * 1000, 1), usage=response.get("usage"))
+    return response
+
+# ------------------------------
+# Tool Call Execution
+# ------------------------------
+TOOL_CALL_CONCURRENCY = max(1, int(os.getenv("VORTEX_TOOL_CONCURRENCY", "4")))
+
+# One lock per "serial" capability, shared by every session (they run on different event loops)
+_serial_locks = {}
+_serial_locks_guard = threading.Lock()
+
+def _serial_lock(function_name):
+    with _serial_locks_guard:
+        lock = _serial_locks.get(function_name)
+        if lock is None:
+            lock = _serial_locks[function_name] = ThreadSafeAsyncLock()
+        return lock
+
+def _parse_tool_call(tool_call):
+    """
+    Extracts (function_name, function_args, function_call_id) from a ToolCall.
+    Returns None if the tool call should be skipped.
+    """
+    function_name = tool_call.name
+    # OpenAI sends arguments as a JSON string, Ollama as a dict
+    try:
+        function_args = tool_call.parsed_arguments()
+    except json.JSONDecodeError:
+        print(f"{COLOR_RED}[❌ JSON ERROR] Invalid JSON args for tool {function_name}{COLOR_RESET}")
+        return None
+    except ValueError as e:
+        print(f"{COLOR_RED}[❌ ARG TYPE ERROR] Tool {function_name} {e}{COLOR_RESET}")
+        return None
+
+    if not function_name:
+        return None
+    return function_name, function_args, tool_call.id
+
+async def _execute_tool_call(function_name, function_args, cancel_token=None, deadline=None):
+    """
+    Runs a single registered capability and returns its result as a JSON string.
+    With a turn deadline, the capability's timeout is cut to what is left after
+    FINAL_ANSWER_RESERVE, and it is not started at all when too little is left. A
+    capability that declares its own "timeout" in its schema (data analytics, image
+    generation, ...) always gets all of it: the turn's deadline is extended instead.
+    """
+    if get_debug_mode(): print(f"[🛠️ TOOL CALL] Fn: {function_name}, Args: {function_args}")
+
+    function_to_call = get_function_registry().get(function_name)
+    if not function_to_call:
+        print(f"{COLOR_RED}[❌ MISSING FN] '{function_name}' not found.{COLOR_RESET}")
+        return json.dumps({"error": f"Function '{function_name}' not registered."})
+
+    trace = current_trace()
+    declared_timeout = capabilities.get_capability_option(function_name, "timeout")
+    timeout = declared_timeout or CAPABILITY_DEFAULT_TIMEOUT
+    if deadline is not None:
+        available = deadline.timeout(reserve=FINAL_ANSWER_RESERVE)
+        if available < TOOL_MIN_TIMEOUT:
+            print(f"{COLOR_YELLOW}[⏱️ FN SKIPPED] {function_name}: only {deadline.remaining():.1f}s left in the turn.{COLOR_RESET}")
+            deadline_stats.add("tools_skipped")
+            if trace: trace.record("tool", name=function_name, args=function_args, skipped=True, remaining_s=round(deadline.remaining(), 2))
+            return json.dumps({"error": f"Not enough time left in this turn to run {function_name}. Answer with what you already know.", "timeout": True})
+        if declared_timeout and declared_timeout > available:
+            extension = declared_timeout - available
+            deadline.extend(extension)
+            deadline_stats.add("deadlines_extended")
+            deadline_stats.add("seconds_extended", extension)
+            log_debug_event(f"Turn deadline extended by {extension:.1f}s for {function_name} (declared timeout {declared_timeout:g}s).")
+            if trace: trace.record("deadline_extended", name=function_name, seconds=round(extension, 2))
+            available = declared_timeout
+        timeout = min(timeout, available)
+
+    started = time.monotonic()
+    try:
+        function_result = await run_capability(function_name, function_to_call, function_args, timeout=timeout, cancel_token=cancel_token)
+
+        try: result_content_json = json.dumps(function_result)
+        except TypeError: result_content_json = json.dumps({"result": str(function_result)})
+
+        if get_debug_mode(): print(f"[✅ FN SUCCESS] Function: {function_name} -> {result_content_json[:100]}...")
+        usage_store.record_tool_call(function_name, time.monotonic() - started)
+        if trace: trace.record("tool", name=function_name, args=function_args, result=result_content_json, latency_ms=round((time.monotonic() - started) * 1000, 1))
+        return result_content_json
+    except CapabilityTimeoutError as e:
+        print(f"{COLOR_RED}[⏱️ FN TIMEOUT] {e}{COLOR_RESET}")
+        usage_store.record_tool_call(function_name, time.monotonic() - started, ok=False, timed_out=True)
+        if trace: trace.record("tool", name=function_name, args=function_args, error=str(e), timeout=True, latency_ms=round((time.monotonic() - started) * 1000, 1))
+        return json.dumps({"error": f"{e}. The capability may be slow or unavailable; try again later or use another approach.", "timeout": True})
+    except Exception as e:
+        print(f"{COLOR_RED}[❌ FN ERROR] Function: {function_name}: {e}{COLOR_RESET}")
+        usage_store.record_tool_call(function_name, time.monotonic() - started, ok=False)
+        if trace: trace.record("tool", name=function_name, args=function_args, error=str(e), latency_ms=round((time.monotonic() - started) * 1000, 1))
+        return json.dumps({"error": f"Execution failed: {str(e)}"})
+
+def _format_tool_response(function_name, function_call_id, result_content_json):
+    """Formats a tool result as a history message. Both providers accept the same shape."""
+    return Message("tool", result_content_json, tool_call_id=function_call_id, name=function_name)
+
+async def _run_tool_calls(assistant_tool_calls, tool_budget=None, cancel_token=None, deadline=None, tool_memo=None):
+    """
+    Executes all tool calls from one assistant turn concurrently (bounded by
+    TOOL_CALL_CONCURRENCY) and returns the tool responses in the original call order.
+    Capabilities flagged "serial" in their schema run one call at a time, in call order,
+    across all sessions.
+    With a tool_budget, oversized results are shortened (in call order) before they
+    enter the history, and retrieve_tool_output pages are sized to what is left of it.
+    Sync capabilities see cancel_token through capability_cancelled().
+    Each call's timeout is sized from the turn deadline, if given. With a tool_memo,
+    repeated calls to "read_only" capabilities reuse the turn's earlier result.
+    """
+    semaphore = asyncio.Semaphore(TOOL_CALL_CONCURRENCY)
+
+    async def run_one(tool_call):
+        function_name = None
+        try:
+            parsed = _parse_tool_call(tool_call)
+            if parsed is None:
+                return None
+            function_name, function_args, function_call_id = parsed
+            if function_name == RETRIEVE_TOOL_NAME and tool_budget is not None:
+                # Pages of stored output are sized to the budget here and never shortened afterwards
+                function_args = dict(function_args, max_tokens=tool_budget.retrieve_chunk_tokens(function_args.get("max_tokens")))
+
+            async def execute():
+                if capabilities.get_capability_option(function_name, "serial", False):
+                    async with _serial_lock(function_name):
+                        async with semaphore:
+                            return await _execute_tool_call(function_name, function_args, cancel_token, deadline)
+                async with semaphore:
+                    return await _execute_tool_call(function_name, function_args, cancel_token, deadline)
+
+            if tool_memo is not None:
+                result_content_json = await tool_memo.run(function_name, function_args, execute)
+            else:
+                result_content_json = await execute()
+        except Exception as tool_parse_exec_error:
+            print(f"{COLOR_RED}[❌ TOOL PARSE/EXEC ERR] {tool_parse_exec_error}{COLOR_RESET}")
+            result_content_json = json.dumps({"error": f"Failed to parse or execute tool call: {tool_parse_exec_error}"})
+            function_call_id = tool_call.id
+            if function_name is None:
+                function_name = tool_call.name or 'unknown_function'
+
+        return function_name, function_call_id, result_content_json
+
+    if get_debug_mode() and len(assistant_tool_calls) > 1:
+        print(f"[🛠️ TOOL BATCH] Dispatching {len(assistant_tool_calls)} tool calls (max {TOOL_CALL_CONCURRENCY} concurrent).")
+
+    # gather() preserves the order of the tool calls in its results
+    results = await asyncio.gather(*(run_one(tool_call) for tool_call in assistant_tool_calls))
+
+    # --- Format Tool Results for Next API Call ---
+    tool_responses = []
+    for result in results:
+        if result is None:
+            continue
+        function_name, function_call_id, result_content_json = result
+        if tool_budget is not None:
+            result_content_json = tool_budget.apply(function_name, result_content_json)
+        tool_responses.append(_format_tool_response(function_name, function_call_id, result_content_json))
+    return tool_responses
+
+def _recent_tool_names(history, lookback=6):
+    """
+    Returns the names of tools the assistant called in the last few messages, plus
+    retrieve_tool_output if one of their results was shortened.
+    """
+    names = set()
+    for msg in history[-lookback:]:
+        for tool_call in msg.tool_calls or ():
+            if tool_call.name:
+                names.add(tool_call.name)
+        if msg.role == "tool" and is_shortened(msg.content):
+            names.add(RETRIEVE_TOOL_NAME)
+    return names
+
+def retrieve_memory(query):
+    """
+    Calls the retrieve_memory capability. The memory module (and faiss) is imported on
+    first use, through the registry's LazyCapability when capabilities are initialized.
+    """
+    function = get_function_registry().get("retrieve_memory")
+    if function is None:
+        from src.Capabilities.local.memory import retrieve_memory as function
+    return function(query)
+
+def _retrieve_memories(query):
+    """retrieve_memory with errors reported instead of raised."""
+    log_debug_event(f"Memory Check Input: {query[:50]}...")
+    try:
+        return retrieve_memory(query) or []
+    except Exception as mem_e:
+        print(f"{COLOR_YELLOW}[WARN] Memory retrieval error: {mem_e}{COLOR_RESET}")
+        return []
+
+async def _within(awaitable, timeout, fallback, stage):
+    """Awaits a preparation step for at most timeout seconds, returning fallback if it takes longer."""
+    try:
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+    except asyncio.TimeoutError:
+        log_debug_event(f"{stage} skipped: it did not finish within {timeout:.1f}s of the turn budget.", is_error=True)
+        deadline_stats.add("prepare_skipped")
+        trace = current_trace()
+        if trace: trace.record("deadline_exceeded", stage=stage, timeout_s=round(timeout, 2))
+        return fallback
+
+async def prepare_turn_context(user_text, session, deadline=None):
+    """
+    Retrieves memories and selects the tools to offer for a user message. Both may
+    block on embedding requests, so they run concurrently on worker threads. With a
+    turn deadline they get at most PREPARE_TIMEOUT; a step that is still running then
+    is skipped (no memories, or every tool offered) rather than delaying the reply.
+    """
+    recent_tools = _recent_tool_names(session.history)
+    all_schemas = get_function_schemas() or []
+    memories_step = asyncio.to_thread(_retrieve_memories, user_text)
+    routing_step = asyncio.to_thread(select_tools, all_schemas, user_text, recent_tools)
+    if deadline is not None:
+        timeout = deadline.timeout(cap=PREPARE_TIMEOUT, reserve=PROVIDER_MIN_TIMEOUT)
+        memories_step = _within(memories_step, timeout, [], "Memory retrieval")
+        routing_step = _within(routing_step, timeout, all_schemas, "Tool routing")
+    memories, schemas = await asyncio.gather(memories_step, routing_step)
+    return TurnContext(user_text, memories, schemas, recent_tools)
+
+def speculative_turn(session_id=LOCAL_SESSION_ID):
+    """
+    Returns a SpeculativeTurn for a session. Feed it partial transcripts (e.g. as the
+    on_partial callback of transcribe_audio) and pass it to run_turn with the final one.
+    Must be called on the loop that will run the turn.
+    """
+    return SpeculativeTurn(lambda text: prepare_turn_context(text, session_manager.get(session_id)))
+
+def _large_model_latency():
+    """Median request latency of the main provider so far, or None without samples."""
+    health = provider_client.health.get(AI_PROVIDER)
+    return health.latency_percentile(0.50) if health else None
+
+async def _complete_request(route, prompt_messages, tools_param, tool_choice_param, deadline):
+    """
+    Sends one request of the turn and returns (provider or tier used, response). A turn
+    the cascade routed to the small model tries it first, with enough of the deadline
+    kept back to escalate; a failure, timeout or rejected reply moves the rest of the
+    turn to the main provider (backoff, hedging and failover happen in provider_client).
+    """
+    if route is not None and route.use_small() and deadline.allows(PROVIDER_MIN_TIMEOUT, reserve=PROVIDER_MIN_TIMEOUT):
+        trace = current_trace()
+        started = time.monotonic()
+        response = None
+        try:
+            response = await _request_completion(SMALL_TIER, prompt_messages, tools_param, tool_choice_param,
+                                                 timeout=deadline.timeout(cap=CASCADE_SMALL_TIMEOUT, reserve=PROVIDER_MIN_TIMEOUT))
+            problem = cascade_router.review(response, tools_param)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            problem = f"small model error: {type(e).__name__}"
+        latency = time.monotonic() - started
+        if problem is None:
+            cascade_router.record_small_reply(latency, response.get("usage"), _large_model_latency())
+            return SMALL_TIER, response
+        cascade_router.escalate(route, problem, latency, response.get("usage") if response else None)
+        if trace: trace.record("cascade_escalation", reason=problem, small_latency_ms=round(latency * 1000, 1))
+
+    return await provider_client.complete(
+        lambda provider: _request_completion(provider, prompt_messages, tools_param, tool_choice_param,
+                                             timeout=deadline.timeout(cap=PROVIDER_REQUEST_TIMEOUT)),
+        available=ai_adapters.keys(),
+        deadline=deadline,
+        min_attempt_time=PROVIDER_MIN_TIMEOUT
     )
-    
-    assistant_message = response.message
-    return {
-        "content": assistant_message.content,
-        "tool_calls": getattr(assistant_message, 'tool_calls', None)
-    }
-
-async def call_ai_provider():
+
+async def call_ai_provider(session, turn_context=None, cancel_token=None, deadline=None):
     """
-    Processes the conversation using the configured AI provider.
+    Processes a session's conversation using the configured AI provider.
+    session is the Session run_turn holds for the turn; it is not looked up again, so
+    the turn keeps answering into the same history.
     Includes memory retrieval, tool call handling, and response processing.
-    NO history limiting.
+    turn_context may carry memories and tools already prepared for the latest user
+    message (see speculative_turn); it is only used if it still fits the conversation.
+    cancel_token is checked before every request and passed on to tool execution;
+    run_turn also cancels the whole call when it fires. Every stage sizes its timeout
+    from deadline (default: a fresh TURN_BUDGET); near the end no more tools are
+    offered, so the model has to answer with what it has.
+    NO history limiting. Callers should hold the session lock (see run_turn).
     """
-    global conversation_history
+    # The session's history list is updated in place throughout the turn
+    conversation_history = session.history
+    trace = current_trace()
+    deadline = deadline or Deadline()
     # Initial history checks
-    if not conversation_history: initialize_conversation_history()
-    if not conversation_history or conversation_history[0]['role'] != 'system':
+    if not conversation_history: _reset_session(session)
+    if not conversation_history or conversation_history[0].role != 'system':
         print(f"{COLOR_RED}[ERROR] History malformed. Reinitializing.{COLOR_RESET}")
-        initialize_conversation_history()
-    if len(conversation_history) < 2 or conversation_history[-1]['role'] != 'user':
-        if not any(msg['role'] == 'user' for msg in conversation_history):
+        _reset_session(session)
+    if len(conversation_history) < 2 or conversation_history[-1].role != 'user':
+        if not any(msg.role == 'user' for msg in conversation_history):
              print(f"{COLOR_RED}[ERROR] No user message in history.{COLOR_RESET}")
              return "Error: I need user input to respond."
 
-    # --- Memory Retrieval ---
-    user_input_for_memory = next((msg["content"] for msg in reversed(conversation_history) if msg["role"] == "user"), None)
-    if user_input_for_memory:
-        log_debug_event(f"Memory Check Input: {user_input_for_memory[:50]}...")
-        try:
-            memories = retrieve_memory(user_input_for_memory)
-            if memories:
-                memory_text = "\n".join(memories); memory_system_message = {"role": "system", "content": f"Context/Memory:\n{memory_text}"}
-                # Insert memory after the system prompt, if it exists
-                insert_pos = 1 if (conversation_history and conversation_history[0]['role'] == 'system') else 0
-                conversation_history.insert(insert_pos, memory_system_message)
-                log_debug_event("Memory inserted after system prompt.")
-        except Exception as mem_e: print(f"{COLOR_YELLOW}[WARN] Memory retrieval error: {mem_e}{COLOR_RESET}")
+    # --- Memory Retrieval & Tool Selection ---
+    user_input_for_memory = next((msg.content for msg in reversed(conversation_history) if msg.role == "user"), None)
+    if turn_context is not None and not turn_context.usable_for(user_input_for_memory, _recent_tool_names(conversation_history)):
+        turn_context = None
+    if turn_context is None:
+        turn_context = await prepare_turn_context(user_input_for_memory or "", session, deadline)
+    elif trace:
+        trace.record("speculative_context", prepared_ms=round(turn_context.prepare_time * 1000, 1))
+
+    # Memories are volatile per-turn context: sent at the tail of the prompt, never stored in the history
+    volatile_messages = []
+    if turn_context.memories:
+        volatile_messages.append(memory_context_message(turn_context.memories))
+        log_debug_event("Memory context added before the user message.")
+    if trace: trace.record("memory", memories=turn_context.memories)
+
+    # Tools are chosen once per turn so every request in the tool loop offers the same tools,
+    # and carried over between turns so the cached prompt prefix (which includes them) holds
+    turn_function_schemas = turn_context.schemas
+    if turn_function_schemas:
+        turn_function_schemas = sticky_tools(turn_function_schemas, session.offered_tools, get_function_schemas() or [])
+        session.offered_tools = tuple(schema["function"]["name"] for schema in turn_function_schemas)
+    if trace: trace.record("tools_offered", names=[schema["function"]["name"] for schema in turn_function_schemas or []])
+    # Caps the tokens tool results add to the history during this turn
+    tool_budget = ToolBudget()
+    # Repeated read-only tool calls within this turn reuse the first result
+    tool_memo = ToolMemo()
+    # With the cascade on, simple turns start on the small model
+    route = None
+    if CASCADE_ENABLED:
+        route = cascade_router.route(user_input_for_memory, turn_function_schemas, small_available=SMALL_TIER in ai_adapters)
+        if trace: trace.record("cascade", tier=route.tier, confidence=route.confidence, reasons=route.reasons)
 
     # --- Debug History Info Only ---
+    # Full prompts, responses and tool results are in the turn trace (see trace.py)
     if get_debug_mode():
-        log_debug_event("--- Pre-API Call History & Token Estimation ---")
-        for i, msg in enumerate(conversation_history):
-            content_preview = str(msg.get("content", ""))[:50].replace("\n", "\\n")
-            print(f"  [{i}] {msg.get('role')}: {content_preview}...")
-        
+        log_debug_event(f"--- Pre-API Call: {len(conversation_history)} messages in history ---")
+
         # Calculate total tokens for information only
         try:
-            total_tokens = sum(estimate_tokens(msg.get('content', '')) + 5 for msg in conversation_history)
+            total_tokens = sum(estimate_tokens(msg.content or '') + 5 for msg in conversation_history)
             log_debug_event(f"Estimated total tokens for API call: ~{total_tokens}")
         except Exception as e:
             log_debug_event(f"Token estimation failed: {e}", is_error=True)
@@ -276,265 +583,330 @@ async def call_ai_provider():
     # --- AI Call Loop ---
     max_retries = 5; attempt = 0
     while attempt < max_retries:
+        if cancel_token is not None: cancel_token.raise_if_cancelled()
+        if not deadline.allows(PROVIDER_MIN_TIMEOUT):
+            print(f"{COLOR_YELLOW}[⏱️ DEADLINE] {deadline.remaining():.1f}s left of the {deadline.budget:g}s turn budget; not calling the provider again.{COLOR_RESET}")
+            deadline_stats.add("provider_stopped")
+            if trace: trace.record("deadline_exceeded", stage="provider", attempt=attempt + 1, elapsed_s=round(deadline.elapsed(), 2))
+            break
         attempt += 1
         log_debug_event(f"Calling {AI_PROVIDER.upper()} API - Attempt {attempt}/{max_retries}")
 
-        # --- Debug Print for History if needed ---
-        if get_debug_mode():
-            log_debug_event("--- Sending Full History to AI (JSON Dump) ---")
-            try: 
-                print(json.dumps(conversation_history, indent=2))
-            except Exception as dump_e: 
-                log_debug_event(f"Error dumping history to JSON: {dump_e}. Raw history: {conversation_history}", is_error=True)
-            log_debug_event("--- End of Full History JSON Dump ---")
+        # Stable prefix (system prompt, older history) first, volatile context at the tail
+        prompt_messages = assemble_prompt(conversation_history, volatile_messages)
+
+        if trace: trace.record_prompt(prompt_messages)
 
         # --- Prepare tools/functions ---
-        function_schemas = get_function_schemas() or []
+        function_schemas = turn_function_schemas
+        if function_schemas and not deadline.allows(PROVIDER_MIN_TIMEOUT + TOOL_MIN_TIMEOUT, reserve=FINAL_ANSWER_RESERVE):
+            # No time for another tool round: this request has to produce the answer
+            log_debug_event(f"Only {deadline.remaining():.1f}s left in the turn; requesting a final answer without tools.")
+            deadline_stats.add("tools_dropped")
+            if trace: trace.record("deadline_exceeded", stage="tools", remaining_s=round(deadline.remaining(), 2))
+            function_schemas = None
         tools_param = function_schemas if function_schemas else None
         tool_choice_param = "auto" if tools_param else None
         if tools_param:
             for schema in tools_param: schema.setdefault('type', 'function')
 
-        # Store history state before API call in case of error/retry
-        history_before_call = [msg.copy() for msg in conversation_history]
+        # Record the history length before the API call; errors/retries truncate back to it
+        history_checkpoint = conversation_history.checkpoint()
 
         assistant_message_content = None
         assistant_tool_calls = None
         raw_response_content = None
 
         try:
-            # --- Call the appropriate API based on provider ---
-            if AI_PROVIDER == "openai":
-                response = await _call_openai(
-                    conversation_history=conversation_history,
-                    tools_param=tools_param,
-                    tool_choice_param=tool_choice_param
-                )
-                assistant_message_content = response["content"]
-                assistant_tool_calls = response["tool_calls"]
-                raw_response_content = assistant_message_content
-                
-            elif AI_PROVIDER == "ollama":
-                response = await _call_ollama(
-                    conversation_history=conversation_history,
-                    tools_param=tools_param
-                )
-                assistant_message_content = response["content"]
-                assistant_tool_calls = response["tool_calls"]
-                raw_response_content = assistant_message_content
-                
-            else:
-                raise ValueError(f"Invalid AI_PROVIDER '{AI_PROVIDER}'")
+            # --- Call the small model or the provider (see _complete_request) ---
+            provider_used, response = await _complete_request(route, prompt_messages, tools_param, tool_choice_param, deadline)
+            prompt_cache_stats.record(provider_used, response.get("usage"))
+            if trace: trace.record("response", provider=provider_used, content=response["content"], tool_calls=response["tool_calls"])
+            assistant_message_content = response["content"]
+            assistant_tool_calls = response["tool_calls"]
+            raw_response_content = assistant_message_content
 
             # --- Shared Logic After Successful API Call ---
             # --- Append Assistant Message to History ---
-            message_to_append = {"role": "assistant"}
-            if raw_response_content:
-                 message_to_append["content"] = raw_response_content
-
             # Store tool calls in the message if they exist
-            if assistant_tool_calls:
-                 message_to_append["tool_calls"] = assistant_tool_calls
+            message_to_append = Message("assistant", raw_response_content or None, tool_calls=assistant_tool_calls)
 
             # Append the assistant's turn *once* if there's content or tool calls
-            if message_to_append.get("content") or message_to_append.get("tool_calls"):
+            if message_to_append.content or message_to_append.tool_calls:
                 # Important: We append to history *in place* for consistency
                 conversation_history.append(message_to_append)
                 if get_debug_mode():
                      content_str = str(assistant_message_content)[:200] if assistant_message_content else "[No Text Content/Tool Call]"
-                     print(f"[🤖 {AI_PROVIDER.upper()} RESPONSE (Processed)] Content: {content_str}...")
+                     print(f"[🤖 {provider_used.upper()} RESPONSE (Processed)] Content: {content_str}...")
                      if assistant_tool_calls: print(f"  Tool Calls Requested/Parsed: {len(assistant_tool_calls)}")
-                     print("[CONVERSATION HISTORY AFTER RESPONSE]")
-                     for i, msg in enumerate(conversation_history):
-                         content_preview = str(msg.get("content", ""))[:50].replace("\n", "\\n") 
-                         print(f"  [{i}] {msg.get('role')}: {content_preview}...")
 
             # --- Tool Call Processing ---
             if assistant_tool_calls:
-                tool_responses_for_api = []
-                function_registry = get_function_registry()
-
-                for tool_call in assistant_tool_calls:
-                    function_name = None
-                    function_args = None
-                    function_call_id = None
-                    result_content_json = None
-
-                    try:
-                        if AI_PROVIDER == 'openai':
-                             if hasattr(tool_call, 'function'):
-                                 function_name = tool_call.function.name
-                                 function_args_str = tool_call.function.arguments
-                                 function_call_id = tool_call.id
-                                 try:
-                                     function_args = json.loads(function_args_str)
-                                 except json.JSONDecodeError:
-                                     print(f"{COLOR_RED}[❌ JSON ERROR] Invalid JSON args for OpenAI tool {function_name}{COLOR_RESET}")
-                                     continue
-                             else: continue
-                        elif AI_PROVIDER == 'ollama':
-                             # tool_call is an object from ollama.py (e.g., ollama.ToolCall)
-                             if hasattr(tool_call, 'function') and tool_call.function and \
-                                hasattr(tool_call.function, 'name') and \
-                                hasattr(tool_call.function, 'arguments'):
-
-                                 function_name = tool_call.function.name
-                                 function_args = tool_call.function.arguments # This should be a dict
-
-                                 # Ollama's library ToolCall object does not consistently define an 'id' attribute.
-                                 # Attempt to get 'id' if present on tool_call itself using getattr.
-                                 # The 'name' field in the tool response message is primarily used.
-                                 function_call_id = getattr(tool_call, 'id', None)
-
-                                 # Ensure arguments are a dictionary. The ollama library should provide this.
-                                 if not isinstance(function_args, dict):
-                                     print(f"{COLOR_RED}[❌ ARG TYPE ERROR] Ollama tool {function_name} arguments not a dict: {type(function_args)}{COLOR_RESET}")
-                                     # Attempt to parse if it's a string, as a fallback.
-                                     if isinstance(function_args, str):
-                                         try:
-                                             function_args = json.loads(function_args)
-                                         except json.JSONDecodeError:
-                                             print(f"{COLOR_RED}[❌ JSON ERROR] Invalid JSON string args for Ollama tool {function_name}{COLOR_RESET}")
-                                             continue
-                                     else:
-                                         # If not a dict and not a parsable string, skip this tool call.
-                                         if get_debug_mode(): print(f"[DEBUG] Skipping Ollama tool {function_name} due to unparsable arguments.")
-                                         continue
-                             else:
-                                 if get_debug_mode(): print(f"[DEBUG] Skipping Ollama tool_call due to missing function/name/arguments attributes: {tool_call}")
-                                 continue
-                        else: continue
-
-                        if not function_name or function_args is None: continue
-
-                        if get_debug_mode(): print(f"[🛠️ TOOL CALL] Fn: {function_name}, Args: {function_args}")
-
-                        # --- Execute function ---
-                        function_to_call = function_registry.get(function_name)
-                        if not function_to_call:
-                            print(f"{COLOR_RED}[❌ MISSING FN] '{function_name}' not found.{COLOR_RESET}")
-                            result_content_json = json.dumps({"error": f"Function '{function_name}' not registered."})
-                        else:
-                            try:
-                                if inspect.iscoroutinefunction(function_to_call):
-                                    function_result = await function_to_call(**function_args)
-                                else:
-                                    loop = asyncio.get_running_loop()
-                                    function_result = await loop.run_in_executor(None, lambda: function_to_call(**function_args))
-
-                                try: result_content_json = json.dumps(function_result)
-                                except TypeError: result_content_json = json.dumps({"result": str(function_result)})
-
-                                if get_debug_mode(): print(f"[✅ FN SUCCESS] Function: {function_name} -> {result_content_json[:100]}...")
-                            except Exception as e:
-                                print(f"{COLOR_RED}[❌ FN ERROR] Function: {function_name}: {e}{COLOR_RESET}")
-                                result_content_json = json.dumps({"error": f"Execution failed: {str(e)}"})
-
-                    except Exception as tool_parse_exec_error:
-                         print(f"{COLOR_RED}[❌ TOOL PARSE/EXEC ERR] {tool_parse_exec_error}{COLOR_RESET}")
-                         result_content_json = json.dumps({"error": f"Failed to parse or execute tool call: {tool_parse_exec_error}"})
-                         if function_name is None and isinstance(tool_call, dict):
-                              function_name = tool_call.get('function', {}).get('name', 'unknown_function')
-                         elif function_name is None and hasattr(tool_call, 'function'):
-                              function_name = getattr(tool_call.function, 'name', 'unknown_function')
-                         else:
-                              function_name = 'unknown_function'
-
-                    # --- Format Tool Result for Next API Call ---
-                    if result_content_json is not None:
-                         if AI_PROVIDER == 'openai':
-                              if function_call_id:
-                                   tool_responses_for_api.append({
-                                       "role": "tool",
-                                       "tool_call_id": function_call_id,
-                                       "name": function_name,
-                                       "content": result_content_json
-                                   })
-                         elif AI_PROVIDER == 'ollama':
-                              # For Ollama, ensure a consistent format (either with or without tool_call_id)
-                              tool_response = {
-                                  "role": "tool",
-                                  "name": function_name,
-                                  "content": result_content_json
-                              }
-                              # Add ID if we have one (some Ollama versions support this)
-                              if function_call_id:
-                                  tool_response["tool_call_id"] = function_call_id
-                                  
-                              tool_responses_for_api.append(tool_response)
+                tool_responses_for_api = await _run_tool_calls(assistant_tool_calls, tool_budget, cancel_token, deadline, tool_memo)
+                if tool_budget.shortened and turn_function_schemas is not None and not any(schema["function"]["name"] == RETRIEVE_TOOL_NAME for schema in turn_function_schemas):
+                    # The follow-up request must be able to page through the shortened output
+                    turn_function_schemas = turn_function_schemas + [schema for schema in get_function_schemas() if schema["function"]["name"] == RETRIEVE_TOOL_NAME]
 
                 # --- Send Tool Responses Back to AI ---
                 if tool_responses_for_api:
                     if get_debug_mode(): 
                         print(f"[🔄 SENDING TOOL RESULTS] {len(tool_responses_for_api)} results being added to history.")
                         for resp in tool_responses_for_api:
-                            print(f"  - Tool response for {resp.get('name')}: {resp.get('content')[:50]}...")
+                            print(f"  - Tool response for {resp.name}: {resp.content[:50]}...")
                     
                     # Add tool responses to history
                     conversation_history.extend(tool_responses_for_api)
                     
-                    # For Ollama, specifically make a followup call instead of returning
-                    # This helps maintain context when using tool calls
-                    if AI_PROVIDER == 'ollama':
-                        if get_debug_mode():
-                            print("[OLLAMA TOOL HANDLING] Making follow-up call for tool responses")
-                        continue  # This will loop back to make another API call with the updated history
-                    else:
-                        continue  # Standard behavior for OpenAI
+                    # Loop back to make a follow-up call with the tool results in the history
+                    if get_debug_mode():
+                        print(f"[{provider_used.upper()} TOOL HANDLING] Making follow-up call for tool responses")
+                    continue
 
             # --- Handle Final Response with Content ---
             if assistant_message_content:
                  response_text = assistant_message_content
                  print(f"{COLOR_CYAN}[Vortex]: {response_text}{COLOR_RESET}")
-                 # Remove temporary memory message AFTER successful final response
-                 conversation_history = [msg for msg in conversation_history if not (msg["role"] == "system" and "Context/Memory:" in msg["content"])]
+                 if trace: trace.record("reply", text=response_text)
                  return response_text # Success
 
             # --- Handle Cases with No Content/Tools ---
-            print(f"{COLOR_YELLOW}[WARN] {AI_PROVIDER.upper()} returned no usable content or tool calls on attempt {attempt}. Retrying if possible.{COLOR_RESET}")
-            conversation_history = history_before_call
+            print(f"{COLOR_YELLOW}[WARN] {provider_used.upper()} returned no usable content or tool calls on attempt {attempt}. Retrying if possible.{COLOR_RESET}")
+            conversation_history.rollback(history_checkpoint)
             # Allow loop to retry if attempts remain
 
         # --- Error Handling for API Calls ---
-        except asyncio.TimeoutError:
-            print(f"{COLOR_RED}[❌ TIMEOUT ERROR] {AI_PROVIDER.upper()} API timed out on attempt {attempt}.{COLOR_RESET}")
-            conversation_history = history_before_call
-        except (openai.APIConnectionError, ollama.RequestError) as e:
-            print(f"{COLOR_RED}[❌ CONNECTION ERROR] {AI_PROVIDER.upper()} on attempt {attempt}: {e}{COLOR_RESET}")
-            conversation_history = history_before_call
+        except ProviderUnavailableError as e:
+            # provider_client already retried and failed over, or the request cannot succeed;
+            # more attempts here would only multiply its requests
+            print(f"{COLOR_RED}[❌ PROVIDER UNAVAILABLE] {e}{COLOR_RESET}")
+            if trace: trace.record("attempt_failed", attempt=attempt, error=f"{type(e).__name__}: {e}")
+            conversation_history.rollback(history_checkpoint)
+            break
         except Exception as e:
+            # Provider errors arrive as ProviderUnavailableError; this is the tool loop or reply handling
             import traceback
-            print(f"{COLOR_RED}[❌ UNEXPECTED API/PROCESSING ERROR] on attempt {attempt}: {e}{COLOR_RESET}")
+            print(f"{COLOR_RED}[❌ UNEXPECTED PROCESSING ERROR] on attempt {attempt}: {e}{COLOR_RESET}")
+            if trace: trace.record("attempt_failed", attempt=attempt, error=f"{type(e).__name__}: {e}")
             if get_debug_mode(): traceback.print_exc()
-            conversation_history = history_before_call
+            conversation_history.rollback(history_checkpoint)
 
-        # --- Pause before retry ---
+        # --- Pause before retry (exponential backoff with jitter) ---
         if attempt < max_retries:
-             await asyncio.sleep(1)
+             await asyncio.sleep(min(backoff_delay(attempt), deadline.timeout()))
+
+    if deadline.expired() or not deadline.allows(PROVIDER_MIN_TIMEOUT):
+        print(f"{COLOR_RED}[⏱️ DEADLINE] No reply within the {deadline.budget:g}s turn budget ({attempt} attempt(s)).{COLOR_RESET}")
+        deadline_stats.add("turns_expired")
+        return "I'm sorry, I ran out of time before I could finish that. Please try again."
 
     # --- Reached Max Retries ---
-    print(f"{COLOR_RED}[❌ MAX RETRIES REACHED] Failed after {max_retries} attempts. No valid response received.{COLOR_RESET}")
-    # Clean up memory message from potentially failed final attempt's history
-    conversation_history = [msg for msg in conversation_history if not (msg["role"] == "system" and "Context/Memory:" in msg["content"])]
+    print(f"{COLOR_RED}[❌ MAX RETRIES REACHED] Failed after {attempt} attempts. No valid response received.{COLOR_RESET}")
     return "I'm sorry, the AI failed to provide a valid response after multiple attempts."
 
 # ------------------------------
 # Conversation History Helpers
 # ------------------------------
-def add_user_input(user_input):
-    """Adds a user message to the conversation history. VORTEX.py handles printing."""
-    global conversation_history
+def add_user_input(user_input, session_id=LOCAL_SESSION_ID):
+    """Adds a user message to a session's conversation history. VORTEX.py handles printing."""
+    _append_user_input(get_conversation_history(session_id), user_input)
+
+def _append_user_input(conversation_history, user_input):
     # Make sure we're not duplicating the user message - it should only be added once
-    if len(conversation_history) > 0 and conversation_history[-1].get('role') == 'user' and conversation_history[-1].get('content') == user_input:
+    if len(conversation_history) > 0 and conversation_history[-1].role == 'user' and conversation_history[-1].content == user_input:
         if get_debug_mode(): print(f"[WARN] Skipping duplicate user message: {user_input[:30]}...")
         return
-    conversation_history.append({"role": "user", "content": user_input})
+    conversation_history.append(Message("user", user_input))
     if get_debug_mode():
-        print(f"[USER INPUT ADDED] {user_input[:50]}...")
-        print("[CONVERSATION HISTORY AFTER USER INPUT]")
-        for i, msg in enumerate(conversation_history):
-            content_preview = str(msg.get("content", ""))[:50].replace("\n", "\\n")
-            print(f"  [{i}] {msg.get('role')}: {content_preview}...")
+        print(f"[USER INPUT ADDED] {user_input[:50]}... ({len(conversation_history)} messages in history)")
+
+# ------------------------------
+# Response Cache
+# ------------------------------
+async def _lookup_cached_response(user_input, started, deadline=None):
+    """
+    Returns (cached response or None, cache key for storing this turn or None).
+    Tool calls behind a cached answer are replayed (only turns whose tools are all
+    flagged read_only or cache_ttl are cached, see turn_ttl); the answer is only
+    reused if their results are unchanged.
+    """
+    catalog = tool_catalog_fingerprint(get_function_schemas())
+    entry, normalized, vector = await asyncio.to_thread(response_cache.lookup, user_input, catalog)
+    if normalized is None:
+        return None, None
+    cache_key = (normalized, vector, catalog)
+    if entry is None:
+        response_cache.record_miss()
+        return None, cache_key
+    if entry.tool_calls:
+        tool_results = await asyncio.gather(*(_execute_tool_call(name, args, deadline=deadline) for name, args in entry.tool_calls))
+        if not response_cache.validate(entry, list(tool_results)):
+            return None, cache_key
+    response_cache.record_hit(entry, time.monotonic() - started)
+    return entry.response, cache_key
+
+def _store_cached_response(conversation_history, checkpoint, response, cache_key, turn_latency):
+    """Caches a successful turn together with the tool calls and results it was based on."""
+    turn_messages = conversation_history[checkpoint:]
+    if not turn_messages or turn_messages[-1].role != "assistant" or turn_messages[-1].content != response:
+        return # The turn failed; error replies are never cached
+    tool_calls = []
+    tool_results_by_id = {}
+    for msg in turn_messages:
+        for tool_call in msg.tool_calls or ():
+            parsed = _parse_tool_call(tool_call)
+            if parsed is None:
+                return
+            tool_calls.append(parsed)
+        if msg.role == "tool":
+            # Replays on lookup return full results, so compare against the full (not shortened) output
+            tool_results_by_id[msg.tool_call_id] = original_result(msg.content)
+    tool_results = [tool_results_by_id.get(function_call_id) for _, _, function_call_id in tool_calls]
+    normalized, vector, catalog = cache_key
+    response_cache.store(normalized, vector, response, catalog, [(name, args) for name, args, _ in tool_calls], tool_results, turn_latency)
+
+async def run_turn(user_input, session_id=LOCAL_SESSION_ID, speculation=None, cancel_token=None, interrupt=False, deadline=None):
+    """
+    Runs one full turn for a session: adds the user input and calls the AI provider.
+    The turn scheduler runs turns of one session in order and caps how many sessions
+    call the provider at once. Raises SchedulerBusyError when the turn queue is full,
+    or SchedulerTimeoutError (a subclass) when the deadline runs out while queued.
+    Commands matching a registered intent are answered locally (see intents.py). With
+    VORTEX_RESPONSE_CACHE enabled, repeated questions are answered from the cache.
+    Provider calls and tool executions made during the turn are recorded in usage_store,
+    and in a turn trace when tracing (VORTEX_TRACE or debug mode) is on. The turn's
+    messages are appended to the session log once it completes. speculation is the
+    SpeculativeTurn that was fed the partial transcripts of user_input, if any.
+
+    The turn stops as soon as cancel_token fires or cancel_turn() is called for the
+    session; with interrupt (a new utterance) and VORTEX_BARGE_IN on, turns already
+    running or queued for the session are cancelled first. A cancelled turn keeps only
+    the user message in the history and raises TurnCancelledError.
+
+    deadline is the turn's time budget, ideally created when the input arrived (before
+    transcription); a new Deadline() is used if none is given. Queueing, memory
+    retrieval, provider calls, retries and tools all draw on it.
+
+    With VORTEX_COALESCE_INPUTS on, inputs that arrive before the session's next turn
+    has started (see coalescer.py) are answered together by that turn, and every caller
+    gets its reply. Interrupting inputs are never merged.
+    """
+    cancel_token = cancel_token or CancellationToken()
+    deadline = deadline or Deadline()
+    # Held from here until the turn returns, so the session is not evicted while it is queued
+    with session_manager.hold(session_id) as session:
+        if interrupt and BARGE_IN_ENABLED:
+            turn_tokens.cancel(session_id, "barge_in")
+        turn_tokens.register(session_id, cancel_token)
+        batch = None
+        try:
+            if COALESCE_ENABLED and not interrupt:
+                batch, leader = input_coalescer.submit(session_id, user_input)
+                if not leader:
+                    return await cancel_token.run(input_coalescer.wait_for_reply(batch))
+            try:
+                response = await cancel_token.run(_run_turn(session, user_input, session_id, speculation, cancel_token, deadline, batch))
+            except BaseException as e:
+                if batch is not None:
+                    input_coalescer.finish(batch, error=e if isinstance(e, Exception) else TurnCancelledError("shutdown"))
+                raise
+            if batch is not None:
+                input_coalescer.finish(batch, response)
+            return response
+        finally:
+            turn_tokens.unregister(session_id, cancel_token)
+            if speculation is not None:
+                speculation.close()
+
+async def _run_turn(session, user_input, session_id, speculation, cancel_token, deadline, batch=None):
+    if batch is not None:
+        await input_coalescer.wait_for_window(batch)
+    async with turn_scheduler.slot(session_id, timeout=deadline.timeout()):
+        async with session.lock:
+            if batch is not None:
+                # Inputs arriving from here on wait for the next turn
+                user_input = input_coalescer.close(batch) or user_input
+            with usage_store.turn(session_id) as turn_usage, trace_recorder.turn(session_id, user_input) as trace:
+                if trace and batch is not None and len(batch.inputs) > 1:
+                    trace.record("coalesced", inputs=len(batch.inputs))
+                _append_user_input(session.history, user_input)
+                turn_start = session.history.checkpoint()
+                try:
+                    response = await _answer_turn(session, user_input, session_id, speculation, cancel_token, deadline, turn_usage, trace)
+                except (asyncio.CancelledError, TurnCancelledError):
+                    if not cancel_token.cancelled:
+                        raise # Shutdown, not a cancel request
+                    # Drop the partial reply (e.g. tool calls without results) so the next turn starts clean
+                    session.history.rollback(turn_start)
+                    turn_usage["cancelled"] = True
+                    if trace: trace.record("cancelled", reason=cancel_token.reason, stop_latency_ms=round((time.monotonic() - cancel_token.cancelled_at) * 1000, 1))
+                    print(f"{COLOR_YELLOW}[Vortex]: (turn cancelled: {cancel_token.reason}){COLOR_RESET}")
+                    await _commit_turn(session, cancel_token)
+                    raise TurnCancelledError(cancel_token.reason) from None
+                await _commit_turn(session, cancel_token)
+                return response
+
+async def _answer_turn(session, user_input, session_id, speculation, cancel_token, deadline, turn_usage, trace):
+    """Produces the reply for a turn whose user message is already in the history."""
+    started = time.monotonic()
+
+    # Trivial commands ("what time is it", "debug mode on") skip the provider entirely
+    intent_answer = await intent_router.handle(user_input)
+    if intent_answer is not None:
+        intent_name, intent_reply = intent_answer
+        turn_usage["intent"] = intent_name
+        if trace: trace.record("reply", text=intent_reply, intent=intent_name)
+        session.history.append(Message("assistant", intent_reply))
+        print(f"{COLOR_CYAN}[Vortex]: {intent_reply}{COLOR_RESET}")
+        return intent_reply
+
+    cache_key = None
+    if RESPONSE_CACHE_ENABLED:
+        cached_response, cache_key = await _lookup_cached_response(user_input, started, deadline)
+        if cached_response is not None:
+            turn_usage["cache_hit"] = True
+            if trace: trace.record("reply", text=cached_response, cached=True)
+            session.history.append(Message("assistant", cached_response))
+            print(f"{COLOR_CYAN}[Vortex]: {cached_response}{COLOR_RESET}")
+            return cached_response
+
+    turn_context = await speculation.take(user_input) if speculation is not None else None
+    checkpoint = session.history.checkpoint()
+    response = await call_ai_provider(session, turn_context, cancel_token, deadline)
+    if cache_key is not None:
+        _store_cached_response(session.history, checkpoint, response, cache_key, time.monotonic() - started)
+    return response
+
+async def _commit_turn(session, cancel_token):
+    """
+    Persists the turn's messages. Once the reply is in the history the turn is no longer
+    cancellable, so a cancel arriving now waits for the write instead of interrupting it.
+    """
+    persist = asyncio.ensure_future(_persist_session(session))
+    try:
+        await asyncio.shield(persist)
+    except asyncio.CancelledError:
+        if not cancel_token.cancelled:
+            raise
+        await persist
+    session.touch()
+
+def cancel_turn(session_id=LOCAL_SESSION_ID, reason="stop"):
+    """
+    Cancels the session's running and queued turns (e.g. the web UI's stop button).
+    Thread-safe. Returns the number of turns cancelled.
+    """
+    return turn_tokens.cancel(session_id, reason)
+
+def get_cancellation_stats():
+    """Returns how many turns were cancelled by stop requests and barge-in."""
+    return turn_tokens.get_stats()
+
+def drop_session(session_id):
+    """Forgets a session's conversation, including its log (e.g. when a web client disconnects)."""
+    dropped = session_manager.drop(session_id)
+    if dropped and SESSION_PERSIST_ENABLED:
+        session_store.delete(session_id)
+    return dropped
 
 # ------------------------------
 # Startup Message
@@ -545,8 +917,8 @@ def display_startup_message():
     # vortex_ascii = r"""...""" # Your ASCII art here
     box_width = 45; top_bottom_border = "═" * (box_width - 2)
     provider_info = f"AI: {AI_PROVIDER.upper()}"
-    if AI_PROVIDER == 'ollama': provider_info += f" ({OLLAMA_MODEL})"
-    elif AI_PROVIDER == 'openai': provider_info += f" ({OPENAI_MODEL})"
+    try: provider_info += f" ({create_adapter(AI_PROVIDER).model})"
+    except ValueError: pass
     startup_text = f"""{COLOR_CYAN}
     ╔{top_bottom_border}╗
     ║ VORTEX: Wizard's Virtual Assistant        ║
@@ -557,8 +929,3 @@ def display_startup_message():
     ╚{top_bottom_border}╝{COLOR_RESET}"""
     # print(COLOR_CYAN + vortex_ascii + COLOR_RESET) # Uncomment for ASCII art
     print(startup_text)
-
-# --- Final check ---
-if not conversation_history:
-    print(f"{COLOR_YELLOW}[WARN] History empty after init, reinitializing.{COLOR_RESET}")
-    initialize_conversation_history()
\ No newline at end of file
@@ -0,0 +1,157 @@
+# src/Boring/cancellation.py
+import os
+import time
+import asyncio
+import threading
+from dotenv import load_dotenv
+from .debug_logger import log_debug_event
+
+# ------------------------------
+# Barge-in Configuration
+# ------------------------------
+load_dotenv()
+BARGE_IN_ENABLED = os.getenv("VORTEX_BARGE_IN", "true").lower() == "true"  # A new utterance cancels the session's turn in progress
+
+class TurnCancelledError(Exception):
+    """Raised by run_turn when the turn was cancelled (barge-in or a stop request)."""
+    def __init__(self, reason="cancelled"):
+        super().__init__(f"Turn cancelled: {reason}")
+        self.reason = reason
+
+class CancellationToken:
+    """
+    A one-shot cancel signal that can be fired from any thread (a web request, the
+    socket handler, the voice loop) and observed from another thread's event loop.
+
+    Async work is tied to it with run(); threads poll cancelled or register a
+    callback with add_callback().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._callbacks = []
+        self.reason = None
+        self.cancelled_at = None
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self, reason="cancelled"):
+        """Fires the token. Returns False if it had already fired."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self.cancelled_at = time.monotonic()
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                log_debug_event(f"Cancellation callback failed: {e}", is_error=True)
+        return True
+
+    def add_callback(self, callback):
+        """
+        Calls callback() on the cancelling thread once the token fires (right away if it
+        already has). Returns a function that unregisters it.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TurnCancelledError(self.reason)
+
+    def wait(self, timeout=None):
+        """Blocks until the token fires or timeout passes. For worker threads."""
+        return self._event.wait(timeout)
+
+    async def run(self, awaitable):
+        """
+        Awaits awaitable on the current loop and cancels it as soon as the token fires,
+        then raises TurnCancelledError. Cancellation reaches whatever the awaitable is
+        waiting on: an HTTP request to the provider is aborted and its connection
+        released, and capability calls have their cancel event set.
+        """
+        self.raise_if_cancelled()
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(awaitable)
+
+        def cancel_task():
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass # Loop already closed
+
+        remove_callback = self.add_callback(cancel_task)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if self._event.is_set() and task.cancelled():
+                raise TurnCancelledError(self.reason) from None
+            raise
+        finally:
+            remove_callback()
+
+# ------------------------------
+# Active Turn Registry
+# ------------------------------
+class TurnTokens:
+    """The tokens of every running or queued turn, by session, so they can be cancelled from outside."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = {}  # session_id -> set of tokens
+        self.stats = {"cancel_requests": 0, "turns_cancelled": 0, "barge_ins": 0}
+
+    def register(self, session_id, token):
+        with self._lock:
+            self._tokens.setdefault(session_id, set()).add(token)
+
+    def unregister(self, session_id, token):
+        with self._lock:
+            tokens = self._tokens.get(session_id)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens[session_id]
+
+    def cancel(self, session_id, reason="stop"):
+        """Cancels every running or queued turn of a session. Returns how many were cancelled."""
+        with self._lock:
+            tokens = list(self._tokens.get(session_id, ()))
+            self.stats["cancel_requests"] += 1
+            if reason == "barge_in" and tokens:
+                self.stats["barge_ins"] += 1
+        cancelled = sum(1 for token in tokens if token.cancel(reason))
+        if cancelled:
+            with self._lock:
+                self.stats["turns_cancelled"] += cancelled
+            log_debug_event(f"Cancelled {cancelled} turn(s) of session {session_id} ({reason}).")
+        return cancelled
+
+    def active(self, session_id):
+        with self._lock:
+            return len(self._tokens.get(session_id, ()))
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["active_turns"] = sum(len(tokens) for tokens in self._tokens.values())
+        stats["barge_in_enabled"] = BARGE_IN_ENABLED
+        return stats
+
+turn_tokens = TurnTokens()
@@ -1,7 +1,10 @@
 import os
 import importlib.util
 import sys
+import time
 import inspect
+import threading
+from src.Boring.manifest import build_manifest, last_build as manifest_build_stats
 
 # Track initialization status
 _registry_initialized = False
@@ -13,9 +16,51 @@ _loaded_modules = set()
 function_registry = {}
 function_schemas = []
 
+# Schema-level execution options (e.g. "serial"), keyed by function name.
+# These describe how VORTEX runs a capability, so they are kept out of the
+# schema that is sent to the AI provider.
+capability_options = {}
+
 # Debug counter for registrations
 _registration_count = 0
 
+# Lazily loaded capability modules: module name -> file path, for modules that were
+# registered from the manifest and have not been imported yet
+_lazy_modules = {}
+# Schema names registered from the manifest -> module name
+_manifest_schemas = {}
+# Seconds each capability module took to import
+_import_times = {}
+# Serialises capability module imports (first calls can come from several threads)
+_load_lock = threading.RLock()
+
+class LazyCapability:
+	"""
+	Stands in for a capability in function_registry until it is first called, then
+	imports the module that implements it and replaces itself with the real function.
+	"""
+	__slots__ = ("name", "module_name", "attribute")
+
+	def __init__(self, name, module_name, attribute):
+		self.name = name
+		self.module_name = module_name
+		self.attribute = attribute
+
+	def load(self):
+		"""Imports the capability's module if needed and returns the real function."""
+		module = import_capability_module(self.module_name)
+		func = function_registry.get(self.name)
+		if func is None or isinstance(func, LazyCapability):
+			func = getattr(module, self.attribute)
+			function_registry[self.name] = func
+		return func
+
+	def __call__(self, *args, **kwargs):
+		return self.load()(*args, **kwargs)
+
+	def __repr__(self):
+		return f"LazyCapability({self.name!r}, module={self.module_name!r})"
+
 def register_function_in_registry(name, func):
 	"""Registers a function in the global function registry."""
 	global function_registry, _registration_count
@@ -27,6 +72,11 @@ def register_function_in_registry(name, func):
 	# Create a unique key for this function registration
 	registration_key = f"{module_name}:{name}"
 	
+	# A manifest placeholder is replaced by the real function once its module is imported
+	if isinstance(function_registry.get(name), LazyCapability):
+		function_registry[name] = func
+		return
+
 	# Skip if already registered from this module
 	if name in function_registry:
 		# Only print if in debug mode to reduce console spam
@@ -48,6 +98,9 @@ def register_function_schema(schema):
 		
 	schema_name = schema["function"]["name"]
 
+	# Pull VORTEX execution options off the schema before it is stored
+	options = {key: schema.pop(key) for key in list(schema) if key not in ("type", "function")}
+
 	# Get calling module for tracking
 	frame = inspect.currentframe().f_back
 	module_name = frame.f_globals.get('__name__', 'unknown')
@@ -57,8 +110,12 @@ def register_function_schema(schema):
 	
 	if schema_name not in existing_names:
 		function_schemas.append(schema)
+		if options:
+			capability_options[schema_name] = options
 		_registration_count += 1
 		print(f"[✅ SCHEMA REGISTERED #{_registration_count}] {schema_name} (from {module_name})")
+	elif _manifest_schemas.get(schema_name) == module_name:
+		return # Already registered from the manifest before the module was imported
 	else:
 		# Only print if in debug mode to reduce console spam
 		print(f"[⚠️ SKIPPED] Schema for {schema_name} already registered (from {module_name})")
@@ -71,6 +128,10 @@ def get_function_schemas():
 	"""Returns the global function schemas."""
 	return function_schemas
 
+def get_capability_option(name, option, default=None):
+	"""Returns a schema-level execution option for a capability, or default if unset."""
+	return capability_options.get(name, {}).get(option, default)
+
 def initialize_capabilities():
 	"""Initializes capability registry."""
 	global function_registry, function_schemas, _registry_initialized, _loaded_modules, _registration_count
@@ -89,7 +150,10 @@ def initialize_capabilities():
 	# Clear everything on first initialization
 	function_registry.clear()
 	function_schemas.clear()
+	capability_options.clear()
 	_loaded_modules.clear()
+	_lazy_modules.clear()
+	_manifest_schemas.clear()
 	_registration_count = 0
 	
 	# Mark as initialized
@@ -100,20 +164,34 @@ def initialize_capabilities():
 		use_optional_extras = os.environ.get("USE_OPTIONAL_EXTRAS", "false").lower() == "true"
 		print(f"[CONFIG] USE_OPTIONAL_EXTRAS = {use_optional_extras}")
 		
+		# Capability modules are imported on first use unless lazy loading is turned off
+		lazy = os.environ.get("VORTEX_LAZY_CAPABILITIES", "true").lower() == "true"
+		print(f"[CONFIG] VORTEX_LAZY_CAPABILITIES = {lazy}")
+		
 		# Load capabilities
-		load_capabilities(use_optional_extras=use_optional_extras)
+		load_capabilities(use_optional_extras=use_optional_extras, lazy=lazy)
 		
 		# Manually register debug functions last to avoid circular imports
 		register_debug_functions()
 		
+		# Import the modules of frequently used capabilities in the background (retrieve_memory runs every turn)
+		warm_up = [name.strip() for name in os.environ.get("VORTEX_CAPABILITY_WARMUP", "retrieve_memory").split(",") if name.strip()]
+		if warm_up and _lazy_modules:
+			warm_up_capabilities(warm_up)
+		
 		print("\n" + "="*80)
 		print(f" Capabilities initialization complete. Registered {_registration_count} items. ")
 		print("="*80 + "\n")
 	except Exception as e:
 		print(f"[ERROR] Failed to initialize capabilities: {e}")
 
-def load_capabilities(use_optional_extras=False):
-	"""Load all capability modules from the Capabilities directory."""
+def load_capabilities(use_optional_extras=False, lazy=True):
+	"""
+	Load all capability modules from the Capabilities directory. With lazy=True, modules
+	whose registrations can be read from their source (see manifest.py) only have their
+	schemas and LazyCapability placeholders registered; the module is imported the first
+	time one of its functions is called. Other modules are imported straight away.
+	"""
 	global _loaded_modules
 	
 	# Fix the case sensitivity issue by using the correct case
@@ -146,22 +224,72 @@ def load_capabilities(use_optional_extras=False):
 				
 	# Sort modules by priority
 	module_paths.sort(key=module_priority)
-				
-	# Load modules in priority order
+	
+	modules = []
 	for module_path in module_paths:
 		# Get relative path for import using correct module structure
 		rel_path = os.path.relpath(module_path, os.path.dirname(os.path.dirname(CAPABILITIES_DIR)))
 		rel_path = rel_path.replace("\\", "/")  # Normalize path separators for import
 		module_name = os.path.splitext(rel_path)[0].replace("/", ".")
-		
+		modules.append((module_name, module_path))
+	
+	if not lazy:
+		for module_name, module_path in modules:
+			_load_module(module_name, module_path)
+		return
+	
+	# Register from the manifest in the same priority order
+	manifests = build_manifest(modules)
+	print(f"[CONFIG] Capability manifest: {manifest_build_stats['cached']} cached, {manifest_build_stats['scanned']} scanned ({manifest_build_stats['seconds']:.3f}s)")
+	for manifest in manifests:
+		if not manifest.is_lazy():
+			print(f"[ℹ️ EAGER] {manifest.module_name}: {manifest.eager_reason}")
+			_load_module(manifest.module_name, manifest.path)
+			continue
+		if manifest.module_name in _loaded_modules:
+			print(f"[⚠️ SKIPPED] Module already loaded: {manifest.module_name}")
+			continue
+		_register_manifest(manifest)
+
+def _register_manifest(manifest):
+	"""Registers a module's schemas and LazyCapability placeholders without importing it."""
+	global _registration_count
+	_lazy_modules[manifest.module_name] = manifest.path
+	existing_names = {s["function"]["name"] for s in function_schemas}
+	for schema in manifest.schemas:
+		schema = dict(schema)
+		schema_name = schema["function"]["name"]
+		if schema_name in existing_names:
+			print(f"[⚠️ SKIPPED] Schema for {schema_name} already registered (from {manifest.module_name})")
+			continue
+		schema.setdefault("type", "function")
+		options = {key: schema.pop(key) for key in list(schema) if key not in ("type", "function")}
+		function_schemas.append(schema)
+		if options:
+			capability_options[schema_name] = options
+		_manifest_schemas[schema_name] = manifest.module_name
+		existing_names.add(schema_name)
+		_registration_count += 1
+	for name, attribute in manifest.functions:
+		if name in function_registry:
+			print(f"[⚠️ SKIPPED] Function {name} already registered (from {manifest.module_name})")
+			continue
+		function_registry[name] = LazyCapability(name, manifest.module_name, attribute)
+		_registration_count += 1
+	print(f"[💤 DEFERRED] Module: {manifest.module_name} ({len(manifest.functions)} functions, imported on first use)")
+
+def _load_module(module_name, module_path):
+	"""Imports a capability module by path, registering whatever it registers. Returns the module or None."""
+	with _load_lock:
 		# Skip if already loaded
 		if module_name in _loaded_modules:
 			print(f"[⚠️ SKIPPED] Module already loaded: {module_name}")
-			continue
+			return sys.modules.get(module_name)
 			
 		# Mark as loaded before importing to prevent circular import issues
 		_loaded_modules.add(module_name)
 		
+		started = time.monotonic()
 		try:
 			print(f"[⏳ LOADING] Module: {module_name}")
 			spec = importlib.util.spec_from_file_location(module_name, module_path)
@@ -172,11 +300,78 @@ def load_capabilities(use_optional_extras=False):
 			
 			# Execute the module
 			spec.loader.exec_module(module)
-			print(f"[✅ LOADED] Module: {module_name}")
+			_import_times[module_name] = round(time.monotonic() - started, 3)
+			print(f"[✅ LOADED] Module: {module_name} ({_import_times[module_name]:.2f}s)")
+			return module
 		except Exception as e:
 			print(f"[❌ FAILED] Module '{os.path.basename(module_path)}': {str(e)[:100]}")
 			# Remove from loaded modules if it failed
 			_loaded_modules.remove(module_name)
+			sys.modules.pop(module_name, None)
+			return None
+
+def import_capability_module(module_name):
+	"""
+	Imports a lazily registered capability module (once) and returns it. If the import
+	fails, the module's capabilities are unregistered so they are no longer offered to
+	the AI provider, and ImportError is raised.
+	"""
+	with _load_lock:
+		module = sys.modules.get(module_name)
+		if module is not None:
+			# Imported already, through the loader or a plain import statement
+			_loaded_modules.add(module_name)
+			_lazy_modules.pop(module_name, None)
+			return module
+		module_path = _lazy_modules.get(module_name)
+		if module_path is None:
+			raise ImportError(f"{module_name} is not a registered capability module")
+		module = _load_module(module_name, module_path)
+		if module is None:
+			_unregister_module(module_name)
+			raise ImportError(f"Capability module {module_name} failed to import")
+		del _lazy_modules[module_name]
+		return module
+
+def _unregister_module(module_name):
+	"""Removes the placeholders and manifest schemas of a lazily registered module."""
+	for name, func in list(function_registry.items()):
+		if isinstance(func, LazyCapability) and func.module_name == module_name:
+			del function_registry[name]
+	names = {name for name, owner in _manifest_schemas.items() if owner == module_name}
+	function_schemas[:] = [s for s in function_schemas if s["function"]["name"] not in names]
+	for name in names:
+		del _manifest_schemas[name]
+		capability_options.pop(name, None)
+	_lazy_modules.pop(module_name, None)
+
+def warm_up_capabilities(names):
+	"""
+	Imports the modules behind the named capabilities on a background thread, so
+	frequently used tools do not pay their import cost on the first call. "all"
+	imports every lazily registered module.
+	"""
+	if "all" in names:
+		module_names = list(_lazy_modules)
+	else:
+		module_names = []
+		for name in names:
+			func = function_registry.get(name)
+			if isinstance(func, LazyCapability) and func.module_name not in module_names:
+				module_names.append(func.module_name)
+			elif func is None:
+				print(f"[⚠️ WARM-UP] Unknown capability: {name}")
+
+	def warm_up():
+		for module_name in module_names:
+			try:
+				import_capability_module(module_name)
+			except ImportError as e:
+				print(f"[❌ WARM-UP] {e}")
+
+	if module_names:
+		print(f"[🔥 WARM-UP] Importing {len(module_names)} capability module(s) in the background")
+		threading.Thread(target=warm_up, name="CapabilityWarmUp", daemon=True).start()
 
 def persist_dynamic_function(function_name, function_code):
 	"""Writes a dynamically registered function to a separate file in the Capabilities folder."""
@@ -203,6 +398,9 @@ def get_initialization_status():
 		"registered_functions": len(function_registry),
 		"registered_schemas": len(function_schemas),
 		"loaded_modules": len(_loaded_modules),
+		"lazy_modules": sorted(_lazy_modules),
+		"import_times": dict(_import_times),
+		"manifest": dict(manifest_build_stats),
 		"registration_count": _registration_count
 	}
 
@@ -219,6 +417,7 @@ def register_debug_functions():
 		# Register the schemas
 		register_function_schema({
 			"type": "function",
+			"side_effects": True,
 			"function": {
 				"name": "debugmode",
 				"description": "Toggles or sets debug mode",
@@ -237,6 +436,7 @@ def register_debug_functions():
 		
 		register_function_schema({
 			"type": "function",
+			"side_effects": True,
 			"function": {
 				"name": "set_debug_mode",
 				"description": "Enable or disable VORTEX's debug mode",
@@ -0,0 +1,107 @@
+# src/Boring/capability_executor.py
+import os
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .debug_logger import log_debug_event
+from .capabilities import LazyCapability
+
+# ------------------------------
+# Capability Executor Configuration
+# ------------------------------
+CAPABILITY_WORKERS = max(1, int(os.getenv("VORTEX_CAPABILITY_WORKERS", "8")))
+CAPABILITY_DEFAULT_TIMEOUT = float(os.getenv("VORTEX_CAPABILITY_TIMEOUT", "30"))
+
+class CapabilityTimeoutError(Exception):
+    """Raised when a capability does not finish within its timeout."""
+    def __init__(self, function_name, timeout):
+        super().__init__(f"Capability '{function_name}' timed out after {timeout:g}s")
+        self.function_name = function_name
+        self.timeout = timeout
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Each worker thread sees the cancel event of the call it is currently running
+_worker_state = threading.local()
+
+def get_capability_executor():
+    """Returns the shared capability thread pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=CAPABILITY_WORKERS, thread_name_prefix="VortexCapability")
+            log_debug_event(f"Capability executor started with {CAPABILITY_WORKERS} workers.")
+        return _executor
+
+def shutdown_capability_executor():
+    """Stops accepting capability work. Running calls are signalled to cancel but not joined."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+            log_debug_event("Capability executor shut down.")
+
+def capability_cancelled():
+    """
+    Returns True if the capability call running on this thread has been cancelled
+    (for example because it timed out). Long-running sync capabilities can poll this
+    between steps and return early.
+    """
+    cancel_event = getattr(_worker_state, "cancel_event", None)
+    return cancel_event is not None and cancel_event.is_set()
+
+def get_cancel_event():
+    """Returns the threading.Event for the capability call running on this thread, or None."""
+    return getattr(_worker_state, "cancel_event", None)
+
+async def run_capability(function_name, function_to_call, function_args, timeout=None, cancel_token=None):
+    """
+    Runs a capability with a timeout. Coroutine capabilities run on the current loop;
+    sync capabilities run on the dedicated capability executor. A LazyCapability's
+    module is imported (on the executor) before the timeout starts.
+
+    Raises CapabilityTimeoutError if the call does not finish in time. A timed-out sync
+    call keeps its worker until it returns, so its cancel event is set to let it stop early.
+    The cancel event is also set the moment cancel_token (the turn's CancellationToken)
+    fires, from whichever thread fires it.
+    """
+    if timeout is None:
+        timeout = CAPABILITY_DEFAULT_TIMEOUT
+
+    if isinstance(function_to_call, LazyCapability):
+        # First call of a lazily registered capability: import its module off the event loop
+        function_to_call = await asyncio.get_running_loop().run_in_executor(get_capability_executor(), function_to_call.load)
+
+    if inspect.iscoroutinefunction(function_to_call):
+        try:
+            return await asyncio.wait_for(function_to_call(**function_args), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise CapabilityTimeoutError(function_name, timeout) from None
+
+    cancel_event = threading.Event()
+
+    def run_with_cancel_event():
+        _worker_state.cancel_event = cancel_event
+        try:
+            return function_to_call(**function_args)
+        finally:
+            _worker_state.cancel_event = None
+
+    remove_callback = cancel_token.add_callback(cancel_event.set) if cancel_token is not None else None
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_capability_executor(), run_with_cancel_event)
+    try:
+        return await asyncio.wait_for(future, timeout=timeout)
+    except asyncio.TimeoutError:
+        cancel_event.set()
+        log_debug_event(f"Capability '{function_name}' timed out after {timeout:g}s; cancellation requested.", is_error=True)
+        raise CapabilityTimeoutError(function_name, timeout) from None
+    except asyncio.CancelledError:
+        cancel_event.set()
+        raise
+    finally:
+        if remove_callback is not None:
+            remove_callback()
@@ -0,0 +1,182 @@
+# src/Boring/cascade.py
+import os
+import re
+import threading
+from collections import deque, Counter
+from dotenv import load_dotenv
+from .debug_logger import log_debug_event
+from .capabilities import get_capability_option
+from .tool_router import PINNED_TOOLS
+
+# ------------------------------
+# Model Cascade Configuration
+# ------------------------------
+# With the cascade on, turns that look simple are sent to a small, fast model first
+# and escalated to the main model (AI_PROVIDER, with its failover) when the small
+# model fails or its reply is rejected. To try it offline, point the small tier at the
+# mock server (its rules can match on the requested model name):
+#   VORTEX_CASCADE=true VORTEX_CASCADE_SMALL_PROVIDER=openai
+#   VORTEX_CASCADE_SMALL_URL=http://127.0.0.1:11435/v1 VORTEX_CASCADE_SMALL_MODEL=mock-small
+load_dotenv()
+CASCADE_ENABLED = os.getenv("VORTEX_CASCADE", "false").lower() == "true"
+CASCADE_SMALL_PROVIDER = os.getenv("VORTEX_CASCADE_SMALL_PROVIDER", "ollama").lower()
+CASCADE_SMALL_MODEL = os.getenv("VORTEX_CASCADE_SMALL_MODEL", "llama3.2:3b")
+CASCADE_SMALL_URL = os.getenv("VORTEX_CASCADE_SMALL_URL")  # Defaults to the provider's own server setting
+CASCADE_SMALL_TIMEOUT = float(os.getenv("VORTEX_CASCADE_SMALL_TIMEOUT", "15"))     # Seconds before escalating
+CASCADE_MIN_CONFIDENCE = float(os.getenv("VORTEX_CASCADE_MIN_CONFIDENCE", "0.6"))  # Below this, go straight to the large model
+CASCADE_MAX_WORDS = max(1, int(os.getenv("VORTEX_CASCADE_MAX_WORDS", "40")))      # Longer inputs are not "simple"
+CASCADE_MAX_TOOL_CALLS = 3     # More calls than this in one reply is a plan for the large model
+# Blended USD per million tokens, for the cost-saved estimate only
+CASCADE_LARGE_COST = float(os.getenv("VORTEX_CASCADE_LARGE_COST", "5.0"))
+CASCADE_SMALL_COST = float(os.getenv("VORTEX_CASCADE_SMALL_COST", "0.0"))
+
+SMALL_TIER = "small"   # Key of the small model's adapter in ai_adapters
+LARGE_TIER = "large"
+
+_COMPLEX_REQUEST = re.compile(r"\b(why|explain|analy[sz]e|compare|plan|design|write|code|script|debug|refactor|summari[sz]e|"
+                              r"step[- ]by[- ]step|pros and cons|essay|translate|calculate|prove)\b", re.IGNORECASE)
+_UNCERTAIN_REPLY = re.compile(r"\b(i'?m not sure|i am not sure|i don'?t know|i do not know|i can'?t help|i cannot help|"
+                              r"unable to (help|answer)|as an ai)\b", re.IGNORECASE)
+
+def small_adapter_settings(provider=CASCADE_SMALL_PROVIDER):
+    """create_adapter() settings for the small model."""
+    settings = {"model": CASCADE_SMALL_MODEL}
+    if CASCADE_SMALL_URL:
+        settings["host" if provider == "ollama" else "base_url"] = CASCADE_SMALL_URL
+    return settings
+
+class CascadeRoute:
+    """The cascade's decision for one turn."""
+    __slots__ = ("tier", "confidence", "reasons", "escalation")
+
+    def __init__(self, tier, confidence, reasons):
+        self.tier = tier
+        self.confidence = confidence
+        self.reasons = reasons
+        self.escalation = None  # Why the turn moved to the large model, once it has
+
+    def use_small(self):
+        return self.tier == SMALL_TIER and self.escalation is None
+
+    def as_dict(self):
+        return {"tier": self.tier, "confidence": self.confidence, "reasons": self.reasons, "escalation": self.escalation}
+
+class CascadeRouter:
+    """
+    Scores how confident it is that a turn can be answered by the small model, from
+    the user input and the tools offered, and reviews the small model's replies.
+    Keeps totals of routing decisions, escalations and the latency and cost saved.
+    """
+
+    def __init__(self, min_confidence=CASCADE_MIN_CONFIDENCE, max_words=CASCADE_MAX_WORDS):
+        self.min_confidence = min_confidence
+        self.max_words = max_words
+        self._lock = threading.Lock()
+        self.stats = {"routed_small": 0, "routed_large": 0, "small_replies": 0, "escalations": 0,
+                      "latency_saved": 0.0, "latency_wasted": 0.0, "cost_saved": 0.0}
+        self.escalation_reasons = Counter()
+        self.recent = deque(maxlen=20)
+
+    # --- Routing ---
+    def route(self, user_text, schemas=None, small_available=True):
+        confidence = 1.0
+        reasons = []
+        words = len((user_text or "").split())
+        if words > self.max_words:
+            confidence -= 0.5
+            reasons.append("long input")
+        elif words > self.max_words // 2:
+            confidence -= 0.2
+            reasons.append("medium input")
+        if _COMPLEX_REQUEST.search(user_text or ""):
+            confidence -= 0.3
+            reasons.append("complex request")
+        if (user_text or "").count("?") > 1 or "```" in (user_text or ""):
+            confidence -= 0.2
+            reasons.append("multi-part request")
+        # Tools the router picked for this input (pinned tools are offered to every turn)
+        routed_tools = [schema["function"]["name"] for schema in schemas or []
+                        if schema["function"]["name"] not in PINNED_TOOLS and not get_capability_option(schema["function"]["name"], "pinned", False)]
+        if any(get_capability_option(name, "side_effects", False) for name in routed_tools):
+            confidence -= 0.35
+            reasons.append("side-effect tools")
+        confidence = round(max(confidence, 0.0), 2)
+
+        if not small_available:
+            tier = LARGE_TIER
+            reasons.append("small model unavailable")
+        else:
+            tier = SMALL_TIER if confidence >= self.min_confidence else LARGE_TIER
+        route = CascadeRoute(tier, confidence, reasons)
+        with self._lock:
+            self.stats["routed_small" if tier == SMALL_TIER else "routed_large"] += 1
+            self.recent.append(route)
+        log_debug_event(f"Cascade: {tier} model (confidence {confidence:.2f}{'; ' + ', '.join(reasons) if reasons else ''}).")
+        return route
+
+    # --- Reviewing small-model replies ---
+    def review(self, response, tools=None):
+        """Returns why the small model's reply should be escalated, or None to accept it."""
+        content = response.get("content")
+        tool_calls = response.get("tool_calls") or []
+        if not (content and content.strip()) and not tool_calls:
+            return "empty reply"
+        offered = {schema["function"]["name"] for schema in tools or []}
+        if len(tool_calls) > CASCADE_MAX_TOOL_CALLS:
+            return "complex tool plan"
+        for tool_call in tool_calls:
+            if tool_call.name not in offered:
+                return "unknown tool"
+            try:
+                tool_call.parsed_arguments()
+            except ValueError:
+                return "invalid tool arguments"
+            if get_capability_option(tool_call.name, "side_effects", False):
+                return "side-effect tool call"
+        if content and not tool_calls and _UNCERTAIN_REPLY.search(content):
+            return "uncertain reply"
+        return None
+
+    # --- Accounting ---
+    def record_small_reply(self, latency, usage=None, large_latency=None):
+        """A small-model reply was used: counts the time and cost the large model would have taken."""
+        with self._lock:
+            self.stats["small_replies"] += 1
+            if large_latency is not None:
+                self.stats["latency_saved"] += large_latency - latency
+            self.stats["cost_saved"] += _tokens(usage) * (CASCADE_LARGE_COST - CASCADE_SMALL_COST) / 1e6
+
+    def escalate(self, route, reason, latency=0.0, usage=None):
+        """Moves the rest of the turn to the large model; the small model's time and cost were spent for nothing."""
+        route.escalation = reason
+        with self._lock:
+            self.stats["escalations"] += 1
+            self.stats["latency_wasted"] += latency
+            self.stats["cost_saved"] -= _tokens(usage) * CASCADE_SMALL_COST / 1e6
+            self.escalation_reasons[reason] += 1
+        log_debug_event(f"Cascade: escalating to the large model ({reason}, {latency:.2f}s spent on the small model).")
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["escalation_reasons"] = dict(self.escalation_reasons)
+            stats["recent"] = [route.as_dict() for route in self.recent]
+        stats["escalation_rate"] = round(stats["escalations"] / stats["routed_small"], 3) if stats["routed_small"] else 0.0
+        stats["net_latency_saved"] = round(stats["latency_saved"] - stats["latency_wasted"], 3)
+        for key in ("latency_saved", "latency_wasted"):
+            stats[key] = round(stats[key], 3)
+        stats["cost_saved"] = round(stats["cost_saved"], 6)
+        stats["enabled"] = CASCADE_ENABLED
+        stats["small_model"] = f"{CASCADE_SMALL_PROVIDER}:{CASCADE_SMALL_MODEL}"
+        return stats
+
+def _tokens(usage):
+    if not usage:
+        return 0
+    return (usage.get("prompt_tokens") or 0) + (usage.get("completion_tokens") or 0)
+
+cascade_router = CascadeRouter()
+
+def get_cascade_stats():
+    """Returns the cascade's routing decisions, escalations and estimated savings."""
+    return cascade_router.get_stats()
@@ -0,0 +1,107 @@
+# src/Boring/coalescer.py
+import os
+import time
+import asyncio
+import threading
+import concurrent.futures
+from dotenv import load_dotenv
+from .debug_logger import log_debug_event
+
+# ------------------------------
+# Input Coalescing Configuration
+# ------------------------------
+load_dotenv()
+COALESCE_ENABLED = os.getenv("VORTEX_COALESCE_INPUTS", "true").lower() == "true"
+COALESCE_WINDOW = max(0.0, float(os.getenv("VORTEX_COALESCE_WINDOW", "0")))  # Seconds a new turn waits for more input (0 = only while a turn is running)
+
+class InputBatch:
+    """User inputs of one session that will be answered by a single turn."""
+    __slots__ = ("session_id", "inputs", "created_at", "result")
+
+    def __init__(self, session_id, user_input):
+        self.session_id = session_id
+        self.inputs = [user_input]
+        self.created_at = time.monotonic()
+        self.result = concurrent.futures.Future()  # Resolved by the leader; awaited by the other submitters
+
+    def unique_inputs(self):
+        """The batch's inputs in arrival order, without exact repeats."""
+        return list(dict.fromkeys(text.strip() for text in self.inputs if text and text.strip()))
+
+class InputCoalescer:
+    """
+    Merges user inputs that arrive for a session before its next turn has started.
+
+    The first input opens a batch and becomes its leader; inputs arriving while the
+    leader is still queued behind the session's running turn (or within COALESCE_WINDOW)
+    join the batch instead of starting turns of their own. When the leader's turn
+    starts, close() returns every input as one message, and the reply (or error) is
+    handed to everyone who joined. Works across event loops in different threads.
+    """
+
+    def __init__(self, window=COALESCE_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._open = {}  # session_id -> InputBatch not yet started
+        self.stats = {"batches": 0, "inputs": 0, "coalesced": 0, "duplicates": 0}
+
+    def submit(self, session_id, user_input):
+        """Returns (batch, is_leader). The leader runs the turn; the others await wait_for_reply()."""
+        with self._lock:
+            self.stats["inputs"] += 1
+            batch = self._open.get(session_id)
+            if batch is not None:
+                batch.inputs.append(user_input)
+                self.stats["coalesced"] += 1
+                log_debug_event(f"Input coalesced into the pending turn of session {session_id} ({len(batch.inputs)} inputs).")
+                return batch, False
+            batch = InputBatch(session_id, user_input)
+            self._open[session_id] = batch
+            self.stats["batches"] += 1
+            return batch, True
+
+    async def wait_for_window(self, batch):
+        """Lets more input arrive for up to COALESCE_WINDOW after the batch was opened."""
+        remaining = batch.created_at + self.window - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    def close(self, batch):
+        """Stops the batch taking more input. Returns the merged user input to run the turn with."""
+        with self._lock:
+            if self._open.get(batch.session_id) is batch:
+                del self._open[batch.session_id]
+            unique = batch.unique_inputs()
+            self.stats["duplicates"] += len(batch.inputs) - len(unique)
+        return "\n".join(unique)
+
+    def finish(self, batch, result=None, error=None):
+        """Hands the leader's reply or error to the inputs that joined the batch."""
+        with self._lock:
+            if self._open.get(batch.session_id) is batch:
+                del self._open[batch.session_id] # Failed before the turn started
+        if batch.result.done():
+            return
+        if error is not None:
+            batch.result.set_exception(error)
+        else:
+            batch.result.set_result(result)
+
+    @staticmethod
+    async def wait_for_reply(batch):
+        """Awaits the leader's reply. Cancelling one waiter does not affect the others."""
+        return await asyncio.shield(asyncio.wrap_future(batch.result))
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["pending_batches"] = len(self._open)
+        stats["enabled"] = COALESCE_ENABLED
+        stats["window"] = self.window
+        return stats
+
+input_coalescer = InputCoalescer()
+
+def get_coalescer_stats():
+    """Returns how many inputs were merged into an already pending turn."""
+    return input_coalescer.get_stats()
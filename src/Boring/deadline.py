@@ -0,0 +1,84 @@
+# src/Boring/deadline.py
+import os
+import time
+import threading
+from dotenv import load_dotenv
+
+# ------------------------------
+# Turn Deadline Configuration
+# ------------------------------
+load_dotenv()
+TURN_BUDGET = max(5.0, float(os.getenv("VORTEX_TURN_BUDGET", "45")))              # Seconds from input to reply
+PREPARE_TIMEOUT = max(0.1, float(os.getenv("VORTEX_PREPARE_TIMEOUT", "3")))       # Memory retrieval and tool routing
+PROVIDER_MIN_TIMEOUT = 2.0    # No provider request is started with less time than this
+TOOL_MIN_TIMEOUT = 1.0        # No tool is started with less time than this
+FINAL_ANSWER_RESERVE = max(0.0, float(os.getenv("VORTEX_FINAL_ANSWER_RESERVE", "8")))  # Kept free for the reply after tool calls
+
+class Deadline:
+    """
+    The time budget of one turn, counted from when the input arrived (before
+    transcription and queueing). Each stage sizes its own timeout from what is left
+    with timeout(), and checks allows() before starting work it could not finish.
+    A capability that declares a longer timeout than the turn has left extends it.
+    """
+    __slots__ = ("budget", "started", "expires_at")
+
+    def __init__(self, budget=TURN_BUDGET):
+        self.budget = budget
+        self.started = time.monotonic()
+        self.expires_at = self.started + budget
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+    def timeout(self, cap=None, reserve=0.0):
+        """Seconds a stage may take: what is left after reserve, at most cap, never negative."""
+        seconds = self.remaining() - reserve
+        if cap is not None:
+            seconds = min(seconds, cap)
+        return max(0.0, seconds)
+
+    def allows(self, seconds, reserve=0.0):
+        """True if a stage needing `seconds` still fits, keeping reserve free for later stages."""
+        return self.remaining() - reserve >= seconds
+
+    def extend(self, seconds):
+        """Moves the deadline back by seconds (for work that is known to take longer than the budget)."""
+        self.budget += seconds
+        self.expires_at += seconds
+
+    def snapshot(self):
+        return {"budget": self.budget, "elapsed": round(self.elapsed(), 3), "remaining": round(self.remaining(), 3)}
+
+    def __repr__(self):
+        return f"Deadline({self.remaining():.1f}s of {self.budget:g}s left)"
+
+class _DeadlineStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"turns_expired": 0, "prepare_skipped": 0, "provider_stopped": 0, "tools_dropped": 0, "tools_skipped": 0,
+                       "deadlines_extended": 0, "seconds_extended": 0.0}
+
+    def add(self, key, amount=1):
+        with self._lock:
+            self.counts[key] += amount
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.counts)
+        stats["seconds_extended"] = round(stats["seconds_extended"], 1)
+        stats["turn_budget"] = TURN_BUDGET
+        stats["final_answer_reserve"] = FINAL_ANSWER_RESERVE
+        return stats
+
+deadline_stats = _DeadlineStats()
+
+def get_deadline_stats():
+    """Returns the turn budget settings and how often each stage was cut short by it."""
+    return deadline_stats.snapshot()
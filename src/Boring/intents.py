@@ -0,0 +1,178 @@
+# src/Boring/intents.py
+import os
+import re
+import time
+import threading
+from datetime import datetime
+from dotenv import load_dotenv
+from .debug_logger import log_debug_event
+from .capabilities import get_function_registry, get_capability_option
+from .capability_executor import run_capability
+
+# ------------------------------
+# Intent Fast Path Configuration
+# ------------------------------
+load_dotenv()
+INTENTS_ENABLED = os.getenv("VORTEX_INTENTS", "true").lower() == "true"
+
+# Wake words and politeness around a command; stripped before matching
+_PREFIX = re.compile(r"^(?:(?:hey|ok|okay|hi)\s+)?(?:vortex\s+)?(?:(?:please|can you|could you|would you)\s+)*")
+_SUFFIX = re.compile(r"(?:\s+(?:please|vortex|thanks|thank you))+$")
+
+def normalize_utterance(text):
+    """Lowercases and strips punctuation, a leading wake word and polite filler."""
+    text = re.sub(r"[^a-z0-9'\s]", " ", (text or "").lower())
+    text = " ".join(text.replace("'", "").split())
+    text = _PREFIX.sub("", text)
+    return _SUFFIX.sub("", text).strip()
+
+class Intent:
+    """
+    A command answered without the LLM. patterns must match the whole normalized
+    utterance, so only unambiguous phrasings are handled here.
+
+    function is the name of a registered capability, or handler a callable. args is a
+    dict or a callable taking the regex match. reply is a format string filled from the
+    result (dict keys, or {result}) or a callable taking (result, match).
+    """
+    __slots__ = ("name", "patterns", "function", "handler", "args", "reply")
+
+    def __init__(self, name, patterns, function=None, handler=None, args=None, reply="{result}"):
+        if (function is None) == (handler is None):
+            raise ValueError(f"Intent '{name}' needs exactly one of function or handler")
+        self.name = name
+        self.patterns = [re.compile(p) for p in ([patterns] if isinstance(patterns, str) else patterns)]
+        self.function = function
+        self.handler = handler
+        self.args = args
+        self.reply = reply
+
+    def match(self, normalized):
+        for pattern in self.patterns:
+            match = pattern.fullmatch(normalized)
+            if match:
+                return match
+        return None
+
+    def render(self, result, match):
+        if callable(self.reply):
+            return self.reply(result, match)
+        if isinstance(result, dict):
+            return self.reply.format(result=result, **result)
+        return self.reply.format(result=result)
+
+class IntentRouter:
+    """Matches utterances against registered intents and runs the matching one."""
+
+    def __init__(self):
+        self._intents = {}
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "misses": 0, "errors": 0, "time": 0.0, "by_intent": {}}
+
+    def register(self, intent):
+        with self._lock:
+            self._intents[intent.name] = intent
+
+    def unregister(self, name):
+        with self._lock:
+            return self._intents.pop(name, None) is not None
+
+    def match(self, user_input):
+        """Returns (intent, regex match) for the first intent matching user_input, or None."""
+        normalized = normalize_utterance(user_input)
+        with self._lock:
+            intents = list(self._intents.values())
+            self.stats["lookups"] += 1
+        for intent in intents:
+            match = intent.match(normalized)
+            if match:
+                return intent, match
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    async def run(self, intent, match):
+        """Runs a matched intent and returns its reply, or None to fall through to the LLM."""
+        started = time.monotonic()
+        try:
+            args = intent.args(match) if callable(intent.args) else dict(intent.args or {})
+            if intent.handler is not None:
+                result = await run_capability(intent.name, intent.handler, args, timeout=5)
+            else:
+                function_to_call = get_function_registry().get(intent.function)
+                if function_to_call is None:
+                    raise LookupError(f"function '{intent.function}' is not registered")
+                timeout = get_capability_option(intent.function, "timeout")
+                result = await run_capability(intent.function, function_to_call, args, timeout=timeout)
+            reply = intent.render(result, match)
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+            log_debug_event(f"Intent '{intent.name}' failed, falling back to the AI provider: {e}", is_error=True)
+            return None
+
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.stats["hits"] += 1
+            self.stats["time"] += elapsed
+            self.stats["by_intent"][intent.name] = self.stats["by_intent"].get(intent.name, 0) + 1
+        log_debug_event(f"Intent '{intent.name}' answered in {elapsed * 1000:.1f}ms without the AI provider.")
+        return reply
+
+    async def handle(self, user_input):
+        """Answers user_input from an intent if one matches; returns (intent name, reply) or None."""
+        if not INTENTS_ENABLED:
+            return None
+        matched = self.match(user_input)
+        if matched is None:
+            return None
+        intent, match = matched
+        reply = await self.run(intent, match)
+        return (intent.name, reply) if reply is not None else None
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats, by_intent=dict(self.stats["by_intent"]))
+            stats["intents"] = sorted(self._intents)
+        stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else 0.0
+        stats["avg_time_ms"] = round(stats.pop("time") / stats["hits"] * 1000, 2) if stats["hits"] else 0.0
+        stats["enabled"] = INTENTS_ENABLED
+        return stats
+
+intent_router = IntentRouter()
+
+def register_intent(name, patterns, function=None, handler=None, args=None, reply="{result}"):
+    """Registers (or replaces) an intent on the shared router."""
+    intent_router.register(Intent(name, patterns, function=function, handler=handler, args=args, reply=reply))
+
+def get_intent_stats():
+    """Returns fast-path hit rate and per-intent counts."""
+    return intent_router.get_stats()
+
+# ------------------------------
+# Built-in Intents
+# ------------------------------
+def _local_time():
+    """The local time and date, formatted like the calendar module's get_time (which is optional)."""
+    now = datetime.now()
+    return {"time": now.strftime("%I:%M %p"), "date": now.strftime("%B %d, %Y"), "day_of_week": now.strftime("%A")}
+
+register_intent(
+    "time",
+    [r"(?:what is the |whats the |tell me the |what )?time(?: is it)?(?: now| right now)?", r"what time is it(?: now| right now)?"],
+    handler=_local_time,
+    reply="It's {time}.",
+)
+register_intent(
+    "date",
+    [r"(?:what is|whats) (?:the date|todays date)(?: today)?", r"what day is (?:it|today)(?: today)?"],
+    handler=_local_time,
+    reply="Today is {day_of_week}, {date}.",
+)
+register_intent(
+    "debug_mode",
+    [r"(?:turn |switch |set )?debug mode (?P<state>on|off)", r"(?P<state>enable|disable) debug mode", r"turn (?P<state>on|off) debug mode"],
+    function="debugmode",
+    args=lambda match: {"enable": match.group("state") in ("on", "enable")},
+    reply=lambda result, match: f"Debug mode {'enabled' if match.group('state') in ('on', 'enable') else 'disabled'}.",
+)
@@ -0,0 +1,241 @@
+# src/Boring/manifest.py
+import os
+import ast
+import json
+import time
+import hashlib
+from dotenv import load_dotenv
+
+# ------------------------------
+# Capability Manifest
+# ------------------------------
+# Reads what a capability module registers (function names, the module attribute
+# that implements each one, and the schemas) from its source with the ast module,
+# without importing it. capabilities.load_capabilities() uses the manifest to fill
+# the registry at startup and imports each module only when one of its functions is
+# first called, so heavy dependencies (faiss, pandas, googleapiclient, ...) and the
+# modules' own start-up work are not paid for before the first prompt.
+#
+# The scan results are cached in MANIFEST_CACHE_FILE with each file's mtime, size and
+# SHA-256, so a restart only re-parses the capability files that changed.
+load_dotenv()
+MANIFEST_CACHE_FILE = os.getenv("VORTEX_MANIFEST_CACHE", "capability_manifest.json")  # Empty disables the cache
+MANIFEST_CACHE_VERSION = 1  # Bump when the scanner's output changes
+
+REGISTER_FUNCTION = "register_function_in_registry"
+REGISTER_SCHEMA = "register_function_schema"
+
+class ModuleManifest:
+    """
+    The registrations found in one capability module. eager_reason is set when they
+    cannot all be read statically (non-literal names or schemas, registrations inside
+    functions or branches), in which case the module has to be imported at startup.
+    """
+    __slots__ = ("module_name", "path", "functions", "schemas", "conditional", "eager_reason")
+
+    def __init__(self, module_name, path):
+        self.module_name = module_name
+        self.path = path
+        self.functions = []      # (registered name, module attribute) in registration order
+        self.schemas = []        # Schema dicts, as passed to register_function_schema
+        self.conditional = set() # Names registered only under an if/for/def
+        self.eager_reason = None
+
+    def is_lazy(self):
+        return self.eager_reason is None
+
+    def to_dict(self):
+        return {"functions": [list(entry) for entry in self.functions], "schemas": self.schemas,
+                "conditional": sorted(self.conditional), "eager_reason": self.eager_reason}
+
+    @classmethod
+    def from_dict(cls, module_name, path, data):
+        manifest = cls(module_name, path)
+        manifest.functions = [tuple(entry) for entry in data["functions"]]
+        manifest.schemas = data["schemas"]
+        manifest.conditional = set(data["conditional"])
+        manifest.eager_reason = data["eager_reason"]
+        return manifest
+
+    def __repr__(self):
+        return f"ModuleManifest({self.module_name!r}, functions={len(self.functions)}, schemas={len(self.schemas)}, lazy={self.is_lazy()})"
+
+def _call_name(call):
+    """'register_function_schema' for both capabilities.register_function_schema(...) and a bare call."""
+    func = call.func
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    if isinstance(func, ast.Name):
+        return func.id
+    return None
+
+def _unconditional_calls(body):
+    """Calls made as statements at module level, including inside a top-level try block."""
+    calls = set()
+    for stmt in body:
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+            calls.add(id(stmt.value))
+        elif isinstance(stmt, ast.Try):
+            calls |= _unconditional_calls(stmt.body)
+    return calls
+
+def _registered_name(call, kind):
+    """The capability name a registration call registers, or None if it is not a literal."""
+    if not call.args:
+        return None
+    try:
+        value = ast.literal_eval(call.args[0])
+    except (ValueError, TypeError, SyntaxError):
+        return None
+    if kind == REGISTER_FUNCTION:
+        return value if isinstance(value, str) else None
+    try:
+        return value["function"]["name"]
+    except (TypeError, KeyError):
+        return None
+
+def scan_module(module_name, path):
+    """Returns the ModuleManifest of a capability module. Raises SyntaxError or OSError like compile()/open()."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    manifest = ModuleManifest(module_name, path)
+    unconditional = _unconditional_calls(tree.body)
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        kind = _call_name(node)
+        if kind not in (REGISTER_FUNCTION, REGISTER_SCHEMA):
+            continue
+        name = _registered_name(node, kind)
+        if name is None:
+            manifest.eager_reason = f"line {node.lineno}: {kind} argument is not a literal"
+            continue
+        if id(node) not in unconditional:
+            manifest.conditional.add(name)
+        elif kind == REGISTER_FUNCTION:
+            if len(node.args) < 2 or not isinstance(node.args[1], ast.Name):
+                manifest.eager_reason = f"line {node.lineno}: {name} is not registered as a module attribute"
+                continue
+            manifest.functions.append((name, node.args[1].id))
+        else:
+            manifest.schemas.append(ast.literal_eval(node.args[0]))
+
+    if manifest.eager_reason is None and not manifest.functions and not manifest.schemas and not manifest.conditional:
+        manifest.eager_reason = "no registrations found"
+    return manifest
+
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class ManifestCache:
+    """
+    Scanned ModuleManifests keyed by file path, persisted as JSON. An entry is reused
+    while the file's mtime and size are unchanged; if only the mtime moved (a checkout,
+    a copy) the content hash decides. Files that are gone are dropped on save; files
+    that were only skipped (optional extras turned off) keep their entries.
+    """
+
+    def __init__(self, path=MANIFEST_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.stats = {"cached": 0, "scanned": 0, "seconds": 0.0}
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self # Unreadable cache: everything is rescanned and the file rewritten
+        if data.get("version") == MANIFEST_CACHE_VERSION:
+            self.entries = data.get("files", {})
+        return self
+
+    def get(self, module_name, path):
+        """Returns the cached ModuleManifest for path if the file is unchanged, else None."""
+        entry = self.entries.get(path)
+        if entry is None or entry["module_name"] != module_name:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if (stat.st_mtime_ns, stat.st_size) != (entry["mtime_ns"], entry["size"]):
+            if stat.st_size != entry["size"] or _file_hash(path) != entry["sha256"]:
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.dirty = True
+        return ModuleManifest.from_dict(module_name, path, entry["manifest"])
+
+    def put(self, manifest):
+        try:
+            stat = os.stat(manifest.path)
+            sha256 = _file_hash(manifest.path)
+        except OSError:
+            return
+        self.entries[manifest.path] = {"module_name": manifest.module_name, "mtime_ns": stat.st_mtime_ns,
+                                       "size": stat.st_size, "sha256": sha256, "manifest": manifest.to_dict()}
+        self.dirty = True
+
+    def save(self):
+        """Writes the cache (atomically) if it changed, dropping files that no longer exist."""
+        stale = [path for path in self.entries if not os.path.exists(path)]
+        for path in stale:
+            del self.entries[path]
+        if not self.path or not (self.dirty or stale):
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_CACHE_VERSION, "files": self.entries}, f, indent=1)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"[⚠️ MANIFEST] Could not write {self.path}: {e}")
+
+def build_manifest(modules, cache_path=MANIFEST_CACHE_FILE):
+    """
+    Scans (module_name, path) pairs in load order and returns their ModuleManifests,
+    reusing cache_path's entries for unchanged files. A module that registers a name
+    conditionally (e.g. a fallback used when another module fails to import) stays
+    lazy only if some other module registers that name unconditionally; otherwise it
+    is imported at startup as before.
+    """
+    started = time.monotonic()
+    cache = ManifestCache(cache_path).load()
+    manifests = []
+    for module_name, path in modules:
+        manifest = cache.get(module_name, path)
+        if manifest is not None:
+            cache.stats["cached"] += 1
+            manifests.append(manifest)
+            continue
+        cache.stats["scanned"] += 1
+        try:
+            manifest = scan_module(module_name, path)
+            cache.put(manifest)
+        except (SyntaxError, OSError, UnicodeDecodeError) as e:
+            manifest = ModuleManifest(module_name, path)
+            manifest.eager_reason = f"could not be scanned: {e}" # Not cached, so a fixed file is picked up
+        manifests.append(manifest)
+    cache.save()
+
+    provided = set()
+    for manifest in manifests:
+        provided.update(name for name, _ in manifest.functions)
+        provided.update(schema["function"]["name"] for schema in manifest.schemas)
+    for manifest in manifests:
+        missing = manifest.conditional - provided
+        if missing and manifest.eager_reason is None:
+            manifest.eager_reason = f"registers {', '.join(sorted(missing))} conditionally"
+
+    cache.stats["seconds"] = round(time.monotonic() - started, 4)
+    last_build.update(cache.stats)
+    return manifests
+
+# Cached/scanned counts of the last build_manifest() call, for get_initialization_status()
+last_build = {"cached": 0, "scanned": 0, "seconds": 0.0}
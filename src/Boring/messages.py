@@ -0,0 +1,111 @@
+# src/Boring/messages.py
+import sys
+import json
+import uuid
+
+# ------------------------------
+# Conversation Message Model
+# ------------------------------
+# History entries are small __slots__ objects rather than dicts, so a long session
+# costs a fraction of the memory, and every entry is plain data that can be copied,
+# logged and persisted. Providers get dicts in their own wire format from to_dict().
+
+class ToolCall:
+    """
+    One function call requested by the assistant. arguments keep the format the
+    provider sent them in (a JSON string for OpenAI, a dict for Ollama) and are
+    converted on serialisation only when a failover sends them to the other provider.
+    """
+    __slots__ = ("id", "name", "arguments")
+
+    def __init__(self, id, name, arguments=None):
+        self.id = id or f"call_{uuid.uuid4().hex[:24]}"
+        self.name = name
+        self.arguments = arguments
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a tool call from the {"id", "type", "function": {"name", "arguments"}} dict shape."""
+        function = data.get("function") or {}
+        return cls(data.get("id"), function.get("name"), function.get("arguments"))
+
+    def parsed_arguments(self):
+        """Returns the arguments as a dict. Raises ValueError if they are not a JSON object."""
+        arguments = self.arguments
+        if isinstance(arguments, str):
+            arguments = json.loads(arguments or "{}")
+        if arguments is None:
+            return {}
+        if not isinstance(arguments, dict):
+            raise ValueError(f"arguments are a {type(arguments).__name__}, not an object")
+        return arguments
+
+    def to_dict(self, string_arguments=None):
+        """
+        Returns the wire/log dict. string_arguments=True or False converts the arguments
+        to a JSON string or a dict; None keeps them as stored.
+        """
+        arguments = self.arguments
+        if string_arguments is True and not isinstance(arguments, str):
+            arguments = json.dumps(arguments or {})
+        elif string_arguments is False and not isinstance(arguments, dict):
+            try: arguments = self.parsed_arguments()
+            except ValueError: arguments = {}
+        return {"id": self.id, "type": "function", "function": {"name": self.name, "arguments": arguments}}
+
+    def __eq__(self, other):
+        return isinstance(other, ToolCall) and (self.id, self.name, self.arguments) == (other.id, other.name, other.arguments)
+
+    def __repr__(self):
+        return f"ToolCall({self.name!r}, id={self.id!r})"
+
+class Message:
+    """One conversation history entry: a system, user, assistant or tool message."""
+    __slots__ = ("role", "content", "tool_calls", "tool_call_id", "name")
+
+    def __init__(self, role, content=None, tool_calls=None, tool_call_id=None, name=None):
+        self.role = sys.intern(role)
+        self.content = content
+        self.tool_calls = tuple(tool_calls) if tool_calls else None
+        self.tool_call_id = tool_call_id
+        self.name = name
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a message from the OpenAI-style dict shape (as stored in session logs)."""
+        tool_calls = data.get("tool_calls")
+        return cls(
+            data.get("role") or "user",
+            data.get("content"),
+            [ToolCall.from_dict(tc) if isinstance(tc, dict) else tc for tc in tool_calls] if tool_calls else None,
+            data.get("tool_call_id"),
+            data.get("name"),
+        )
+
+    def to_dict(self, string_arguments=None):
+        """Returns the wire/log dict; see ToolCall.to_dict for string_arguments."""
+        data = {"role": self.role}
+        if self.content is not None or not self.tool_calls:
+            data["content"] = self.content
+        if self.tool_calls:
+            data["tool_calls"] = [tc.to_dict(string_arguments) for tc in self.tool_calls]
+        if self.tool_call_id:
+            data["tool_call_id"] = self.tool_call_id
+        if self.name:
+            data["name"] = self.name
+        return data
+
+    def __eq__(self, other):
+        return isinstance(other, Message) and all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        content = self.content if self.content is None or len(self.content) <= 40 else self.content[:40] + "..."
+        return f"Message({self.role!r}, {content!r}{f', tool_calls={len(self.tool_calls)}' if self.tool_calls else ''})"
+
+def as_message(value):
+    """Returns value as a Message, converting a dict."""
+    return value if isinstance(value, Message) else Message.from_dict(value)
+
+def serialize_messages(messages, string_arguments=None):
+    """Converts history messages (or dicts) into request dicts in one provider's tool-argument format."""
+    return [as_message(msg).to_dict(string_arguments) for msg in messages]
@@ -0,0 +1,366 @@
+# src/Boring/mock_llm_server.py
+"""
+Deterministic mock LLM server speaking the OpenAI and Ollama HTTP protocols, so the
+whole VORTEX pipeline can run and be load-tested without a live model.
+
+Endpoints:
+    POST /v1/chat/completions   OpenAI chat completions (non-streaming)
+    POST /v1/embeddings         OpenAI embeddings (hashed bag-of-words vectors)
+    GET  /v1/models             OpenAI model list
+    POST /api/chat              Ollama chat (stream or not)
+    GET  /api/tags              Ollama model list
+    GET  /mock/stats            Request counters
+
+OpenAI replies report usage.prompt_tokens_details.cached_tokens from a simulated
+prefix cache, so prompt-layout changes can be checked offline.
+
+Run:
+    python -m src.Boring.mock_llm_server --port 11435 --script mock_script.json --latency 0.3 --tokens-per-second 40
+
+Point VORTEX at it with:
+    OPENAI_BASE_URL=http://127.0.0.1:11435/v1   (AI_PROVIDER=openai, any OPENAI_API_KEY)
+    OLLAMA_SERVER=http://127.0.0.1:11435        (AI_PROVIDER=ollama)
+
+Script file format (all keys optional):
+    {
+      "default": "Mock reply to: {user}",
+      "rules": [
+        {"match": "weather", "tool_calls": [{"name": "get_weather_forecast", "arguments": {"location": "London"}}],
+         "final": "Here is the forecast: {tool_results}"},
+        {"match": "^hello", "content": "Hi! How can I help?"},
+        {"match": ".*", "model": "small", "content": "I'm not sure.", "latency": 0.05}
+      ]
+    }
+"match" is a case-insensitive regex on the latest user message, and the optional "model"
+one on the requested model name (so one server can stand in for a small and a large
+model). A rule with tool_calls answers with those calls first and with "final" once the
+tool results are in the history. "latency" overrides --latency for that rule's replies.
+"""
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 11435
+DEFAULT_MODEL = "mock-llm"
+EMBEDDING_DIMENSIONS = 256
+PREFIX_CACHE_MIN_TOKENS = 1024  # Like OpenAI: prompts are cached from 1024 tokens, in 128-token steps
+PREFIX_CACHE_BLOCK = 128
+PREFIX_CACHE_ENTRIES = 20000
+
+DEFAULT_SCRIPT = {
+    "default": "Mock reply to: {user}",
+    "rules": [
+        {"match": r"\btime\b", "tool_calls": [{"name": "get_time", "arguments": {}}], "final": "The time is {tool_results}."},
+    ],
+}
+
+def estimate_tokens(text):
+    return max(1, len(text or "") // 4)
+
+class MockBehaviour:
+    """Scripted replies plus latency, token rate and error injection settings."""
+
+    def __init__(self, script=None, latency=0.0, jitter=0.0, tokens_per_second=0.0, error_rate=0.0, seed=0, model=DEFAULT_MODEL):
+        script = script or DEFAULT_SCRIPT
+        self.default = script.get("default", DEFAULT_SCRIPT["default"])
+        self.rules = [dict(rule, pattern=re.compile(rule.get("match", ".*"), re.IGNORECASE),
+                           model_pattern=re.compile(rule["model"], re.IGNORECASE) if rule.get("model") else None)
+                      for rule in script.get("rules", [])]
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.model = model
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._call_counter = 0
+        self._prefix_hashes = OrderedDict()  # Hashes of prompt prefixes seen recently (simulated prompt cache)
+        self.stats = {"requests": 0, "openai": 0, "ollama": 0, "embeddings": 0, "tool_call_replies": 0, "injected_errors": 0}
+
+    def count(self, key):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def next_call_id(self):
+        with self._lock:
+            self._call_counter += 1
+            return f"call_mock_{self._call_counter:06d}"
+
+    def should_fail(self):
+        with self._lock:
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            if failed:
+                self.stats["injected_errors"] += 1
+            return failed
+
+    def delay(self, completion_text, latency=None):
+        """Simulated time to first byte plus generation time at the configured token rate."""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        generation = estimate_tokens(completion_text) / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        return max(0.0, (self.latency if latency is None else latency) + jitter) + generation
+
+    def match_rule(self, messages, model=None):
+        """Returns the first rule matching the latest user message and the requested model, or None."""
+        user_text = next((str(m.get("content") or "") for m in reversed(messages) if m.get("role") == "user"), "")
+        for rule in self.rules:
+            if rule["model_pattern"] is not None and not rule["model_pattern"].search(model or ""):
+                continue
+            if rule["pattern"].search(user_text):
+                return rule
+        return None
+
+    def reply(self, messages, model=None):
+        """Returns (content, [(name, arguments dict)]) for a conversation."""
+        last_user_index = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+        user_text = str(messages[last_user_index].get("content") or "") if last_user_index >= 0 else ""
+        tool_results = [str(m.get("content")) for m in messages[last_user_index + 1:] if m.get("role") == "tool"]
+
+        rule = self.match_rule(messages, model)
+        if rule is None:
+            return self.default.format(user=user_text, tool_results="; ".join(tool_results)), []
+        if rule.get("tool_calls") and not tool_results:
+            with self._lock:
+                self.stats["tool_call_replies"] += 1
+            return None, [(call["name"], call.get("arguments", {})) for call in rule["tool_calls"]]
+        template = rule.get("final" if tool_results else "content") or rule.get("content") or self.default
+        return template.format(user=user_text, tool_results="; ".join(tool_results)), []
+
+    def prompt_tokens(self, messages, tools=None):
+        """Returns (prompt tokens, tokens served from the simulated prefix cache)."""
+        digest = hashlib.sha1(json.dumps(tools or [], sort_keys=True).encode("utf-8"))
+        tokens = estimate_tokens(json.dumps(tools)) if tools else 0
+        cached = 0
+        prefixes = []
+        for message in messages:
+            digest.update(json.dumps(message, sort_keys=True).encode("utf-8"))
+            tokens += estimate_tokens(str(message.get("content") or "")) + 4
+            prefix = digest.hexdigest()
+            prefixes.append(prefix)
+            with self._lock:
+                if prefix in self._prefix_hashes:
+                    cached = tokens
+        with self._lock:
+            for prefix in prefixes:
+                self._prefix_hashes[prefix] = True
+                self._prefix_hashes.move_to_end(prefix)
+            while len(self._prefix_hashes) > PREFIX_CACHE_ENTRIES:
+                self._prefix_hashes.popitem(last=False)
+        if cached < PREFIX_CACHE_MIN_TOKENS:
+            cached = 0
+        return tokens, cached - cached % PREFIX_CACHE_BLOCK
+
+    @staticmethod
+    def embed(text):
+        """Deterministic unit vector from hashed word stems, so similar texts score high."""
+        vector = [0.0] * EMBEDDING_DIMENSIONS
+        for word in re.findall(r"[a-z0-9]+", (text or "").lower()):
+            digest = hashlib.md5(word[:5].encode("utf-8")).digest()
+            vector[digest[0] % EMBEDDING_DIMENSIONS] += 1.0 if digest[1] % 2 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    server_version = "VortexMockLLM/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def behaviour(self):
+        return self.server.behaviour
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # --- Helpers ---
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _maybe_fail(self, openai_style):
+        """Injects a rate-limit/overload error at the configured error rate. Returns True if sent."""
+        if not self.behaviour.should_fail():
+            return False
+        status = 429 if self.behaviour._random.random() < 0.5 else 503
+        message = "Mock rate limit exceeded" if status == 429 else "Mock server overloaded"
+        payload = {"error": {"message": message, "type": "mock_error", "code": status}} if openai_style else {"error": message}
+        self._send_json(status, payload, {"Retry-After": "1"})
+        return True
+
+    # --- Routing ---
+    def do_GET(self):
+        if self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": self.behaviour.model, "object": "model", "owned_by": "mock"}]})
+        elif self.path.rstrip("/") == "/api/tags":
+            self._send_json(200, {"models": [{
+                "name": self.behaviour.model, "model": self.behaviour.model,
+                "modified_at": datetime.now(timezone.utc).isoformat(), "size": 0, "digest": "mock", "details": {}
+            }]})
+        elif self.path.rstrip("/") == "/mock/stats":
+            self._send_json(200, dict(self.behaviour.stats))
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        try:
+            request = self._read_json()
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": "Invalid JSON body"})
+            return
+        path = self.path.rstrip("/")
+        if path == "/v1/chat/completions":
+            self._openai_chat(request)
+        elif path == "/v1/embeddings":
+            self._openai_embeddings(request)
+        elif path == "/api/chat":
+            self._ollama_chat(request)
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    # --- OpenAI protocol ---
+    def _openai_chat(self, request):
+        self.behaviour.count("openai")
+        if request.get("stream"):
+            self._send_json(400, {"error": {"message": "Streaming is not supported by the mock server", "type": "invalid_request_error"}})
+            return
+        if self._maybe_fail(openai_style=True):
+            return
+        messages = request.get("messages", [])
+        rule = self.behaviour.match_rule(messages, request.get("model"))
+        content, tool_calls = self.behaviour.reply(messages, request.get("model"))
+        time.sleep(self.behaviour.delay(content or json.dumps(tool_calls), rule.get("latency") if rule else None))
+
+        message = {"role": "assistant", "content": content}
+        if tool_calls:
+            message["tool_calls"] = [{
+                "id": self.behaviour.next_call_id(),
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(arguments)}
+            } for name, arguments in tool_calls]
+        prompt_tokens, cached_tokens = self.behaviour.prompt_tokens(messages, request.get("tools"))
+        completion_tokens = estimate_tokens(content or json.dumps(tool_calls))
+        self._send_json(200, {
+            "id": f"chatcmpl-mock-{int(time.time() * 1000)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", self.behaviour.model),
+            "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if tool_calls else "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            },
+        })
+
+    def _openai_embeddings(self, request):
+        self.behaviour.count("embeddings")
+        inputs = request.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        self._send_json(200, {
+            "object": "list",
+            "data": [{"object": "embedding", "index": i, "embedding": self.behaviour.embed(text)} for i, text in enumerate(inputs)],
+            "model": request.get("model", "mock-embedding"),
+            "usage": {"prompt_tokens": sum(estimate_tokens(t) for t in inputs), "total_tokens": sum(estimate_tokens(t) for t in inputs)},
+        })
+
+    # --- Ollama protocol ---
+    def _ollama_chat(self, request):
+        self.behaviour.count("ollama")
+        if self._maybe_fail(openai_style=False):
+            return
+        messages = request.get("messages", [])
+        rule = self.behaviour.match_rule(messages, request.get("model"))
+        content, tool_calls = self.behaviour.reply(messages, request.get("model"))
+        started = time.monotonic()
+        time.sleep(self.behaviour.delay(content or json.dumps(tool_calls), rule.get("latency") if rule else None))
+
+        message = {"role": "assistant", "content": content or ""}
+        if tool_calls:
+            message["tool_calls"] = [{"function": {"name": name, "arguments": arguments}} for name, arguments in tool_calls]
+        payload = {
+            "model": request.get("model", self.behaviour.model),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": message,
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int((time.monotonic() - started) * 1e9),
+            "prompt_eval_count": sum(estimate_tokens(str(m.get("content") or "")) for m in messages),
+            "eval_count": estimate_tokens(content or json.dumps(tool_calls)),
+        }
+        if request.get("stream", True):
+            # Ollama streams NDJSON by default; the whole reply is sent as one final chunk
+            body = (json.dumps(payload) + "\n").encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(200, payload)
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, behaviour, verbose=False):
+        super().__init__(address, MockLLMHandler)
+        self.behaviour = behaviour
+        self.verbose = verbose
+
+def start_mock_server(host="127.0.0.1", port=DEFAULT_PORT, **behaviour_options):
+    """Starts the mock server on a background thread (port 0 picks a free port). Returns the server."""
+    server = MockLLMServer((host, port), MockBehaviour(**behaviour_options))
+    threading.Thread(target=server.serve_forever, name="MockLLMServer", daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic mock LLM server (OpenAI + Ollama protocols).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--script", help="JSON file with scripted rules")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each reply")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds added to the latency")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated generation speed (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of chat requests answered with 429/503")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script, "r", encoding="utf-8") as f:
+            script = json.load(f)
+
+    behaviour = MockBehaviour(script, args.latency, args.jitter, args.tokens_per_second, args.error_rate, args.seed, args.model)
+    server = MockLLMServer((args.host, args.port), behaviour, verbose=args.verbose)
+    print(f"[MOCK LLM] Listening on http://{args.host}:{server.server_address[1]} (model: {args.model})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# src/Boring/prompt_assembler.py
+import threading
+from .debug_logger import log_debug_event
+from .messages import Message
+
+# ------------------------------
+# Prompt Layout
+# ------------------------------
+# Providers cache the longest previously seen prompt prefix (OpenAI does this
+# automatically from 1024 tokens). The prompt is therefore laid out as:
+#
+#   [system prompt] [older history ...] [volatile context] [current user message] [this turn's tool loop ...]
+#
+# The system prompt, tools and older history stay byte-identical between turns.
+# The tool router picks tools per turn, so a session keeps the tools it was offered
+# before and only appends new ones (tool_router.sticky_tools); the prefix changes
+# when a tool is added, and resets once the set outgrows its limit.
+# Per-turn context (retrieved memories) is never stored in the history; it is
+# inserted right before the message it belongs to, so the tool-loop requests of
+# the same turn share the whole prefix as well.
+
+def assemble_prompt(conversation_history, volatile_messages=None):
+    """
+    Returns the message list to send for one request. conversation_history is not modified.
+    volatile_messages are placed just before the latest user message.
+    """
+    if not volatile_messages:
+        return conversation_history
+    insert_at = len(conversation_history)
+    for i in range(len(conversation_history) - 1, -1, -1):
+        if conversation_history[i].role == "user":
+            insert_at = i
+            break
+    return conversation_history[:insert_at] + list(volatile_messages) + conversation_history[insert_at:]
+
+def memory_context_message(memories):
+    """Builds the volatile system message carrying retrieved memories."""
+    return Message("system", "Context/Memory:\n" + "\n".join(memories))
+
+class PromptCacheStats:
+    """Tracks how many prompt tokens the provider served from its prefix cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.requests_with_cache_hit = 0
+
+    def record(self, provider, usage):
+        """Records one response's usage. cached_tokens is None when the provider does not report it."""
+        prompt_tokens = (usage or {}).get("prompt_tokens")
+        cached_tokens = (usage or {}).get("cached_tokens")
+        if not prompt_tokens or cached_tokens is None:
+            return
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+            self.cached_tokens += cached_tokens
+            if cached_tokens:
+                self.requests_with_cache_hit += 1
+        log_debug_event(f"{provider.upper()} prompt cache: {cached_tokens}/{prompt_tokens} prompt tokens cached.")
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "cached_token_ratio": round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0,
+                "request_hit_rate": round(self.requests_with_cache_hit / self.requests, 3) if self.requests else 0.0,
+            }
+
+prompt_cache_stats = PromptCacheStats()
+
+def get_prompt_cache_stats():
+    """Returns cumulative prompt-cache usage reported by the provider."""
+    return prompt_cache_stats.snapshot()
@@ -0,0 +1,280 @@
+# src/Boring/provider_client.py
+import os
+import time
+import random
+import asyncio
+from collections import deque
+from email.utils import parsedate_to_datetime
+from .debug_logger import log_debug_event
+
+# ------------------------------
+# Provider Client Configuration
+# ------------------------------
+PROVIDER_MAX_ATTEMPTS = max(1, int(os.getenv("VORTEX_PROVIDER_MAX_ATTEMPTS", "4")))
+RETRY_BASE_DELAY = float(os.getenv("VORTEX_RETRY_BASE_DELAY", "0.5"))     # Seconds
+RETRY_MAX_DELAY = float(os.getenv("VORTEX_RETRY_MAX_DELAY", "20"))        # Seconds, also caps Retry-After
+HEDGE_REQUESTS = os.getenv("VORTEX_HEDGE_REQUESTS", "false").lower() == "true"
+HEDGE_MIN_SAMPLES = 20           # Latency samples needed before hedging kicks in
+HEDGE_MIN_DELAY = 1.0            # Never hedge sooner than this (seconds)
+UNHEALTHY_AFTER_FAILURES = max(1, int(os.getenv("VORTEX_UNHEALTHY_AFTER_FAILURES", "2")))
+UNHEALTHY_COOLDOWN = float(os.getenv("VORTEX_UNHEALTHY_COOLDOWN", "30"))  # Seconds before retrying a failed provider
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+PROVIDER_FAULT_STATUS_CODES = {401, 402, 403, 404}  # Bad key, billing, no access, unknown model/endpoint
+
+class ProviderUnavailableError(Exception):
+    """
+    Raised when every attempt on every configured provider has failed, or a provider
+    rejected the request in a way retrying cannot fix. Callers should not retry it.
+    """
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY):
+    """Exponential backoff with full jitter for the given 1-based attempt number."""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+def _status_code(error):
+    """Returns the HTTP status code carried by an SDK error, if any."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) and status > 0 else None
+
+def retry_after_seconds(error):
+    """Reads Retry-After / retry-after-ms from an SDK error's HTTP response, in seconds."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            return float(retry_after_ms) / 1000.0
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except Exception:
+        return None
+
+def is_retryable(error):
+    """True for timeouts, connection failures, rate limits and server errors."""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    # SDK connection/timeout errors carry no status code
+    name = type(error).__name__
+    return any(marker in name for marker in ("Timeout", "Connection", "Connect", "Network", "RemoteProtocol"))
+
+def is_provider_fault(error):
+    """
+    True for non-retryable errors that every request to this provider would hit
+    (authentication, permissions, a missing model). Other 4xx errors (bad request,
+    context length, unprocessable tool schema) belong to the one request.
+    """
+    return _status_code(error) in PROVIDER_FAULT_STATUS_CODES or "Authentication" in type(error).__name__
+
+class ProviderHealth:
+    """Tracks latency and recent failures for one provider."""
+
+    def __init__(self, name):
+        self.name = name
+        self.latencies = deque(maxlen=200)
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def healthy(self):
+        return time.monotonic() >= self.unhealthy_until
+
+    def record_success(self, latency):
+        self.calls += 1
+        self.latencies.append(latency)
+        if self.consecutive_failures or not self.healthy():
+            log_debug_event(f"Provider {self.name} recovered.")
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+
+    def record_failure(self, force_unhealthy=False):
+        self.calls += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        if force_unhealthy or self.consecutive_failures >= UNHEALTHY_AFTER_FAILURES:
+            self.unhealthy_until = time.monotonic() + UNHEALTHY_COOLDOWN
+            log_debug_event(f"Provider {self.name} marked unhealthy for {UNHEALTHY_COOLDOWN:g}s after {self.consecutive_failures} failure(s).", is_error=True)
+
+    def record_rejected(self):
+        """The provider refused this one request (e.g. 400/422); its health is unaffected."""
+        self.calls += 1
+        self.rejected += 1
+
+    def latency_percentile(self, p):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def hedge_delay(self):
+        """Seconds to wait before hedging, or None if hedging is off or there is too little data."""
+        if not HEDGE_REQUESTS or len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(HEDGE_MIN_DELAY, self.latency_percentile(0.95))
+
+    def snapshot(self):
+        p50 = self.latency_percentile(0.50)
+        p95 = self.latency_percentile(0.95)
+        return {
+            "healthy": self.healthy(),
+            "calls": self.calls,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_p50": round(p50, 3) if p50 is not None else None,
+            "latency_p95": round(p95, 3) if p95 is not None else None,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+class ProviderClient:
+    """
+    Sends a completion request to the configured providers with:
+    - exponential backoff with full jitter between retries, honouring Retry-After
+    - an optional hedged duplicate request once the p95 latency has passed
+    - failover to the next healthy provider, and back once the primary recovers
+
+    request_fn(provider_name) must return a coroutine that performs one request.
+    """
+
+    def __init__(self, providers):
+        self.providers = [p for i, p in enumerate(providers) if p and p not in providers[:i]]
+        self.health = {name: ProviderHealth(name) for name in self.providers}
+        self.failovers = 0
+
+    def provider_order(self, available=None):
+        """Healthy providers in priority order, then unhealthy ones by soonest recovery."""
+        candidates = [p for p in self.providers if available is None or p in available]
+        healthy = [p for p in candidates if self.health[p].healthy()]
+        unhealthy = sorted((p for p in candidates if p not in healthy), key=lambda p: self.health[p].unhealthy_until)
+        return healthy + unhealthy
+
+    async def complete(self, request_fn, available=None, max_attempts=PROVIDER_MAX_ATTEMPTS, deadline=None, min_attempt_time=0.0):
+        """
+        Returns (provider_name, result). Raises ProviderUnavailableError when all attempts fail
+        or the request is rejected with nowhere to fail over to; the SDK error is its cause.
+        With a deadline, no retry is started (and no backoff slept) once less than
+        min_attempt_time would be left for it.
+        """
+        last_error = None
+        previous_provider = None
+        for attempt in range(1, max_attempts + 1):
+            order = self.provider_order(available)
+            if not order:
+                raise ProviderUnavailableError("No AI provider is configured.")
+            provider = order[0]
+            if previous_provider and provider != previous_provider:
+                self.failovers += 1
+                log_debug_event(f"Failing over from {previous_provider} to {provider}.")
+            previous_provider = provider
+
+            try:
+                result = await self._call_with_hedge(provider, request_fn)
+                return provider, result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                last_error = e
+                if isinstance(e, asyncio.TimeoutError) and deadline is not None and not deadline.allows(min_attempt_time):
+                    # Cut short by the turn's deadline, not a provider fault
+                    log_debug_event(f"{provider.upper()} request stopped at the turn deadline.")
+                    break
+                retryable = is_retryable(e)
+                if retryable or is_provider_fault(e):
+                    self.health[provider].record_failure(force_unhealthy=not retryable)
+                else:
+                    self.health[provider].record_rejected() # Fails this request only; other sessions keep the provider
+                log_debug_event(f"{provider.upper()} request failed (attempt {attempt}/{max_attempts}, retryable={retryable}): {type(e).__name__}: {e}", is_error=True)
+
+                next_order = self.provider_order(available)
+                switching = next_order and next_order[0] != provider
+                if not retryable and not switching:
+                    raise ProviderUnavailableError(f"{provider.upper()} rejected the request: {type(e).__name__}: {e}") from e
+                if attempt == max_attempts:
+                    break
+                if deadline is not None and not deadline.allows(min_attempt_time):
+                    log_debug_event(f"Not retrying {provider.upper()}: only {deadline.remaining():.1f}s left in the turn.")
+                    break
+                if switching:
+                    continue # Fail over straight away; the other provider has not been waiting on us
+
+                delay = backoff_delay(attempt)
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None:
+                    delay = max(delay, min(retry_after, RETRY_MAX_DELAY))
+                if deadline is not None and not deadline.allows(delay + min_attempt_time):
+                    log_debug_event(f"Not retrying {provider.upper()}: a {delay:.1f}s backoff does not fit in the {deadline.remaining():.1f}s left.")
+                    break
+                log_debug_event(f"Retrying {provider.upper()} in {delay:.2f}s.")
+                await asyncio.sleep(delay)
+
+        raise ProviderUnavailableError(f"All AI provider attempts failed: {last_error}") from last_error
+
+    async def _call_with_hedge(self, provider, request_fn):
+        """Runs one request; if it outlives the provider's p95 latency, races a second copy."""
+        health = self.health[provider]
+        hedge_delay = health.hedge_delay()
+
+        async def timed():
+            started = time.monotonic()
+            result = await request_fn(provider)
+            return result, time.monotonic() - started
+
+        first = asyncio.ensure_future(timed())
+        tasks = [first]
+        try:
+            if hedge_delay is None:
+                result, latency = await first
+                health.record_success(latency)
+                return result
+
+            done, _ = await asyncio.wait({first}, timeout=hedge_delay)
+            if done:
+                result, latency = first.result()
+                health.record_success(latency)
+                return result
+
+            health.hedges += 1
+            log_debug_event(f"{provider.upper()} request exceeded p95 ({hedge_delay:.2f}s); sending hedged request.")
+            hedge = asyncio.ensure_future(timed())
+            tasks.append(hedge)
+            pending = {first, hedge}
+            last_error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        result, latency = task.result()
+                        if task is hedge:
+                            health.hedge_wins += 1
+                        health.record_success(latency)
+                        return result
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            # asyncio.wait() does not cancel its tasks when the caller is cancelled (barge-in,
+            # stop, losing hedge): release every request still holding a connection
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self):
+        return {
+            "providers": {name: health.snapshot() for name, health in self.health.items()},
+            "failovers": self.failovers,
+        }
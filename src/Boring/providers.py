@@ -0,0 +1,297 @@
+# src/Boring/providers.py
+import os
+import json
+import time
+import asyncio
+import threading
+from dotenv import load_dotenv
+from src.Capabilities.debug_mode import get_debug_mode
+from .debug_logger import log_debug_event
+from .messages import ToolCall, serialize_messages
+
+# ------------------------------
+# Provider Configuration
+# ------------------------------
+load_dotenv()
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # e.g. the mock LLM server: http://127.0.0.1:11435/v1
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "qwq:32b")
+OLLAMA_SERVER = os.getenv("OLLAMA_SERVER")
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # How long Ollama keeps the model loaded ("-1" = forever)
+OLLAMA_WARMUP = os.getenv("OLLAMA_WARMUP", "true").lower() == "true"
+OLLAMA_MIN_CTX = int(os.getenv("OLLAMA_MIN_CTX", "8192"))
+OLLAMA_MAX_CTX = int(os.getenv("OLLAMA_MAX_CTX", "32768"))
+OLLAMA_CTX_BUCKETS = (2048, 4096, 8192, 16384, 32768, 65536, 131072)
+OLLAMA_REPLY_RESERVE = 2048     # Tokens left free for the reply
+DEFAULT_TOKENS_PER_CHAR = 0.3   # Conservative until a real prompt_eval_count has been measured
+PROVIDER_REQUEST_TIMEOUT = float(os.getenv("VORTEX_PROVIDER_TIMEOUT", "60"))  # Seconds per request, at most; a turn's deadline may allow less
+
+def normalize_tool_calls(tool_calls, string_arguments):
+    """
+    Converts SDK tool call objects into ToolCall entries for the history.
+    Arguments keep the provider's wire format (JSON string or dict). Missing IDs are
+    generated so the history can be replayed against any provider after a failover.
+    """
+    normalized = []
+    for tool_call in tool_calls or []:
+        function = getattr(tool_call, 'function', None)
+        if function is None or not getattr(function, 'name', None):
+            if get_debug_mode(): print(f"[DEBUG] Skipping tool_call due to missing function/name attributes: {tool_call}")
+            continue
+        arguments = getattr(function, 'arguments', None)
+        if string_arguments and not isinstance(arguments, str):
+            arguments = json.dumps(dict(arguments or {}))
+        elif not string_arguments and arguments is not None and not isinstance(arguments, str):
+            arguments = dict(arguments)
+        normalized.append(ToolCall(getattr(tool_call, 'id', None), function.name, arguments))
+    return normalized or None
+
+class ProviderAdapter:
+    """
+    Interface between VORTEX and one chat-completion backend.
+
+    Subclasses create their client, send a request and translate the reply into
+    {"content": str|None, "tool_calls": [ToolCall]|None, "usage": {...}}.
+    Histories are shared between providers, so adapters also convert tool call
+    arguments into their own wire format before sending.
+    """
+    name = None
+    string_arguments = True  # Tool call arguments sent as a JSON string (False: as an object)
+
+    def __init__(self, model):
+        self.model = model
+        self.client = None
+
+    # --- Lifecycle ---
+    def connect(self):
+        """Creates the client. Raises if the provider cannot be used."""
+        raise NotImplementedError
+
+    async def close(self):
+        """Closes the client's connections."""
+        self.client = None
+
+    def describe(self):
+        """Short label for banners and logs."""
+        return f"{self.name} ({self.model})"
+
+    def warm_up(self):
+        """Optionally preloads the model so the first real request is fast."""
+
+    # --- Requests ---
+    async def chat(self, messages, tools=None, tool_choice=None, timeout=None):
+        """
+        Sends one chat request and returns the normalized reply. Raises asyncio.TimeoutError
+        after timeout seconds (default PROVIDER_REQUEST_TIMEOUT).
+        """
+        raise NotImplementedError
+
+    def prepare_messages(self, messages):
+        """Serialises history messages into request dicts, with tool call arguments in this provider's format."""
+        return serialize_messages(messages, self.string_arguments)
+
+def create_openai_client(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL):
+    """
+    A synchronous OpenAI client for embedding requests, pointed at the same endpoint
+    (OPENAI_BASE_URL) as OpenAIAdapter so every OpenAI call goes to one place.
+    """
+    import openai
+    return openai.OpenAI(api_key=api_key, base_url=base_url)
+
+class OpenAIAdapter(ProviderAdapter):
+    name = "openai"
+    string_arguments = True
+
+    def __init__(self, model=OPENAI_MODEL, api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL):
+        super().__init__(model)
+        self.api_key = api_key
+        self.base_url = base_url
+
+    def connect(self):
+        import openai
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY missing for AI_PROVIDER='openai'")
+        # Retries are handled by ProviderClient; SDK retries would multiply them
+        self.client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+        print(f"[CONFIG] Using AI Provider: OpenAI (Model: {self.model}{', Base URL: ' + self.base_url if self.base_url else ''})")
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.close()
+        self.client = None
+
+    def describe(self):
+        return f"OpenAI ({self.model})"
+
+    async def chat(self, messages, tools=None, tool_choice=None, timeout=None):
+        if not self.client:
+            raise ConnectionError("OpenAI client missing")
+
+        log_debug_event(f"Calling OpenAI API with {len(messages)} messages.")
+        request = {"model": self.model, "messages": self.prepare_messages(messages)}
+        if tools:
+            request["tools"] = tools
+            request["tool_choice"] = tool_choice or "auto"
+
+        response = await asyncio.wait_for(self.client.chat.completions.create(**request), timeout=timeout or PROVIDER_REQUEST_TIMEOUT)
+
+        assistant_message = response.choices[0].message
+        usage = getattr(response, "usage", None)
+        # Prompt tokens served from OpenAI's automatic prefix cache
+        cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+        return {
+            "content": assistant_message.content,
+            "tool_calls": normalize_tool_calls(assistant_message.tool_calls, self.string_arguments),
+            "usage": {
+                "prompt_tokens": getattr(usage, "prompt_tokens", None),
+                "completion_tokens": getattr(usage, "completion_tokens", None),
+                "cached_tokens": cached_tokens if cached_tokens is not None else (0 if usage is not None else None),
+            }
+        }
+
+class OllamaAdapter(ProviderAdapter):
+    name = "ollama"
+    string_arguments = False
+
+    def __init__(self, model=OLLAMA_MODEL, host=OLLAMA_SERVER, keep_alive=OLLAMA_KEEP_ALIVE):
+        super().__init__(model)
+        self.host = host
+        # Ollama accepts a duration string ("30m") or seconds; "-1" pins the model
+        self.keep_alive = int(keep_alive) if keep_alive.lstrip("-").isdigit() else keep_alive
+        # num_ctx only grows, in fixed buckets: a changed num_ctx makes Ollama reload the model
+        self.num_ctx = self._bucket(OLLAMA_MIN_CTX)
+        self.tokens_per_char = DEFAULT_TOKENS_PER_CHAR
+        self._ctx_lock = threading.Lock()
+
+    def connect(self):
+        import ollama
+        try:
+            ollama_options = {}
+            if self.host:
+                ollama_options['host'] = self.host
+
+            # Create client with explicit timeout
+            self.client = ollama.AsyncClient(**ollama_options, timeout=PROVIDER_REQUEST_TIMEOUT)
+            # Sync check for connectivity (this is fine here as it's part of init)
+            try:
+                sync_client = ollama.Client(**ollama_options) # For sync check only
+                models = sync_client.list()
+                print(f"[CONFIG] Using AI Provider: Ollama (Model: {self.model}, Server: {self.host or 'Default'}) - Connection OK")
+                if isinstance(models, dict) and 'models' in models:
+                    model_names = [m.get('name', str(m)) for m in models['models']]
+                    print(f"Available models: {model_names}")
+            except Exception as conn_err:
+                 print(f"[WARN] Ollama connection check failed (Server: {self.host or 'Default'}): {conn_err}. Proceeding...")
+        except Exception as e:
+            # Log the error before raising, to ensure it's visible
+            log_debug_event(f"Failed to initialize Ollama client: {e}", is_error=True)
+            raise RuntimeError(f"Failed to initialize Ollama client: {e}")
+
+    async def close(self):
+        if self.client is not None:
+            # Close all connections in the Ollama client's connection pool
+            await self.client.aclose()
+        self.client = None
+
+    def describe(self):
+        return f"Ollama ({self.model})"
+
+    def warm_up(self):
+        """
+        Loads the model in the background with the same num_ctx and keep_alive the first
+        request will use (an empty chat request only loads the model).
+        """
+        if not OLLAMA_WARMUP:
+            return
+
+        def load_model():
+            import ollama
+            started = time.monotonic()
+            try:
+                sync_client = ollama.Client(**({'host': self.host} if self.host else {}))
+                sync_client.chat(model=self.model, messages=[], keep_alive=self.keep_alive, options={'num_ctx': self.num_ctx})
+                log_debug_event(f"Ollama model {self.model} warmed up in {time.monotonic() - started:.1f}s (num_ctx={self.num_ctx}, keep_alive={self.keep_alive}).")
+            except Exception as e:
+                log_debug_event(f"Ollama warm-up failed: {e}", is_error=True)
+
+        threading.Thread(target=load_model, name="OllamaWarmUp", daemon=True).start()
+
+    @staticmethod
+    def _bucket(tokens):
+        """Smallest bucket that fits tokens, clamped to OLLAMA_MAX_CTX."""
+        for size in OLLAMA_CTX_BUCKETS:
+            if size >= tokens:
+                return min(size, OLLAMA_MAX_CTX)
+        return OLLAMA_MAX_CTX
+
+    def context_size(self, prompt_chars):
+        """Returns the num_ctx for a prompt, growing the sticky bucket only when it no longer fits."""
+        needed = int(prompt_chars * self.tokens_per_char) + OLLAMA_REPLY_RESERVE
+        with self._ctx_lock:
+            if needed > self.num_ctx and self.num_ctx < OLLAMA_MAX_CTX:
+                new_ctx = self._bucket(needed)
+                log_debug_event(f"Growing Ollama num_ctx {self.num_ctx} -> {new_ctx} (~{needed} tokens needed).")
+                self.num_ctx = new_ctx
+            return self.num_ctx
+
+    def observe_prompt(self, prompt_chars, prompt_tokens):
+        """Calibrates the chars-to-tokens ratio from a measured prompt_eval_count."""
+        if not prompt_chars or not prompt_tokens:
+            return
+        # prompt_eval_count excludes prompt-cache hits, so it can only raise the estimate
+        with self._ctx_lock:
+            self.tokens_per_char = max(self.tokens_per_char, prompt_tokens / prompt_chars)
+
+    def request_options(self, prompt_chars):
+        """Sampling and context options sent with each request."""
+        return {
+            'num_ctx': self.context_size(prompt_chars),
+            'top_k': 40,      # Consider more tokens
+            'top_p': 0.9,     # Nucleus sampling
+            'repeat_penalty': 1.1  # Reduce repetition
+        }
+
+    async def chat(self, messages, tools=None, tool_choice=None, timeout=None):
+        if not self.client:
+            raise ConnectionError("Ollama client missing")
+
+        log_debug_event(f"Calling Ollama API with {len(messages)} messages.")
+        messages = self.prepare_messages(messages)
+        prompt_chars = len(json.dumps(messages, default=str)) + (len(json.dumps(tools)) if tools else 0)
+        # The client's own timeout is the PROVIDER_REQUEST_TIMEOUT cap; a turn deadline may allow less
+        response = await asyncio.wait_for(self.client.chat(
+            model=self.model,
+            messages=messages,
+            tools=tools,
+            stream=False,
+            options=self.request_options(prompt_chars),
+            keep_alive=self.keep_alive
+        ), timeout=timeout or PROVIDER_REQUEST_TIMEOUT)
+        self.observe_prompt(prompt_chars, getattr(response, "prompt_eval_count", None))
+
+        assistant_message = response.message
+        return {
+            "content": assistant_message.content,
+            "tool_calls": normalize_tool_calls(getattr(assistant_message, 'tool_calls', None), self.string_arguments),
+            "usage": {
+                "prompt_tokens": getattr(response, "prompt_eval_count", None),
+                "completion_tokens": getattr(response, "eval_count", None),
+            }
+        }
+
+# Provider name -> adapter class. New backends register here.
+PROVIDER_ADAPTERS = {
+    "openai": OpenAIAdapter,
+    "ollama": OllamaAdapter,
+}
+
+def create_adapter(provider, **settings):
+    """
+    Returns an unconnected adapter for a provider name. settings override the adapter's
+    constructor defaults (e.g. model, base_url for OpenAI, host for Ollama).
+    """
+    adapter_class = PROVIDER_ADAPTERS.get(provider)
+    if adapter_class is None:
+        raise ValueError(f"Unsupported AI_PROVIDER: {provider}. Choose one of: {', '.join(PROVIDER_ADAPTERS)}.")
+    return adapter_class(**settings)
@@ -0,0 +1,231 @@
+# src/Boring/response_cache.py
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from dotenv import load_dotenv
+from .debug_logger import log_debug_event
+from .capabilities import get_capability_option
+from .providers import create_openai_client
+
+# ------------------------------
+# Response Cache Configuration
+# ------------------------------
+load_dotenv()
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+RESPONSE_CACHE_ENABLED = os.getenv("VORTEX_RESPONSE_CACHE", "false").lower() == "true"  # Opt-in
+RESPONSE_CACHE_SIZE = max(1, int(os.getenv("VORTEX_RESPONSE_CACHE_SIZE", "256")))
+RESPONSE_CACHE_TTL = float(os.getenv("VORTEX_RESPONSE_CACHE_TTL", "600"))  # Seconds, for turns without a tool-specific TTL
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("VORTEX_RESPONSE_CACHE_SIMILARITY", "0.93"))
+RESPONSE_CACHE_USE_EMBEDDINGS = os.getenv("VORTEX_RESPONSE_CACHE_EMBEDDINGS", "true").lower() == "true"
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+_CONTRACTIONS = {
+    "what's": "what is", "whats": "what is", "who's": "who is", "where's": "where is",
+    "how's": "how is", "it's": "it is", "i'm": "i am", "don't": "do not", "what're": "what are",
+}
+
+# Follow-up phrasing whose meaning depends on earlier turns; never answered from cache
+_CONTEXT_WORDS = {"it", "that", "this", "those", "these", "them", "they", "he", "she", "again", "else", "more", "previous", "above"}
+_CONTEXT_PREFIXES = ("and ", "also ", "what about ", "how about ", "then ")
+
+def normalize_query(text):
+    """Lowercases, expands common contractions and strips punctuation and extra whitespace."""
+    text = text.lower().strip()
+    for contraction, expanded in _CONTRACTIONS.items():
+        text = text.replace(contraction, expanded)
+    text = re.sub(r"[^a-z0-9\s]", " ", text)
+    return " ".join(text.split())
+
+def is_context_dependent(normalized):
+    """True for follow-ups like "and tomorrow?" or "tell me more about it"."""
+    return normalized.startswith(_CONTEXT_PREFIXES) or bool(_CONTEXT_WORDS & set(normalized.split()))
+
+def fingerprint(value):
+    """Stable short hash of any JSON-serialisable value."""
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+def tool_catalog_fingerprint(schemas):
+    """Fingerprint of the registered tools; entries are invalidated when capabilities change."""
+    return fingerprint(sorted(schema["function"]["name"] for schema in schemas or []))
+
+def turn_ttl(tool_names):
+    """
+    The TTL for a turn is the shortest "cache_ttl" among the tools it used (e.g. get_time
+    is 0, so its answers are never cached). Caching is opt-in per tool: returns 0 if any
+    tool declares neither "read_only" nor "cache_ttl", or has side effects, since a hit
+    replays those calls.
+    """
+    ttl = RESPONSE_CACHE_TTL
+    for name in tool_names:
+        if get_capability_option(name, "side_effects", False):
+            return 0
+        tool_ttl = get_capability_option(name, "cache_ttl")
+        if tool_ttl is None and not get_capability_option(name, "read_only", False):
+            return 0
+        if tool_ttl is not None:
+            ttl = min(ttl, float(tool_ttl))
+    return ttl
+
+class CacheEntry:
+    __slots__ = ("normalized", "vector", "response", "catalog", "tool_calls", "result_fingerprint",
+                 "created_at", "ttl", "turn_latency", "hits")
+
+    def __init__(self, normalized, vector, response, catalog, tool_calls, result_fingerprint, ttl, turn_latency):
+        self.normalized = normalized
+        self.vector = vector
+        self.response = response
+        self.catalog = catalog
+        self.tool_calls = tool_calls                  # [(name, args)] the turn ran, replayed to validate a hit
+        self.result_fingerprint = result_fingerprint  # Fingerprint of those tools' results
+        self.created_at = time.time()
+        self.ttl = ttl
+        self.turn_latency = turn_latency
+        self.hits = 0
+
+    def expired(self, now=None):
+        return (now or time.time()) - self.created_at > self.ttl
+
+class ResponseCache:
+    """
+    Answers repeated questions without an LLM round trip.
+
+    Entries are matched on the normalised user input (exactly, or by embedding similarity)
+    and the current tool catalogue. If the original turn used tools, the caller replays
+    those read-only tool calls and the hit is only served when the results fingerprint
+    the same as before, so a changed forecast or calendar is never answered from cache.
+    Only turns whose tools are all flagged "read_only" or carry a "cache_ttl" are stored,
+    so a hit never replays a tool that was not declared safe to repeat.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE, similarity=RESPONSE_CACHE_SIMILARITY, use_embeddings=RESPONSE_CACHE_USE_EMBEDDINGS):
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.use_embeddings = use_embeddings and bool(OPENAI_API_KEY)
+        self._client = None
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # normalized query -> CacheEntry, least recently used first
+        self.stats = {"lookups": 0, "hits": 0, "misses": 0, "stale": 0, "bypassed": 0, "stores": 0, "latency_saved": 0.0}
+
+    # --- Embeddings ---
+    def _embed(self, text):
+        """Returns a unit vector for text, or None when embeddings are unavailable."""
+        if not self.use_embeddings:
+            return None
+        try:
+            if self._client is None:
+                self._client = create_openai_client()
+            response = self._client.embeddings.create(model=EMBEDDING_MODEL, input=[text])
+            vector = np.array(response.data[0].embedding, dtype="float32")
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else None
+        except Exception as e:
+            log_debug_event(f"Response cache embedding failed, using exact matches only: {e}", is_error=True)
+            return None
+
+    # --- Lookup / Store ---
+    def lookup(self, user_input, catalog):
+        """
+        Returns (entry, normalized, vector) where entry is the best live match or None.
+        normalized is None when the input must bypass the cache. Blocking (may embed).
+        """
+        normalized = normalize_query(user_input or "")
+        if not normalized or is_context_dependent(normalized):
+            with self._lock:
+                self.stats["bypassed"] += 1
+            return None, None, None
+
+        with self._lock:
+            self.stats["lookups"] += 1
+            self._purge_expired()
+            entry = self._entries.get(normalized)
+            if entry is not None and entry.catalog == catalog:
+                self._entries.move_to_end(normalized)
+                return entry, normalized, entry.vector
+            has_vectors = any(e.vector is not None for e in self._entries.values())
+
+        vector = self._embed(normalized)
+        if vector is None or not has_vectors:
+            return None, normalized, vector
+
+        with self._lock:
+            best, best_score = None, self.similarity
+            for candidate in self._entries.values():
+                if candidate.vector is None or candidate.catalog != catalog:
+                    continue
+                score = float(np.dot(candidate.vector, vector))
+                if score >= best_score:
+                    best, best_score = candidate, score
+            if best is not None:
+                self._entries.move_to_end(best.normalized)
+                log_debug_event(f"Response cache semantic match ({best_score:.3f}): '{normalized}' ~ '{best.normalized}'")
+        return best, normalized, vector
+
+    def store(self, normalized, vector, response, catalog, tool_calls, tool_results, turn_latency):
+        """Caches a completed turn unless its tools forbid it. Returns True if stored."""
+        ttl = turn_ttl(name for name, _ in tool_calls)
+        if ttl <= 0:
+            with self._lock:
+                self.stats["bypassed"] += 1
+            return False
+        entry = CacheEntry(normalized, vector, response, catalog, tool_calls, fingerprint(tool_results), ttl, turn_latency)
+        with self._lock:
+            self._entries[normalized] = entry
+            self._entries.move_to_end(normalized)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stats["stores"] += 1
+        log_debug_event(f"Response cache stored '{normalized}' (ttl {ttl:g}s, {len(tool_calls)} tool call(s)).")
+        return True
+
+    def validate(self, entry, tool_results):
+        """True if replayed tool results match the cached ones; stale entries are dropped."""
+        if fingerprint(tool_results) == entry.result_fingerprint:
+            return True
+        with self._lock:
+            self.stats["stale"] += 1
+            if self._entries.get(entry.normalized) is entry:
+                del self._entries[entry.normalized]
+        log_debug_event(f"Response cache entry '{entry.normalized}' is stale; tool results changed.")
+        return False
+
+    def record_hit(self, entry, hit_latency):
+        saved = max(entry.turn_latency - hit_latency, 0.0)
+        with self._lock:
+            entry.hits += 1
+            self.stats["hits"] += 1
+            self.stats["latency_saved"] += saved
+        log_debug_event(f"Response cache hit for '{entry.normalized}' in {hit_latency * 1000:.0f}ms (saved ~{saved:.2f}s).")
+
+    def record_miss(self):
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def _purge_expired(self):
+        now = time.time()
+        for key in [key for key, entry in self._entries.items() if entry.expired(now)]:
+            del self._entries[key]
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        served = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["hit_rate"] = round(stats["hits"] / served, 3) if served else 0.0
+        stats["latency_saved"] = round(stats["latency_saved"], 3)
+        stats["enabled"] = RESPONSE_CACHE_ENABLED
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+response_cache = ResponseCache()
+
+def get_response_cache_stats():
+    """Returns hit rate, latency saved and entry counts for the response cache."""
+    return response_cache.get_stats()
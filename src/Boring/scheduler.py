@@ -0,0 +1,201 @@
+# src/Boring/scheduler.py
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from .debug_logger import log_debug_event
+
+# ------------------------------
+# Scheduler Configuration
+# ------------------------------
+PROVIDER_CONCURRENCY = max(1, int(os.getenv("VORTEX_PROVIDER_CONCURRENCY", "4")))
+TURN_QUEUE_LIMIT = max(0, int(os.getenv("VORTEX_TURN_QUEUE_LIMIT", "32")))
+SLOW_WAIT_WARNING = 2.0  # Seconds a turn may queue before it is logged
+
+class SchedulerBusyError(Exception):
+    """Raised when the turn queue is full and a new turn cannot be accepted."""
+
+class SchedulerTimeoutError(SchedulerBusyError):
+    """Raised when a turn's deadline runs out while it is still waiting in the queue."""
+
+class _Waiter:
+    __slots__ = ("session_id", "future", "enqueued_at")
+
+    def __init__(self, session_id, future):
+        self.session_id = session_id
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+class TurnScheduler:
+    """
+    Admits conversation turns in front of call_ai_provider.
+
+    - Turns of the same session run one at a time, in arrival order.
+    - Turns of different sessions run in parallel, up to max_concurrency.
+    - When max_queue turns are already waiting, new turns are rejected with
+      SchedulerBusyError so callers can shed load instead of piling up.
+    - A turn given a timeout leaves the queue with SchedulerTimeoutError when it
+      has not started by then.
+
+    Works across event loops in different threads (AI thread, web request threads).
+    """
+
+    def __init__(self, max_concurrency=PROVIDER_CONCURRENCY, max_queue=TURN_QUEUE_LIMIT):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self._active_sessions = set()
+        self._in_flight = 0
+        # Metrics
+        self._admitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._recent_waits = deque(maxlen=500)
+
+    # --- Admission ---
+    async def acquire(self, session_id, timeout=None):
+        """
+        Waits until a turn for session_id may start. Raises SchedulerBusyError if the queue
+        is full and SchedulerTimeoutError if it has not started within timeout seconds.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._can_start(session_id):
+                self._start_locked(session_id, 0.0)
+                return
+            if len(self._waiters) >= self.max_queue:
+                self._rejected += 1
+                raise SchedulerBusyError(f"Turn queue is full ({len(self._waiters)} waiting). Try again shortly.")
+            waiter = _Waiter(session_id, loop.create_future())
+            self._waiters.append(waiter)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._waiters))
+            # Earlier waiters may all be blocked on busy sessions; this one may be able to start
+            granted = self._dispatch_locked()
+        self._grant_all(granted)
+
+        try:
+            if timeout is not None:
+                await asyncio.wait((waiter.future,), timeout=timeout)
+                if not waiter.future.done():
+                    with self._lock:
+                        still_waiting = waiter in self._waiters
+                        if still_waiting:
+                            self._waiters.remove(waiter)
+                            self._timed_out += 1
+                    if still_waiting:
+                        waiter.future.cancel()
+                        raise SchedulerTimeoutError(f"Turn waited {time.monotonic() - waiter.enqueued_at:.1f}s in the queue without starting.")
+                    # Admitted just as the wait ran out; the grant is on its way
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                still_waiting = waiter in self._waiters
+                if still_waiting:
+                    self._waiters.remove(waiter)
+            # Admission was already granted; give the slot back
+            if not still_waiting and waiter.future.done() and not waiter.future.cancelled():
+                self.release(session_id)
+            raise
+
+    def release(self, session_id):
+        """Marks a turn as finished and admits whichever waiters can now start."""
+        with self._lock:
+            self._active_sessions.discard(session_id)
+            self._in_flight -= 1
+            self._completed += 1
+            granted = self._dispatch_locked()
+        self._grant_all(granted)
+
+    @asynccontextmanager
+    async def slot(self, session_id, timeout=None):
+        """Async context manager wrapping acquire/release for one turn."""
+        await self.acquire(session_id, timeout)
+        try:
+            yield
+        finally:
+            self.release(session_id)
+
+    def _can_start(self, session_id):
+        return self._in_flight < self.max_concurrency and session_id not in self._active_sessions
+
+    def _start_locked(self, session_id, waited):
+        self._active_sessions.add(session_id)
+        self._in_flight += 1
+        self._admitted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        self._recent_waits.append(waited)
+
+    def _dispatch_locked(self):
+        """Pops every waiter that can start now, oldest first. Returns the futures to resolve."""
+        granted = []
+        now = time.monotonic()
+        for waiter in list(self._waiters):
+            if self._in_flight >= self.max_concurrency:
+                break
+            if waiter.session_id in self._active_sessions:
+                continue # An earlier turn of this session is running; keep order
+            self._waiters.remove(waiter)
+            waited = now - waiter.enqueued_at
+            self._start_locked(waiter.session_id, waited)
+            if waited > SLOW_WAIT_WARNING:
+                log_debug_event(f"Turn for session {waiter.session_id} queued {waited:.2f}s before starting.")
+            granted.append(waiter)
+        return granted
+
+    def _grant_all(self, granted):
+        for waiter in granted:
+            waiter.future.get_loop().call_soon_threadsafe(self._grant, waiter)
+
+    def _grant(self, waiter):
+        # Runs on the waiter's own loop
+        if waiter.future.cancelled():
+            self.release(waiter.session_id)
+        else:
+            waiter.future.set_result(True)
+
+    # --- Metrics ---
+    def metrics(self):
+        """Returns a snapshot of queue depth, in-flight turns and wait-time statistics."""
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            now = time.monotonic()
+            oldest_wait = now - self._waiters[0].enqueued_at if self._waiters else 0.0
+
+            def percentile(p):
+                if not waits:
+                    return 0.0
+                return waits[min(len(waits) - 1, int(p * len(waits)))]
+
+            return {
+                "queue_depth": len(self._waiters),
+                "max_queue_depth": self._max_queue_depth,
+                "queue_limit": self.max_queue,
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "active_sessions": len(self._active_sessions),
+                "admitted": self._admitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "wait_seconds": {
+                    "mean": round(self._total_wait / self._admitted, 4) if self._admitted else 0.0,
+                    "p50": round(percentile(0.50), 4),
+                    "p95": round(percentile(0.95), 4),
+                    "max": round(self._max_wait, 4),
+                    "oldest_waiting": round(oldest_wait, 4),
+                },
+            }
+
+turn_scheduler = TurnScheduler()
+
+def get_scheduler_metrics():
+    """Returns the shared turn scheduler's metrics."""
+    return turn_scheduler.metrics()
@@ -0,0 +1,234 @@
+# src/Boring/session_store.py
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from dotenv import load_dotenv
+from .debug_logger import log_debug_event
+from .messages import Message
+
+# ------------------------------
+# Session Persistence Configuration
+# ------------------------------
+load_dotenv()
+SESSION_PERSIST_ENABLED = os.getenv("VORTEX_SESSION_PERSIST", "true").lower() == "true"
+SESSION_DIR = os.getenv("VORTEX_SESSION_DIR", "sessions")
+SESSION_RESTORE_TAIL = max(2, int(os.getenv("VORTEX_SESSION_RESTORE_TAIL", "20")))  # Messages restored verbatim
+SESSION_COMPACT_BYTES = max(64 * 1024, int(os.getenv("VORTEX_SESSION_COMPACT_BYTES", str(1024 * 1024))))
+SESSION_FSYNC = os.getenv("VORTEX_SESSION_FSYNC", "true").lower() == "true"
+SUMMARY_MAX_CHARS = 2000
+SUMMARY_SNIPPET_CHARS = 160
+
+# ------------------------------
+# Log Format
+# ------------------------------
+# One JSON object per line, only ever appended to:
+#   {"type": "message", "message": {...}}   a history message (the system prompt is never stored)
+#   {"type": "summary", "text": "...", "messages": n}   written by compaction, replaces everything before it
+#   {"type": "reset"}   the conversation was cleared
+# A line torn by a crash fails to parse and is skipped, so a log is always readable.
+
+def summarize_messages(messages, previous_summary=None):
+    """
+    Extractive summary of older messages: the user's requests and the assistant's
+    replies, most recent last, trimmed to SUMMARY_MAX_CHARS. No LLM call is made.
+    """
+    lines = []
+    for msg in messages:
+        content = msg.content
+        if msg.role not in ("user", "assistant") or not isinstance(content, str) or not content.strip():
+            continue
+        snippet = " ".join(content.split())
+        if len(snippet) > SUMMARY_SNIPPET_CHARS:
+            snippet = snippet[:SUMMARY_SNIPPET_CHARS] + "..."
+        lines.append(f"- {'User' if msg.role == 'user' else 'Assistant'}: {snippet}")
+    if previous_summary:
+        lines.insert(0, previous_summary)
+    text = "\n".join(lines)
+    if len(text) > SUMMARY_MAX_CHARS:
+        text = "...\n" + text[-SUMMARY_MAX_CHARS:].split("\n", 1)[-1]
+    return text
+
+def summary_message(summary_text):
+    return Message("system", "Summary of the earlier conversation (restored after a restart):\n" + summary_text)
+
+def _tail_start(messages, tail):
+    """
+    Index where the restored tail begins: at most `tail` messages, starting at a user
+    message so no tool result is restored without the assistant call that asked for it.
+    """
+    start = max(0, len(messages) - tail)
+    while start < len(messages) and messages[start].role != "user":
+        start += 1
+    if start == len(messages):
+        # No user message in the window; go back to the last one before it
+        start = next((i for i in range(len(messages) - 1, -1, -1) if messages[i].role == "user"), len(messages))
+    return start
+
+class SessionStore:
+    """
+    Append-only per-session conversation logs under SESSION_DIR.
+
+    New messages are appended (and fsynced) at the end of each turn, so a crash or
+    restart loses at most the turn in progress. A session is restored lazily when it
+    is first used after a restart: a short summary of older messages plus the recent
+    tail. Logs larger than SESSION_COMPACT_BYTES are rewritten the same way, atomically.
+    """
+
+    def __init__(self, directory=SESSION_DIR, restore_tail=SESSION_RESTORE_TAIL, compact_bytes=SESSION_COMPACT_BYTES, fsync=SESSION_FSYNC):
+        self.directory = directory
+        self.restore_tail = restore_tail
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+        self._lock = threading.Lock()  # Guards file appends against compaction
+        self.stats = {"restored": 0, "appends": 0, "messages_written": 0, "compactions": 0, "corrupt_lines": 0}
+
+    def path_for(self, session_id):
+        safe = re.sub(r"[^A-Za-z0-9_-]", "_", session_id)[:64]
+        if safe != session_id:
+            safe += "-" + hashlib.sha1(session_id.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.directory, f"{safe}.jsonl")
+
+    # --- Reading ---
+    def _read(self, path):
+        """Returns (summary text or None, messages after it) from a log file."""
+        summary, messages = None, []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    self.stats["corrupt_lines"] += 1
+                    continue
+                kind = record.get("type")
+                if kind == "message" and isinstance(record.get("message"), dict):
+                    messages.append(Message.from_dict(record["message"]))
+                elif kind == "summary":
+                    summary, messages = record.get("text") or None, []
+                elif kind == "reset":
+                    summary, messages = None, []
+        return summary, messages
+
+    def load(self, session_id):
+        """
+        Returns the messages to restore for a session (an optional summary message plus
+        the recent tail), or None if nothing was persisted. Blocking.
+        """
+        path = self.path_for(session_id)
+        if not os.path.exists(path):
+            return None
+        started = time.monotonic()
+        with self._lock:
+            try:
+                summary, messages = self._read(path)
+            except OSError as e:
+                log_debug_event(f"Could not read session log {path}: {e}", is_error=True)
+                return None
+        if not summary and not messages:
+            return None
+
+        start = _tail_start(messages, self.restore_tail)
+        if start > 0:
+            summary = summarize_messages(messages[:start], summary)
+        restored = ([summary_message(summary)] if summary else []) + messages[start:]
+        self.stats["restored"] += 1
+        log_debug_event(f"Session {session_id} restored: {len(messages[start:])} recent message(s)"
+                        f"{', summary of ' + str(start) + ' older' if start else ''} in {(time.monotonic() - started) * 1000:.1f}ms.")
+
+        if os.path.getsize(path) > self.compact_bytes:
+            self.compact(session_id)
+        return restored
+
+    # --- Writing ---
+    def _append_records(self, session_id, records):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(session_id)
+        data = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records)
+        with self._lock:
+            if self._ends_mid_line(path):
+                data = "\n" + data # Never extend a line torn by a crash
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            return os.path.getsize(path)
+
+    @staticmethod
+    def _ends_mid_line(path):
+        try:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:
+            return False # Missing or empty
+
+    def append(self, session_id, messages):
+        """Appends messages to a session's log. Blocking (fsync); call off the event loop."""
+        if not messages:
+            return
+        size = self._append_records(session_id, [{"type": "message", "message": msg.to_dict()} for msg in messages])
+        self.stats["appends"] += 1
+        self.stats["messages_written"] += len(messages)
+        if size > self.compact_bytes:
+            self.compact(session_id)
+
+    def reset(self, session_id):
+        """Records that a session's conversation was cleared."""
+        if os.path.exists(self.path_for(session_id)):
+            self._append_records(session_id, [{"type": "reset"}])
+
+    def delete(self, session_id):
+        """Removes a session's log entirely."""
+        with self._lock:
+            try:
+                os.remove(self.path_for(session_id))
+            except FileNotFoundError:
+                pass
+
+    def compact(self, session_id):
+        """
+        Rewrites a log as one summary record plus the recent tail. The new file is
+        written and fsynced under a temporary name, then renamed over the old one.
+        """
+        path = self.path_for(session_id)
+        tmp_path = path + ".tmp"
+        with self._lock:
+            try:
+                summary, messages = self._read(path)
+                start = _tail_start(messages, self.restore_tail)
+                records = []
+                if start > 0 or summary:
+                    records.append({"type": "summary", "text": summarize_messages(messages[:start], summary), "messages": start})
+                records.extend({"type": "message", "message": msg.to_dict()} for msg in messages[start:])
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+                self._fsync_directory()
+            except OSError as e:
+                log_debug_event(f"Compacting session log {path} failed: {e}", is_error=True)
+                return
+        self.stats["compactions"] += 1
+        log_debug_event(f"Session log {session_id} compacted: {start} message(s) summarized, {len(messages) - start} kept.")
+
+    def _fsync_directory(self):
+        """Makes the rename durable (not supported on Windows, where it is skipped)."""
+        if os.name == "nt":
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats["enabled"] = SESSION_PERSIST_ENABLED
+        stats["directory"] = os.path.abspath(self.directory)
+        return stats
+
+session_store = SessionStore()
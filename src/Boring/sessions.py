@@ -0,0 +1,257 @@
+# src/Boring/sessions.py
+import os
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from .debug_logger import log_debug_event
+from .messages import as_message
+
+# ------------------------------
+# Session Configuration
+# ------------------------------
+LOCAL_SESSION_ID = "local"  # The CLI / voice loop on this machine
+MAX_SESSIONS = max(1, int(os.getenv("VORTEX_MAX_SESSIONS", "32")))
+SESSION_IDLE_TIMEOUT = float(os.getenv("VORTEX_SESSION_IDLE_TIMEOUT", "1800"))  # Seconds
+
+class ThreadSafeAsyncLock:
+    """
+    An asyncio-style lock that can be shared between event loops running in different
+    threads (the VORTEX AI loop and the per-request loops of the web server).
+    Waiters are woken in FIFO order on their own loop.
+    """
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._locked = False
+        self._waiters = deque()
+
+    def locked(self):
+        return self._locked
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._mutex:
+            if not self._locked and not self._waiters:
+                self._locked = True
+                return True
+            future = loop.create_future()
+            self._waiters.append(future)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._mutex:
+                still_waiting = future in self._waiters
+                if still_waiting:
+                    self._waiters.remove(future)
+            # Ownership was already handed to us; pass it on
+            if not still_waiting and future.done() and not future.cancelled():
+                self.release()
+            raise
+        return True
+
+    def release(self):
+        with self._mutex:
+            if not self._locked:
+                raise RuntimeError("Lock is not acquired.")
+            if not self._waiters:
+                self._locked = False
+                return
+            # Hand ownership straight to the next waiter; the lock stays held
+            future = self._waiters.popleft()
+        future.get_loop().call_soon_threadsafe(self._grant, future)
+
+    def _grant(self, future):
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(True)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+class ConversationHistory(list):
+    """
+    A conversation's message list. Messages are only ever appended during a turn, so
+    the state before a request can be recorded as a length (checkpoint) and restored
+    by truncating (rollback) instead of copying every message.
+    Entries are always Message objects; dicts written to it are converted.
+    """
+
+    def __init__(self, messages=()):
+        super().__init__(as_message(msg) for msg in messages)
+
+    def append(self, message):
+        super().append(as_message(message))
+
+    def extend(self, messages):
+        super().extend(as_message(msg) for msg in messages)
+
+    def insert(self, index, message):
+        super().insert(index, as_message(message))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [as_message(msg) for msg in value]
+        else:
+            value = as_message(value)
+        super().__setitem__(index, value)
+
+    def __iadd__(self, messages):
+        self.extend(messages)
+        return self
+
+    def checkpoint(self):
+        """Returns a marker for the current state of the history."""
+        return len(self)
+
+    def rollback(self, checkpoint):
+        """Discards every message appended since checkpoint."""
+        del self[checkpoint:]
+
+class Session:
+    """A single conversation: its history plus the lock that serialises its turns."""
+
+    def __init__(self, session_id, history):
+        self.session_id = session_id
+        self.history = history
+        self.persisted_len = len(history)  # Messages before this index are already in the session log
+        self.lock = ThreadSafeAsyncLock()
+        self.offered_tools = ()  # Tool names offered on earlier turns, kept stable for prompt caching
+        self.turns = 0  # Turns queued or running (see SessionManager.hold)
+        self.created_at = time.time()
+        self.last_active = self.created_at
+
+    def touch(self):
+        self.last_active = time.time()
+
+    def idle_for(self, now=None):
+        return (now or time.time()) - self.last_active
+
+    def busy(self):
+        return self.turns > 0 or self.lock.locked()
+
+class SessionManager:
+    """
+    Keeps one isolated conversation per session ID (socket sid, HTTP cookie or "local").
+    The number of live sessions is bounded; idle sessions are evicted first, least
+    recently used first. The local session and sessions with a turn queued or running
+    (see hold) are never evicted.
+    If restore is given, it is called with the session ID when a session is created and
+    may return a previously persisted history to use instead of a fresh one.
+    """
+
+    def __init__(self, history_factory, max_sessions=MAX_SESSIONS, idle_timeout=SESSION_IDLE_TIMEOUT, restore=None):
+        self._history_factory = history_factory
+        self._restore = restore
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions = OrderedDict()  # Least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, session_id=LOCAL_SESSION_ID):
+        """Returns the session for session_id, creating it if needed."""
+        with self._lock:
+            return self._get_locked(session_id or LOCAL_SESSION_ID)
+
+    @contextmanager
+    def hold(self, session_id=LOCAL_SESSION_ID):
+        """
+        Returns the session for session_id and keeps it from being evicted or dropped
+        until the block exits, including while its turn waits for a scheduler slot.
+        """
+        with self._lock:
+            session = self._get_locked(session_id or LOCAL_SESSION_ID)
+            session.turns += 1
+        try:
+            yield session
+        finally:
+            with self._lock:
+                session.turns -= 1
+            session.touch()
+
+    def _get_locked(self, session_id):
+        session = self._sessions.get(session_id)
+        if session is None:
+            self._evict_locked()
+            history = self._restore(session_id) if self._restore else None
+            session = Session(session_id, history if history is not None else self._history_factory())
+            self._sessions[session_id] = session
+            log_debug_event(f"Session created: {session_id} ({len(self._sessions)} live)")
+        else:
+            self._sessions.move_to_end(session_id)
+        session.touch()
+        return session
+
+    def drop(self, session_id):
+        """Removes a session (e.g. when its socket disconnects). Returns True if it existed."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.busy():
+                return False
+            del self._sessions[session_id]
+        log_debug_event(f"Session dropped: {session_id}")
+        return True
+
+    def reset(self, session_id=LOCAL_SESSION_ID):
+        """Replaces a session's history with a fresh one."""
+        return self.reset_session(self.get(session_id))
+
+    def reset_session(self, session):
+        """Replaces the history of a session already looked up (e.g. mid-turn) with a fresh one."""
+        session.history[:] = self._history_factory()
+        session.persisted_len = len(session.history)
+        return session
+
+    def evict_idle(self):
+        """Evicts every session idle for longer than idle_timeout. Returns the number evicted."""
+        with self._lock:
+            return self._evict_locked(make_room=False)
+
+    def _evict_locked(self, make_room=True):
+        now = time.time()
+        evicted = []
+        for session_id, session in list(self._sessions.items()):
+            if self._evictable(session) and session.idle_for(now) > self.idle_timeout:
+                evicted.append(session_id)
+        for session_id in evicted:
+            del self._sessions[session_id]
+
+        if make_room:
+            # Still full: evict the least recently used idle sessions
+            for session_id, session in list(self._sessions.items()):
+                if len(self._sessions) < self.max_sessions:
+                    break
+                if self._evictable(session):
+                    del self._sessions[session_id]
+                    evicted.append(session_id)
+            if len(self._sessions) >= self.max_sessions:
+                log_debug_event(f"Session limit ({self.max_sessions}) exceeded; all sessions are busy.", is_error=True)
+
+        if evicted:
+            log_debug_event(f"Evicted {len(evicted)} session(s): {', '.join(evicted)}")
+        return len(evicted)
+
+    @staticmethod
+    def _evictable(session):
+        return session.session_id != LOCAL_SESSION_ID and not session.busy()
+
+    def list_sessions(self):
+        """Returns a summary of live sessions, most recently used last."""
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    "session_id": session.session_id,
+                    "messages": len(session.history),
+                    "idle_seconds": round(session.idle_for(now), 1),
+                    "busy": session.busy(),
+                }
+                for session in self._sessions.values()
+            ]
@@ -0,0 +1,240 @@
+# src/Boring/tool_budget.py
+import os
+import re
+import json
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+from .debug_logger import log_debug_event
+from .capabilities import get_capability_option
+
+# ------------------------------
+# Tool Output Budget Configuration
+# ------------------------------
+load_dotenv()
+TOOL_RESULT_MAX_TOKENS = max(50, int(os.getenv("VORTEX_TOOL_RESULT_MAX_TOKENS", "1500")))  # Per result, unless the schema sets "max_result_tokens"
+TOOL_TURN_MAX_TOKENS = max(100, int(os.getenv("VORTEX_TOOL_TURN_MAX_TOKENS", "4000")))     # All tool results of one turn
+TOOL_RESULT_MIN_TOKENS = 150  # Every result gets at least this much, even when the turn budget is spent
+TOOL_OUTPUT_STORE_SIZE = max(1, int(os.getenv("VORTEX_TOOL_OUTPUT_STORE_SIZE", "64")))
+CHARS_PER_TOKEN = 4  # Same rough ratio estimate_tokens falls back to; exact counts are not needed here
+RETRIEVE_OVERHEAD_TOKENS = 80  # Paging fields and JSON escaping around a retrieved chunk
+RETRIEVE_TOOL_NAME = "retrieve_tool_output"
+
+def estimate_result_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+# ------------------------------
+# Structural Summaries
+# ------------------------------
+# (depth, list items / dict keys kept, string chars kept), tried from most to least detailed
+_SUMMARY_LEVELS = ((4, 10, 300), (3, 6, 160), (3, 4, 80), (2, 3, 60), (1, 3, 40), (1, 2, 20))
+
+def _shrink(value, depth, items, text):
+    if isinstance(value, str):
+        return value if len(value) <= text else value[:text] + f"... [{len(value)} chars]"
+    if isinstance(value, dict):
+        if depth <= 0:
+            return f"<object with {len(value)} keys>"
+        keys = list(value)
+        shrunk = {key: _shrink(value[key], depth - 1, items, text) for key in keys[:items * 3]}
+        if len(keys) > items * 3:
+            shrunk["..."] = f"{len(keys) - items * 3} more keys: {', '.join(map(str, keys[items * 3:items * 6]))}"
+        return shrunk
+    if isinstance(value, list):
+        if depth <= 0:
+            return f"<list of {len(value)} items>"
+        shrunk = [_shrink(item, depth - 1, items, text) for item in value[:items]]
+        if len(value) > items:
+            shrunk.append(f"... {len(value) - items} more items")
+        return shrunk
+    return value
+
+def summarize_structure(value, max_chars):
+    """Returns a reduced copy of a JSON value (fewer items, shorter strings, less depth) that fits max_chars, or None."""
+    for depth, items, text in _SUMMARY_LEVELS:
+        shrunk = _shrink(value, depth, items, text)
+        if len(json.dumps(shrunk, ensure_ascii=False)) <= max_chars:
+            return shrunk
+    return None
+
+_HTML_DROP = re.compile(r"<(script|style|noscript|svg)[^>]*>.*?</\1>", re.IGNORECASE | re.DOTALL)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_HTML_TITLE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+def summarize_text(text, max_chars):
+    """Head of a text result. HTML is reduced to its title and visible text first."""
+    title = None
+    if "<html" in text[:2000].lower() or "<!doctype html" in text[:2000].lower():
+        match = _HTML_TITLE.search(text)
+        title = " ".join(match.group(1).split()) if match else None
+        text = " ".join(_HTML_TAG.sub(" ", _HTML_DROP.sub(" ", text)).split())
+    preview = text[:max_chars]
+    return {"title": title, "text": preview} if title else preview
+
+# ------------------------------
+# Full Output Store
+# ------------------------------
+class ToolOutputStore:
+    """Keeps the full payload of shortened tool results so the model can page through them."""
+
+    def __init__(self, max_entries=TOOL_OUTPUT_STORE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # handle -> (tool name, full result JSON, stored at)
+
+    def put(self, function_name, result_content_json):
+        handle = f"out_{uuid.uuid4().hex[:10]}"
+        with self._lock:
+            self._entries[handle] = (function_name, result_content_json, time.time())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return handle
+
+    def get(self, handle):
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is not None:
+                self._entries.move_to_end(handle)
+            return entry
+
+    def __len__(self):
+        return len(self._entries)
+
+tool_output_store = ToolOutputStore()
+
+def _resolve_path(value, path):
+    """Follows a dot-separated path of keys and list indices, e.g. "paths./users.get"."""
+    for part in [p for p in path.split(".") if p]:
+        if isinstance(value, list):
+            value = value[int(part)]
+        elif isinstance(value, dict):
+            value = value[part]
+        else:
+            raise KeyError(part)
+    return value
+
+def retrieve_output(handle, offset=0, max_tokens=None, path=None):
+    """
+    Returns part of a stored tool result: the characters from offset, optionally
+    within the JSON value at path. next_offset is None once the end is reached.
+    """
+    entry = tool_output_store.get(handle)
+    if entry is None:
+        return {"error": f"No stored tool output for handle '{handle}'. It may have expired; call the original tool again."}
+    function_name, result_content_json, _ = entry
+    try:
+        value = json.loads(result_content_json)
+    except json.JSONDecodeError:
+        value = result_content_json
+    if path:
+        try:
+            value = _resolve_path(value, path)
+        except (KeyError, IndexError, ValueError):
+            return {"error": f"Path '{path}' not found in the output of {function_name}."}
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, indent=1)
+
+    max_chars = min(max_tokens or TOOL_RESULT_MAX_TOKENS, TOOL_RESULT_MAX_TOKENS) * CHARS_PER_TOKEN
+    offset = max(0, int(offset or 0))
+    chunk = text[offset:offset + max_chars]
+    next_offset = offset + len(chunk)
+    return {
+        "handle": handle,
+        "tool": function_name,
+        "path": path,
+        "offset": offset,
+        "next_offset": next_offset if next_offset < len(text) else None,
+        "total_chars": len(text),
+        "content": chunk,
+    }
+
+def original_result(content):
+    """The full result behind a shortened tool message, or content itself if it was not shortened (or has expired)."""
+    if not isinstance(content, str) or '"truncated": true' not in content[:40]:
+        return content
+    try:
+        handle = json.loads(content).get("handle")
+    except (json.JSONDecodeError, AttributeError):
+        return content
+    entry = tool_output_store.get(handle) if handle else None
+    return entry[1] if entry else content
+
+def is_shortened(content):
+    return isinstance(content, str) and '"truncated": true' in content[:40]
+
+# ------------------------------
+# Per-Turn Budget
+# ------------------------------
+class ToolBudget:
+    """
+    Token budget for the tool results of one turn. Each result is capped by its
+    schema's "max_result_tokens" (default TOOL_RESULT_MAX_TOKENS) and by what is
+    left of the turn's TOOL_TURN_MAX_TOKENS. Oversized results are replaced with a
+    structural summary or a text preview plus a handle for retrieve_tool_output.
+    """
+
+    def __init__(self, turn_max_tokens=TOOL_TURN_MAX_TOKENS):
+        self.turn_max_tokens = turn_max_tokens
+        self.used_tokens = 0
+        self.shortened = 0
+        self.tokens_saved = 0
+
+    def allowance(self, function_name):
+        tool_limit = get_capability_option(function_name, "max_result_tokens", TOOL_RESULT_MAX_TOKENS)
+        remaining = self.turn_max_tokens - self.used_tokens
+        return max(min(tool_limit, remaining), TOOL_RESULT_MIN_TOKENS)
+
+    def retrieve_chunk_tokens(self, requested=None):
+        """
+        Chunk size for a retrieve_tool_output call, so the page fits what is left of the
+        budget. Pages are sized up front rather than shortened afterwards: a shortened
+        page would still advance next_offset past text the model never saw.
+        """
+        available = max(self.allowance(RETRIEVE_TOOL_NAME) - RETRIEVE_OVERHEAD_TOKENS, TOOL_RESULT_MIN_TOKENS // 2)
+        return min(requested, available) if requested else available
+
+    def apply(self, function_name, result_content_json):
+        """Returns the content to put in the history for one tool result."""
+        tokens = estimate_result_tokens(result_content_json)
+        allowed = self.allowance(function_name)
+        if tokens <= allowed or function_name == RETRIEVE_TOOL_NAME:
+            # Retrieved pages were already sized by retrieve_chunk_tokens()
+            self.used_tokens += tokens
+            return result_content_json
+
+        handle = tool_output_store.put(function_name, result_content_json)
+        content = self._shorten(function_name, result_content_json, handle, tokens, allowed)
+        shortened_tokens = estimate_result_tokens(content)
+        self.used_tokens += shortened_tokens
+        self.shortened += 1
+        self.tokens_saved += tokens - shortened_tokens
+        log_debug_event(f"Tool output of {function_name} shortened from ~{tokens} to ~{shortened_tokens} tokens (handle {handle}).")
+        return content
+
+    def _shorten(self, function_name, result_content_json, handle, tokens, allowed):
+        envelope = {
+            "truncated": True,
+            "handle": handle,
+            "original_tokens": tokens,
+            "note": (f"Output shortened to fit the context budget. Call {RETRIEVE_TOOL_NAME} with this handle "
+                     "and an offset (or a dot-separated path into the JSON) to read more."),
+        }
+        # Room left for the summary once the envelope itself is accounted for
+        max_chars = max(allowed * CHARS_PER_TOKEN - len(json.dumps(envelope)) - 40, 200)
+        try:
+            value = json.loads(result_content_json)
+        except json.JSONDecodeError:
+            value = result_content_json
+
+        if isinstance(value, str):
+            envelope["preview"] = summarize_text(value, max_chars)
+            envelope["total_chars"] = len(value)
+        else:
+            summary = summarize_structure(value, max_chars)
+            if summary is not None:
+                envelope["summary"] = summary
+            else:
+                envelope["preview"] = result_content_json[:max_chars]
+                envelope["total_chars"] = len(result_content_json)
+        return json.dumps(envelope, ensure_ascii=False)
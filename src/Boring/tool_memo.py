@@ -0,0 +1,53 @@
+# src/Boring/tool_memo.py
+import json
+import asyncio
+from .debug_logger import log_debug_event
+from .capabilities import get_capability_option
+from .trace import current_trace
+
+def memo_key(function_name, function_args):
+    """function name plus canonical JSON arguments, so key order and spacing do not matter."""
+    return function_name + ":" + json.dumps(function_args, sort_keys=True, separators=(",", ":"), default=str)
+
+def _is_error_result(result_content_json):
+    try:
+        result = json.loads(result_content_json)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(result, dict) and "error" in result
+
+class ToolMemo:
+    """
+    Results of the tool calls made during one turn, for capabilities flagged
+    "read_only" in their schema. A repeated call with the same arguments returns the
+    earlier result instead of running again; identical calls issued in the same batch
+    share a single execution. Error results are not kept, so a retry really runs.
+    """
+
+    def __init__(self):
+        self._calls = {}  # memo_key -> Future of the result JSON
+        self.hits = 0
+
+    async def run(self, function_name, function_args, execute):
+        """Returns execute()'s result, or the memoised result of an identical earlier call."""
+        if not get_capability_option(function_name, "read_only", False):
+            return await execute()
+        key = memo_key(function_name, function_args)
+        call = self._calls.get(key)
+        if call is not None:
+            self.hits += 1
+            log_debug_event(f"Tool call {function_name} answered from this turn's earlier result.")
+            trace = current_trace()
+            if trace: trace.record("tool", name=function_name, args=function_args, memoized=True)
+            return await asyncio.shield(call)
+
+        call = asyncio.ensure_future(execute())
+        self._calls[key] = call
+        try:
+            result = await call
+        except BaseException:
+            self._calls.pop(key, None)
+            raise
+        if _is_error_result(result):
+            self._calls.pop(key, None)
+        return result
@@ -0,0 +1,233 @@
+# src/Boring/tool_router.py
+import os
+import re
+import json
+import hashlib
+import threading
+import numpy as np
+from dotenv import load_dotenv
+from .debug_logger import log_debug_event
+from .capabilities import get_capability_option
+from .providers import create_openai_client
+
+# ------------------------------
+# Tool Router Configuration
+# ------------------------------
+load_dotenv()
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+TOOL_ROUTER_ENABLED = os.getenv("VORTEX_TOOL_ROUTER", "true").lower() == "true"
+TOOL_ROUTER_TOP_K = max(1, int(os.getenv("VORTEX_TOOL_ROUTER_TOP_K", "8")))
+TOOL_ROUTER_USE_EMBEDDINGS = os.getenv("VORTEX_TOOL_ROUTER_EMBEDDINGS", "true").lower() == "true"
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Core tools that are always offered, in addition to schemas flagged "pinned"
+DEFAULT_PINNED_TOOLS = "retrieve_memory,store_memory,get_user_info,get_time,debugmode"
+PINNED_TOOLS = {name.strip() for name in os.getenv("VORTEX_PINNED_TOOLS", DEFAULT_PINNED_TOOLS).split(",") if name.strip()}
+# Tools offered to a session carry over between its turns (see sticky_tools) up to this many
+TOOL_ROUTER_STICKY_LIMIT = max(1, int(os.getenv("VORTEX_TOOL_ROUTER_STICKY_LIMIT", str(2 * TOOL_ROUTER_TOP_K + len(PINNED_TOOLS)))))
+
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "is", "are", "be",
+    "it", "this", "that", "me", "my", "i", "you", "your", "can", "could", "please", "what",
+    "whats", "how", "do", "does", "get", "from", "by", "at", "as", "if", "about", "using",
+}
+
+def _tokenize(text):
+    """Lowercase word tokens without stopwords, cut to a 5-letter stem ("define" ~ "definition")."""
+    return {word[:5] for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in _STOPWORDS}
+
+def schema_text(schema):
+    """Builds the text used to describe a tool schema for relevance scoring."""
+    function = schema.get("function", {})
+    parts = [function.get("name", "").replace("_", " "), function.get("description", "")]
+    for param_name, param in function.get("parameters", {}).get("properties", {}).items():
+        parts.append(param_name.replace("_", " "))
+        parts.append(param.get("description", ""))
+    return " ".join(part for part in parts if part)
+
+class ToolRouter:
+    """
+    Selects the tool schemas most relevant to a user message.
+
+    Schema descriptions are embedded once (and again only if a schema's text changes);
+    each turn then costs a single query embedding. When embeddings are unavailable the
+    router falls back to keyword overlap. The lock only guards the index and stats;
+    embedding requests are made outside it so sessions route concurrently.
+    """
+
+    def __init__(self, top_k=TOOL_ROUTER_TOP_K, pinned_tools=None, use_embeddings=TOOL_ROUTER_USE_EMBEDDINGS):
+        self.top_k = top_k
+        self.pinned_tools = set(PINNED_TOOLS if pinned_tools is None else pinned_tools)
+        self.use_embeddings = use_embeddings and bool(OPENAI_API_KEY)
+        self._client = None
+        self._lock = threading.Lock()
+        self._schema_vectors = {}   # name -> (text hash, unit vector)
+        self._schema_tokens = {}    # name -> (text hash, token set)
+        self._catalogue = (None, 0) # (hash of all schema texts, estimated tokens of the full catalogue)
+        self.stats = {"turns_routed": 0, "tools_offered": 0, "tools_sent": 0, "prompt_tokens_saved": 0}
+
+    # --- Embeddings ---
+    def _embed(self, texts):
+        """Embeds a batch of texts and returns unit vectors, or None on failure."""
+        if not self.use_embeddings or not texts:
+            return None
+        try:
+            if self._client is None:
+                self._client = create_openai_client()
+            response = self._client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=[text.replace("\n", " ") for text in texts]
+            )
+            vectors = np.array([item.embedding for item in response.data], dtype="float32")
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            return vectors / norms
+        except Exception as e:
+            log_debug_event(f"Tool router embedding failed, using keyword matching: {e}", is_error=True)
+            return None
+
+    def _refresh_schema_index(self, schemas):
+        """
+        Tokenizes any schema that is new or whose description changed, and re-estimates
+        the catalogue's size when it changed. Returns the (name, text hash, text) entries
+        that still need embedding. Called with the lock held.
+        """
+        pending = []
+        catalogue_hash = hashlib.sha1()
+        for schema in schemas:
+            name = schema["function"]["name"]
+            text = schema_text(schema)
+            text_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
+            catalogue_hash.update(text_hash.encode("ascii"))
+            if self._schema_tokens.get(name, (None,))[0] != text_hash:
+                self._schema_tokens[name] = (text_hash, _tokenize(text))
+            if self.use_embeddings and self._schema_vectors.get(name, (None,))[0] != text_hash:
+                pending.append((name, text_hash, text))
+
+        if self._catalogue[0] != catalogue_hash.hexdigest():
+            from .boring import estimate_tokens # Deferred to avoid a circular import
+            self._catalogue = (catalogue_hash.hexdigest(), estimate_tokens(json.dumps(schemas)))
+        return pending
+
+    def _embed_schemas(self, pending):
+        """Embeds schema descriptions (outside the lock) and stores the vectors."""
+        vectors = self._embed([text for _, _, text in pending])
+        if vectors is None:
+            return
+        with self._lock:
+            for (name, text_hash, _), vector in zip(pending, vectors):
+                self._schema_vectors[name] = (text_hash, vector)
+        log_debug_event(f"Tool router embedded {len(pending)} schema descriptions.")
+
+    # --- Scoring ---
+    def _score(self, schemas, query, schema_vectors, schema_tokens):
+        """
+        Returns ({tool name: relevance score}, whether embeddings were used) for the query,
+        from a snapshot of the index. Makes the query embedding request, so it runs unlocked.
+        """
+        query_vectors = None
+        if self.use_embeddings and all(schema["function"]["name"] in schema_vectors for schema in schemas):
+            query_vectors = self._embed([query])
+
+        if query_vectors is not None:
+            query_vector = query_vectors[0]
+            return {name: float(np.dot(vector, query_vector)) for name, (_, vector) in schema_vectors.items()}, True
+
+        query_tokens = _tokenize(query)
+        scores = {}
+        for schema in schemas:
+            name = schema["function"]["name"]
+            tokens = schema_tokens[name][1]
+            overlap = len(query_tokens & tokens)
+            scores[name] = overlap / (len(tokens) ** 0.5) if tokens else 0.0
+        return scores, False
+
+    def select(self, schemas, query, recent_tools=()):
+        """
+        Returns the schemas to send for this turn: pinned tools, tools used recently in
+        the conversation, and the top_k most relevant to the query. Registry order is kept
+        so the tool list stays stable between similar turns.
+        """
+        if not schemas or not query:
+            return schemas
+
+        with self._lock:
+            pending = self._refresh_schema_index(schemas)
+        if pending:
+            self._embed_schemas(pending)
+        with self._lock:
+            schema_vectors = dict(self._schema_vectors)
+            schema_tokens = dict(self._schema_tokens)
+        scores, used_embeddings = self._score(schemas, query, schema_vectors, schema_tokens)
+
+        names = [schema["function"]["name"] for schema in schemas]
+        always = {name for name in names if name in self.pinned_tools or name in recent_tools or get_capability_option(name, "pinned", False)}
+        # Keyword scores of zero mean "no evidence", so those tools are not used as filler
+        candidates = [name for name in names if name not in always and (used_embeddings or scores.get(name, 0.0) > 0)]
+        ranked = sorted(candidates, key=lambda name: scores.get(name, 0.0), reverse=True)
+        chosen = always | set(ranked[:self.top_k])
+        selected = [schema for schema in schemas if schema["function"]["name"] in chosen]
+
+        self._record(schemas, selected)
+        return selected
+
+    def _record(self, schemas, selected):
+        """Updates routing stats and logs the estimated prompt tokens saved."""
+        from .boring import estimate_tokens # Deferred to avoid a circular import
+        saved = self._catalogue[1] - estimate_tokens(json.dumps(selected))
+        with self._lock:
+            self.stats["turns_routed"] += 1
+            self.stats["tools_offered"] += len(schemas)
+            self.stats["tools_sent"] += len(selected)
+            self.stats["prompt_tokens_saved"] += max(saved, 0)
+        log_debug_event(
+            f"Tool router sent {len(selected)}/{len(schemas)} tools "
+            f"({', '.join(s['function']['name'] for s in selected)}); saved ~{saved} prompt tokens this request."
+        )
+
+_router = None
+_router_lock = threading.Lock()
+
+def get_tool_router():
+    """Returns the shared ToolRouter instance."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ToolRouter()
+        return _router
+
+def select_tools(schemas, query, recent_tools=()):
+    """
+    Returns the tool schemas to offer for a user message. Routing is skipped (all
+    schemas are returned) when disabled or when the catalogue is already small.
+    """
+    if not TOOL_ROUTER_ENABLED or not schemas or not query:
+        return schemas
+    router = get_tool_router()
+    if len(schemas) <= router.top_k + len(router.pinned_tools):
+        return schemas
+    return router.select(schemas, query, recent_tools)
+
+def sticky_tools(selected, previous_names, all_schemas, limit=TOOL_ROUTER_STICKY_LIMIT):
+    """
+    Returns the schemas to offer for a session's turn: the tools it was offered on
+    earlier turns, in the same order, followed by any newly selected ones. The tools
+    list is part of the prompt prefix the provider caches, so sending only each turn's
+    selection would change the prefix (and miss the cache) on most turns. When the
+    set would grow past limit it starts over from this turn's selection, costing one
+    cache miss in exchange for a bounded tools list.
+    """
+    by_name = {schema["function"]["name"]: schema for schema in all_schemas}
+    selected_names = [schema["function"]["name"] for schema in selected]
+    names = [name for name in previous_names if name in by_name]
+    names += [name for name in selected_names if name not in names]
+    if len(names) > limit:
+        log_debug_event(f"Sticky tool set reached {len(names)} tools (limit {limit}); starting over from this turn's selection.")
+        names = selected_names
+    return [by_name[name] for name in names if name in by_name]
+
+def get_tool_router_stats():
+    """Returns cumulative routing statistics."""
+    router = get_tool_router()
+    with router._lock:
+        return dict(router.stats)
@@ -0,0 +1,263 @@
+# src/Boring/trace.py
+import os
+import json
+import asyncio
+import time
+import uuid
+import queue
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from src.Capabilities.debug_mode import get_debug_mode
+from .cancellation import TurnCancelledError
+
+# ------------------------------
+# Trace Configuration
+# ------------------------------
+load_dotenv()
+TRACE_ENABLED = os.getenv("VORTEX_TRACE", "false").lower() == "true"  # Always on in debug mode
+TRACE_DIR = os.getenv("VORTEX_TRACE_DIR", "traces")
+TRACE_MAX_FILE_BYTES = int(os.getenv("VORTEX_TRACE_MAX_FILE_BYTES", str(5 * 1024 * 1024)))
+TRACE_MAX_FILES = max(1, int(os.getenv("VORTEX_TRACE_MAX_FILES", "10")))
+TRACE_QUEUE_SIZE = max(1, int(os.getenv("VORTEX_TRACE_QUEUE_SIZE", "1000")))
+TRACE_RECENT_TURNS = max(1, int(os.getenv("VORTEX_TRACE_RECENT_TURNS", "50")))
+TRACE_MAX_FIELD_CHARS = int(os.getenv("VORTEX_TRACE_MAX_FIELD_CHARS", "4000"))  # Tool results, replies
+
+_current_trace = contextvars.ContextVar("vortex_turn_trace", default=None)
+
+def _json_default(value):
+    """Encodes history messages and tool calls by their dict form, anything else as a string."""
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if callable(to_dict) else str(value)
+
+def tracing_enabled():
+    return TRACE_ENABLED or get_debug_mode()
+
+def _clip(value):
+    if isinstance(value, str) and len(value) > TRACE_MAX_FIELD_CHARS:
+        return value[:TRACE_MAX_FIELD_CHARS] + f"... [{len(value) - TRACE_MAX_FIELD_CHARS} more chars]"
+    return value
+
+class _NullTrace:
+    """Stand-in used when tracing is off. Falsy, so callers can skip building record payloads."""
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def record(self, kind, **fields):
+        pass
+
+    def record_prompt(self, messages):
+        pass
+
+NULL_TRACE = _NullTrace()
+
+class TurnTrace:
+    """
+    The records of one turn. Records are plain dicts holding references to existing
+    objects; JSON encoding happens on the writer thread, not on the event loop.
+    """
+    __slots__ = ("turn_id", "session_id", "started_at", "_started", "records", "_sent_messages", "status", "duration")
+
+    def __init__(self, session_id, user_input):
+        self.turn_id = uuid.uuid4().hex[:12]
+        self.session_id = session_id
+        self.started_at = time.time()
+        self._started = time.monotonic()
+        self.records = []
+        self._sent_messages = 0
+        self.status = "running"
+        self.duration = None
+        self.record("input", text=user_input)
+
+    def __bool__(self):
+        return True
+
+    def record(self, kind, **fields):
+        for key, value in fields.items():
+            if isinstance(value, str):
+                fields[key] = _clip(value)
+        fields["kind"] = kind
+        fields["t_ms"] = round((time.monotonic() - self._started) * 1000, 1)
+        self.records.append(fields)
+
+    def record_prompt(self, messages):
+        """
+        Records the messages of a provider request. Only messages not already sent earlier
+        in the turn are stored, so the tool loop does not repeat the whole history.
+        """
+        new_messages = list(messages[self._sent_messages:]) if len(messages) >= self._sent_messages else list(messages)
+        self.record("prompt", message_count=len(messages), new_messages=new_messages)
+        self._sent_messages = len(messages)
+
+    def summary(self):
+        kinds = [r["kind"] for r in self.records]
+        reply = next((r.get("text") for r in reversed(self.records) if r["kind"] == "reply"), None)
+        user_input = self.records[0].get("text") if self.records else None
+        return {
+            "turn_id": self.turn_id,
+            "session_id": self.session_id,
+            "started_at": round(self.started_at, 3),
+            "duration_ms": self.duration,
+            "status": self.status,
+            "input": (user_input or "")[:120],
+            "reply": (reply or "")[:120],
+            "requests": kinds.count("provider_call"),
+            "tool_calls": sum(1 for r in self.records if r["kind"] == "tool" and not r.get("memoized")),
+            "memo_hits": sum(1 for r in self.records if r.get("memoized")),
+        }
+
+    def as_dict(self):
+        data = self.summary()
+        data["input"] = self.records[0].get("text") if self.records else None
+        data["records"] = self.records
+        return data
+
+class TraceRecorder:
+    """
+    Collects turn traces and persists them as JSON lines from a background thread.
+    Files rotate at TRACE_MAX_FILE_BYTES and only the newest TRACE_MAX_FILES are kept.
+    The most recent TRACE_RECENT_TURNS turns are also kept in memory for the web UI.
+    """
+
+    def __init__(self, directory=TRACE_DIR, max_file_bytes=TRACE_MAX_FILE_BYTES, max_files=TRACE_MAX_FILES):
+        self.directory = directory
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self._queue = queue.Queue(maxsize=TRACE_QUEUE_SIZE)
+        self._recent = deque(maxlen=TRACE_RECENT_TURNS)
+        self._lock = threading.Lock()
+        self._writer = None
+        self._file = None
+        self._file_path = None
+        self.stats = {"turns": 0, "written": 0, "dropped": 0, "write_errors": 0}
+
+    # --- Recording ---
+    @contextmanager
+    def turn(self, session_id, user_input):
+        """Yields a TurnTrace for the turn, or NULL_TRACE when tracing is off."""
+        if not tracing_enabled():
+            yield NULL_TRACE
+            return
+        trace = TurnTrace(session_id, user_input)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+            trace.status = "ok"
+        except BaseException as e:
+            trace.status = "cancelled" if isinstance(e, (asyncio.CancelledError, TurnCancelledError)) else "error"
+            trace.record("exception", error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_trace.reset(token)
+            trace.duration = round((time.monotonic() - trace._started) * 1000, 1)
+            self._submit(trace)
+
+    def _submit(self, trace):
+        with self._lock:
+            self._recent.append(trace)
+            self.stats["turns"] += 1
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            with self._lock:
+                self.stats["dropped"] += 1
+
+    # --- Background Writer ---
+    def _ensure_writer(self):
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="vortex-trace-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            trace = self._queue.get()
+            try:
+                line = json.dumps(trace.as_dict(), default=_json_default, ensure_ascii=False) + "\n"
+                self._write_line(line)
+                with self._lock:
+                    self.stats["written"] += 1
+            except Exception as e:
+                with self._lock:
+                    self.stats["write_errors"] += 1
+                print(f"[TRACE] Failed to write trace {trace.turn_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write_line(self, line):
+        if self._file is None or self._file.tell() >= self.max_file_bytes:
+            self._rotate()
+        self._file.write(line)
+        self._file.flush()
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}.jsonl"
+        self._file_path = os.path.join(self.directory, name)
+        self._file = open(self._file_path, "a", encoding="utf-8")
+        for old_path in self._trace_files()[:-self.max_files]:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+    def _trace_files(self):
+        """Trace files, oldest first."""
+        try:
+            names = sorted(name for name in os.listdir(self.directory) if name.startswith("trace-") and name.endswith(".jsonl"))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, name) for name in names]
+
+    def flush(self, timeout=5.0):
+        """Waits until queued traces are written (used on shutdown)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    # --- Queries ---
+    def list_turns(self, limit=50, session_id=None):
+        """Summaries of recent turns, newest first."""
+        with self._lock:
+            traces = list(self._recent)
+        summaries = [t.summary() for t in reversed(traces) if session_id is None or t.session_id == session_id]
+        return summaries[:limit]
+
+    def get_turn(self, turn_id):
+        """Full records of one turn, from memory or (for older turns) from the trace files."""
+        with self._lock:
+            for trace in self._recent:
+                if trace.turn_id == turn_id:
+                    return json.loads(json.dumps(trace.as_dict(), default=_json_default))
+        for path in reversed(self._trace_files()):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        if f'"turn_id": "{turn_id}"' in line:
+                            return json.loads(line)
+            except (OSError, json.JSONDecodeError):
+                continue
+        return None
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["enabled"] = tracing_enabled()
+        stats["queued"] = self._queue.qsize()
+        stats["directory"] = os.path.abspath(self.directory)
+        return stats
+
+trace_recorder = TraceRecorder()
+
+def current_trace():
+    """The trace of the turn running in this task, or NULL_TRACE."""
+    return _current_trace.get() or NULL_TRACE
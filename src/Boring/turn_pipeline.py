@@ -0,0 +1,159 @@
+# src/Boring/turn_pipeline.py
+import os
+import re
+import time
+import asyncio
+import threading
+from dotenv import load_dotenv
+from .debug_logger import log_debug_event
+
+# ------------------------------
+# Turn Pipeline Configuration
+# ------------------------------
+load_dotenv()
+PIPELINE_ENABLED = os.getenv("VORTEX_PIPELINE", "true").lower() == "true"
+PIPELINE_MIN_WORDS = max(1, int(os.getenv("VORTEX_PIPELINE_MIN_WORDS", "2")))  # Shorter partials are not worth preparing
+
+def normalize_transcript(text):
+    """Lowercase words only, so "What's the time?" and "whats the time" compare equal."""
+    return " ".join(re.findall(r"[a-z0-9]+", (text or "").lower().replace("'", "")))
+
+class TurnContext:
+    """
+    The per-turn inputs prepared before the provider call: retrieved memories and the
+    selected tool schemas. recent_tools records the routing input so a context prepared
+    earlier is only reused while the conversation is unchanged.
+    """
+    __slots__ = ("text", "normalized", "memories", "schemas", "recent_tools", "prepare_time")
+
+    def __init__(self, text, memories, schemas, recent_tools, prepare_time=0.0):
+        self.text = text
+        self.normalized = normalize_transcript(text)
+        self.memories = memories
+        self.schemas = schemas
+        self.recent_tools = frozenset(recent_tools)
+        self.prepare_time = prepare_time
+
+    def usable_for(self, text, recent_tools):
+        return self.normalized == normalize_transcript(text) and self.recent_tools == frozenset(recent_tools)
+
+class _PipelineStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"speculations": 0, "reused": 0, "discarded": 0, "time_saved": 0.0}
+
+    def add(self, key, amount=1):
+        with self._lock:
+            self.counts[key] += amount
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.counts)
+        turns = stats["reused"] + stats["discarded"]
+        stats["reuse_rate"] = round(stats["reused"] / turns, 3) if turns else 0.0
+        stats["time_saved"] = round(stats["time_saved"], 3)
+        stats["enabled"] = PIPELINE_ENABLED
+        return stats
+
+pipeline_stats = _PipelineStats()
+
+class SpeculativeTurn:
+    """
+    Prepares a turn from partial transcripts while transcription is still running.
+
+    update() may be called from any thread (e.g. the transcriber's worker) with the
+    transcript so far. At most one preparation runs at a time; while it runs only the
+    newest partial is kept, so a burst of partials costs at most two preparations.
+    take() returns the prepared context if it was prepared for the final transcript,
+    otherwise None and the caller prepares the turn normally.
+    """
+
+    def __init__(self, prepare):
+        self._prepare = prepare  # async (text) -> TurnContext
+        self._loop = asyncio.get_running_loop()
+        self._task = None
+        self._task_text = None
+        self._pending = None
+        self._done = {}  # normalized text -> TurnContext
+        self._closed = False
+
+    def update(self, partial_text):
+        """Records a partial transcript. Thread-safe."""
+        if not PIPELINE_ENABLED or self._closed:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._on_partial, partial_text)
+        except RuntimeError:
+            pass # Loop already closed
+
+    def _on_partial(self, text):
+        normalized = normalize_transcript(text)
+        if self._closed or len(normalized.split()) < PIPELINE_MIN_WORDS:
+            return
+        if normalized == self._task_text or normalized in self._done:
+            return
+        if self._task is not None and not self._task.done():
+            self._pending = text
+            return
+        self._start(text)
+
+    def _start(self, text):
+        self._task_text = normalize_transcript(text)
+        self._pending = None
+        pipeline_stats.add("speculations")
+        self._task = self._loop.create_task(self._run(text))
+
+    async def _run(self, text):
+        started = time.monotonic()
+        try:
+            context = await self._prepare(text)
+            context.prepare_time = time.monotonic() - started
+            self._done[context.normalized] = context
+            return context
+        except Exception as e:
+            log_debug_event(f"Speculative turn preparation failed for '{text[:40]}': {e}", is_error=True)
+            return None
+        finally:
+            if self._pending is not None and not self._closed:
+                self._start(self._pending)
+
+    def close(self):
+        """Stops speculating and drops anything in flight. Idempotent; take() calls it."""
+        if self._closed:
+            return
+        self._closed = True
+        self._pending = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        if self._task is not None or self._done:
+            pipeline_stats.add("discarded")
+
+    async def take(self, final_text):
+        """Returns the context prepared for final_text, waiting for it if it is in flight, or None."""
+        if self._closed:
+            return None
+        self._closed = True
+        self._pending = None
+        normalized = normalize_transcript(final_text)
+        started = time.monotonic()
+        context = self._done.get(normalized)
+        if context is None and self._task is not None and self._task_text == normalized:
+            try:
+                context = await self._task
+            except asyncio.CancelledError:
+                context = None
+        if context is None:
+            if self._task is not None and not self._task.done():
+                self._task.cancel()
+            if self._task is not None or self._done:
+                pipeline_stats.add("discarded")
+            return None
+        saved = max(context.prepare_time - (time.monotonic() - started), 0.0)
+        pipeline_stats.add("reused")
+        pipeline_stats.add("time_saved", saved)
+        log_debug_event(f"Reusing turn context prepared from a partial transcript (~{saved * 1000:.0f}ms saved).")
+        return context
+
+def get_pipeline_stats():
+    """Returns how often speculative turn preparation was reused."""
+    return pipeline_stats.snapshot()
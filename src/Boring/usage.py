@@ -0,0 +1,214 @@
+# src/Boring/usage.py
+import os
+import time
+import uuid
+import threading
+import contextvars
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+
+# ------------------------------
+# Usage Accounting Configuration
+# ------------------------------
+USAGE_MAX_EVENTS = max(100, int(os.getenv("VORTEX_USAGE_MAX_EVENTS", "5000")))
+USAGE_ROLLUP_SECONDS = max(10, int(os.getenv("VORTEX_USAGE_ROLLUP_SECONDS", "60")))
+USAGE_MAX_ROLLUPS = max(1, int(os.getenv("VORTEX_USAGE_MAX_ROLLUPS", "1440")))  # 24h of 1-minute buckets
+
+# The turn the current task belongs to; asyncio tasks (tool calls, hedged requests) inherit it
+_current_turn = contextvars.ContextVar("vortex_usage_turn", default=None)
+
+def _percentile(values, p):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 4)
+
+class _Rollup:
+    """Aggregates for one time bucket."""
+    __slots__ = ("start", "llm_calls", "llm_errors", "prompt_tokens", "completion_tokens", "cached_tokens",
+                 "llm_time", "tool_calls", "tool_errors", "tool_time", "turns", "turn_time")
+
+    def __init__(self, start):
+        self.start = start
+        self.llm_calls = self.llm_errors = self.prompt_tokens = self.completion_tokens = self.cached_tokens = 0
+        self.tool_calls = self.tool_errors = self.turns = 0
+        self.llm_time = self.tool_time = self.turn_time = 0.0
+
+    def as_dict(self):
+        return {slot: round(getattr(self, slot), 4) if isinstance(getattr(self, slot), float) else getattr(self, slot) for slot in self.__slots__}
+
+class UsageStore:
+    """
+    Bounded in-memory record of every provider request, tool execution and turn.
+
+    Raw events are kept in a ring buffer (USAGE_MAX_EVENTS). Each event is also added
+    to a per-interval rollup when it is recorded, so long-range totals survive after the
+    raw events have been dropped.
+    """
+
+    def __init__(self, max_events=USAGE_MAX_EVENTS, rollup_seconds=USAGE_ROLLUP_SECONDS, max_rollups=USAGE_MAX_ROLLUPS):
+        self.rollup_seconds = rollup_seconds
+        self.max_rollups = max_rollups
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=max_events)
+        self._rollups = OrderedDict()  # bucket start -> _Rollup, oldest first
+
+    # --- Turn context ---
+    @contextmanager
+    def turn(self, session_id):
+        """Groups the events recorded inside the block into one turn and records the turn total."""
+        turn = {"turn_id": uuid.uuid4().hex[:12], "session_id": session_id, "llm_calls": 0, "tool_calls": 0,
+                "prompt_tokens": 0, "completion_tokens": 0, "llm_time": 0.0, "tool_time": 0.0, "cache_hit": False}
+        token = _current_turn.set(turn)
+        started = time.monotonic()
+        try:
+            yield turn
+        finally:
+            _current_turn.reset(token)
+            turn["latency"] = round(time.monotonic() - started, 4)
+            self._record("turn", turn)
+
+    # --- Recording ---
+    def record_llm_call(self, provider, model, latency, usage=None, error=None):
+        """Records one provider request. Requests are not streamed, so time to first token equals latency."""
+        usage = usage or {}
+        event = {
+            "provider": provider,
+            "model": model,
+            "latency": round(latency, 4),
+            "ttft": round(latency, 4),
+            "prompt_tokens": usage.get("prompt_tokens") or 0,
+            "completion_tokens": usage.get("completion_tokens") or 0,
+            "cached_tokens": usage.get("cached_tokens") or 0,
+            "ok": error is None,
+        }
+        if error is not None:
+            event["error"] = f"{type(error).__name__}: {error}"[:200]
+        turn = _current_turn.get()
+        if turn is not None:
+            turn["llm_calls"] += 1
+            turn["prompt_tokens"] += event["prompt_tokens"]
+            turn["completion_tokens"] += event["completion_tokens"]
+            turn["llm_time"] = round(turn["llm_time"] + latency, 4)
+        self._record("llm", event)
+
+    def record_tool_call(self, name, latency, ok=True, timed_out=False):
+        """Records one capability execution."""
+        turn = _current_turn.get()
+        if turn is not None:
+            turn["tool_calls"] += 1
+            turn["tool_time"] = round(turn["tool_time"] + latency, 4)
+        self._record("tool", {"name": name, "latency": round(latency, 4), "ok": ok, "timeout": timed_out})
+
+    def _record(self, kind, event):
+        now = time.time()
+        turn = _current_turn.get()
+        event = dict(event, kind=kind, ts=round(now, 3))
+        if turn is not None and kind != "turn":
+            event.setdefault("turn_id", turn["turn_id"])
+            event.setdefault("session_id", turn["session_id"])
+        with self._lock:
+            self._events.append(event)
+            self._add_to_rollup(now, kind, event)
+
+    def _add_to_rollup(self, now, kind, event):
+        start = int(now // self.rollup_seconds) * self.rollup_seconds
+        rollup = self._rollups.get(start)
+        if rollup is None:
+            rollup = self._rollups[start] = _Rollup(start)
+            while len(self._rollups) > self.max_rollups:
+                self._rollups.popitem(last=False)
+        if kind == "llm":
+            rollup.llm_calls += 1
+            rollup.llm_errors += 0 if event["ok"] else 1
+            rollup.prompt_tokens += event["prompt_tokens"]
+            rollup.completion_tokens += event["completion_tokens"]
+            rollup.cached_tokens += event["cached_tokens"]
+            rollup.llm_time += event["latency"]
+        elif kind == "tool":
+            rollup.tool_calls += 1
+            rollup.tool_errors += 0 if event["ok"] else 1
+            rollup.tool_time += event["latency"]
+        elif kind == "turn":
+            rollup.turns += 1
+            rollup.turn_time += event["latency"]
+
+    # --- Queries ---
+    def events(self, kind=None, limit=100, session_id=None):
+        """Most recent raw events, newest last."""
+        with self._lock:
+            events = [e for e in self._events if (kind is None or e["kind"] == kind) and (session_id is None or e.get("session_id") == session_id)]
+        return events[-limit:] if limit else events
+
+    def rollups(self, minutes=60):
+        """Rollup buckets covering the last `minutes` minutes, oldest first."""
+        cutoff = time.time() - minutes * 60
+        with self._lock:
+            return [rollup.as_dict() for start, rollup in self._rollups.items() if start + self.rollup_seconds > cutoff]
+
+    def summary(self, window_seconds=3600):
+        """Totals and latency percentiles over the raw events of the last window_seconds."""
+        cutoff = time.time() - window_seconds
+        with self._lock:
+            events = [e for e in self._events if e["ts"] >= cutoff]
+
+        llm = [e for e in events if e["kind"] == "llm"]
+        tools = [e for e in events if e["kind"] == "tool"]
+        turns = [e for e in events if e["kind"] == "turn"]
+
+        by_model = {}
+        for e in llm:
+            entry = by_model.setdefault(f"{e['provider']}:{e['model']}", {"calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "latencies": []})
+            entry["calls"] += 1
+            entry["errors"] += 0 if e["ok"] else 1
+            entry["prompt_tokens"] += e["prompt_tokens"]
+            entry["completion_tokens"] += e["completion_tokens"]
+            entry["cached_tokens"] += e["cached_tokens"]
+            entry["latencies"].append(e["latency"])
+        for entry in by_model.values():
+            latencies = entry.pop("latencies")
+            entry["latency_p50"] = _percentile(latencies, 0.50)
+            entry["latency_p95"] = _percentile(latencies, 0.95)
+
+        by_tool = {}
+        for e in tools:
+            entry = by_tool.setdefault(e["name"], {"calls": 0, "errors": 0, "timeouts": 0, "latencies": []})
+            entry["calls"] += 1
+            entry["errors"] += 0 if e["ok"] else 1
+            entry["timeouts"] += 1 if e["timeout"] else 0
+            entry["latencies"].append(e["latency"])
+        for entry in by_tool.values():
+            latencies = entry.pop("latencies")
+            entry["latency_p50"] = _percentile(latencies, 0.50)
+            entry["latency_p95"] = _percentile(latencies, 0.95)
+
+        turn_latencies = [e["latency"] for e in turns]
+        return {
+            "window_seconds": window_seconds,
+            "llm": {
+                "calls": len(llm),
+                "errors": sum(1 for e in llm if not e["ok"]),
+                "prompt_tokens": sum(e["prompt_tokens"] for e in llm),
+                "completion_tokens": sum(e["completion_tokens"] for e in llm),
+                "cached_tokens": sum(e["cached_tokens"] for e in llm),
+                "ttft_p50": _percentile([e["ttft"] for e in llm], 0.50),
+                "ttft_p95": _percentile([e["ttft"] for e in llm], 0.95),
+                "by_model": by_model,
+            },
+            "tools": {"calls": len(tools), "time": round(sum(e["latency"] for e in tools), 4), "by_tool": by_tool},
+            "turns": {
+                "count": len(turns),
+                "cache_hits": sum(1 for e in turns if e.get("cache_hit")),
+                "intent_hits": sum(1 for e in turns if e.get("intent")),
+                "latency_p50": _percentile(turn_latencies, 0.50),
+                "latency_p95": _percentile(turn_latencies, 0.95),
+                "llm_time_mean": round(sum(e["llm_time"] for e in turns) / len(turns), 4) if turns else None,
+                "tool_time_mean": round(sum(e["tool_time"] for e in turns) / len(turns), 4) if turns else None,
+            },
+        }
+
+usage_store = UsageStore()
+
+def get_usage_summary(window_seconds=3600):
+    """Returns token, latency and tool-time totals for the last window_seconds."""
+    return usage_store.summary(window_seconds)
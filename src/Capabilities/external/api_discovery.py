@@ -158,6 +158,7 @@ try:
     capabilities.register_function_in_registry("search_public_apis", search_public_apis)
     capabilities.register_function_schema({
         "type": "function",
+        "read_only": True,
         "function": {
             "name": "search_public_apis",
             "description": "Searches for public APIs using the apis.guru directory. Allows filtering by keyword and category. Useful for finding new APIs to integrate or explore.",
@@ -185,6 +186,8 @@ try:
     capabilities.register_function_in_registry("get_api_specification", get_api_specification)
     capabilities.register_function_schema({
         "type": "function",
+        "read_only": True,
+        "max_result_tokens": 1000,
         "function": {
             "name": "get_api_specification",
             "description": "Retrieves the detailed OpenAPI (Swagger) specification for a specific public API from the apis.guru directory. This specification contains the API's documentation, including endpoints, parameters, and response structures.",
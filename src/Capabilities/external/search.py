@@ -60,7 +60,7 @@ def google_search(query: str) -> dict:
 			"num": 5  # Number of results to return
 		}
 		
-		response = requests.get(url, params=params)
+		response = requests.get(url, params=params, timeout=15)
 		data = response.json()
 		
 		if "items" not in data:
@@ -146,7 +146,7 @@ def modrinth_search(query: str) -> dict:
 			"facets": [["categories:forge"], ["categories:fabric"]]
 		}
 		
-		response = requests.get(url, params=params)
+		response = requests.get(url, params=params, timeout=15)
 		data = response.json()
 		
 		if "hits" not in data or not data["hits"]:
@@ -179,6 +179,7 @@ capabilities.register_function_in_registry("modrinth_search", modrinth_search)
 # Register schemas
 capabilities.register_function_schema({
 	"type": "function",
+	"read_only": True,
 	"function": {
 		"name": "search_query",
 		"description": "Search for information using Google Search or Wikipedia.",
@@ -202,6 +203,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"read_only": True,
 	"function": {
 		"name": "youtube_search",
 		"description": "Search YouTube for videos related to a query.",
@@ -220,6 +222,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"read_only": True,
 	"function": {
 		"name": "modrinth_search",
 		"description": "Search Modrinth for Minecraft mods.",
@@ -7,7 +7,7 @@ import requests
 def urban_dictionary_definition(word: str) -> str:
 	"""Get the definition of a word from Urban Dictionary API."""
 	url = f'https://api.urbandictionary.com/v0/define?term={word}'
-	response = requests.get(url)
+	response = requests.get(url, timeout=15)
 	if response.status_code == 200:
 		json_data = response.json()
 		if len(json_data['list']) > 0:
@@ -22,7 +22,7 @@ urban_dictionary_definition.schema = {
 	'word': str
 }
 
-capabilities.register_function_schema({"type": "function", "function": {
+capabilities.register_function_schema({"type": "function", "read_only": True, "function": {
 	"name": "urban_dictionary_definition",
 	"description": "Get the definition of a word from Urban Dictionary API.",
 	"parameters": {
@@ -95,7 +95,7 @@ def get_weather_forecast(latitude: float, longitude: float, forecast_type: str,
 		return {"error": f"Invalid forecast type: {forecast_type}. Use 'current', 'hourly', or 'daily'."}
 	
 	try:
-		response = requests.get(url, params=params)
+		response = requests.get(url, params=params, timeout=15)
 		response.raise_for_status()
 		data = response.json()
 		
@@ -272,6 +272,8 @@ capabilities.register_function_in_registry("get_weather_forecast", get_weather_f
 
 capabilities.register_function_schema({
 	"type": "function",
+	"read_only": True,
+	"cache_ttl": 900,
 	"function": {
 		"name": "get_weather_forecast",
 		"description": "Gets weather forecast for a specific location, to get the users location, use get_user_info first",
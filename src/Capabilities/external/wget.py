@@ -38,6 +38,9 @@ def wget(url: str) -> str:
 capabilities.register_function_in_registry('wget_execution_revised', wget)
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
+	"serial": True,
+	"max_result_tokens": 800,
 	"function": {
 		"name": "wget",
 		"description": "Downloads content from the specified URL using wget and saves it in 'temp/wget/'.",
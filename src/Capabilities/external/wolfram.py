@@ -32,7 +32,7 @@ def query_wolfram_alpha(query: str) -> dict:
 	}
 
 	try:
-		response = requests.get(url, params=params)
+		response = requests.get(url, params=params, timeout=15)
 		response.raise_for_status()
 		root = ET.fromstring(response.content)
 
@@ -57,6 +57,7 @@ capabilities.register_function_in_registry("query_wolfram_alpha", query_wolfram_
 
 capabilities.register_function_schema({
 	"type": "function",
+	"read_only": True,
 	"function": {
 		"name": "query_wolfram_alpha",
 		"description": "Queries Wolfram Alpha for computational knowledge.",
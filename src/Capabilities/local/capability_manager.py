@@ -15,6 +15,8 @@ capabilities.register_function_in_registry("add_new_capability", add_new_capabil
 
 # Register the schema
 capabilities.register_function_schema({
+	"pinned": True,
+	"side_effects": True,
 	"function": {
 		"name": "add_new_capability",
 		"description": "Dynamically adds a new capability (function) to VORTEX.",
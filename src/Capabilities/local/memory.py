@@ -282,6 +282,7 @@ capabilities.register_function_in_registry("summarize_category", summarize_categ
 
 capabilities.register_function_schema({
 	"type": "function",
+	"read_only": True,
 	"function": {
 		"name": "retrieve_memory",
 		"description": "Finds relevant memories based on the query.",
@@ -297,6 +298,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"read_only": True,
 	"function": {
 		"name": "retrieve_project_memory",
 		"description": "Finds relevant memories related to ongoing projects.",
@@ -312,6 +314,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
 	"function": {
 		"name": "store_memory",
 		"description": "Stores a new memory with its embedding.",
@@ -327,6 +330,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
 	"function": {
 		"name": "delete_memory",
 		"description": "Finds and removes memories matching the query.",
@@ -342,6 +346,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"read_only": True,
 	"function": {
 		"name": "list_memory_categories",
 		"description": "Lists all unique memory categories and counts.",
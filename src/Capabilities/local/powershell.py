@@ -9,6 +9,7 @@ import time
 from dotenv import load_dotenv
 from src.Capabilities.debug_mode import get_debug_mode
 from src.Boring.boring import log_debug_event
+from src.Boring.capability_executor import capability_cancelled
 import requests
 
 # Constants
@@ -62,7 +63,16 @@ def powershell(permission: bool = False, command: str = "", returnoutput: bool =
 			universal_newlines=True
 		)
 		
-		stdout, stderr = process.communicate()
+		# Wait in short slices so a timed-out call can stop the process
+		while True:
+			try:
+				stdout, stderr = process.communicate(timeout=0.5)
+				break
+			except subprocess.TimeoutExpired:
+				if capability_cancelled():
+					process.kill()
+					process.communicate()
+					return "❌ Command cancelled: it did not finish in time."
 		
 		if stderr:
 			return f"❌ Error: {stderr.strip()}"
@@ -78,14 +88,14 @@ def powershell(permission: bool = False, command: str = "", returnoutput: bool =
 def get_user_info():
     """Fetches user location details based on their public IP address using ip-api.com."""
     try:
-        ip_response = requests.get("https://api64.ipify.org?format=json")
+        ip_response = requests.get("https://api64.ipify.org?format=json", timeout=10)
         ip_address = ip_response.json().get("ip")
 
         if not ip_address:
             return "Unable to retrieve IP address."
 
         geo_url = f"http://ip-api.com/json/{ip_address}?fields=status,message,country,region,regionName,city,zip,lat,lon,timezone,offset,mobile,query"
-        geo_response = requests.get(geo_url)
+        geo_response = requests.get(geo_url, timeout=10)
         geo_data = geo_response.json()
 
         if geo_data.get("status") != "success":
@@ -113,6 +123,9 @@ capabilities.register_function_in_registry("get_user_info", get_user_info)
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
+	"serial": True,
+	"timeout": 120,
 	"function": {
 		"name": "powershell",
 		"description": "Execute a PowerShell command if permitted.",
@@ -139,6 +152,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"read_only": True,
 	"function": {
 		"name": "get_user_info",
 		"description": "Retrieves information About the user bassed on their ip adress, including latatude and longitude",
@@ -229,6 +229,7 @@ capabilities.register_function_in_registry("shutdown_vortex", shutdown_vortex)
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
 	"function": {
 		"name": "open_link",
 		"description": "Opens a URL in the default web browser.",
@@ -247,6 +248,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
 	"function": {
 		"name": "display_markdown",
 		"description": "Renders markdown content as HTML and displays it in the browser.",
@@ -287,6 +289,8 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
+	"timeout": 120,
 	"function": {
 		"name": "restart_vortex",
 		"description": "Restarts VORTEX to apply new capabilities and reload memory.",
@@ -300,6 +304,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
 	"function": {
 		"name": "shutdown_vortex",
 		"description": "Shuts down VORTEX.",
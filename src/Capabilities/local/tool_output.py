@@ -0,0 +1,59 @@
+# Paging through tool results that were shortened to fit the context budget
+
+import src.Boring.capabilities as capabilities
+from src.Boring.tool_budget import retrieve_output, RETRIEVE_TOOL_NAME, TOOL_RESULT_MAX_TOKENS
+
+def retrieve_tool_output(handle: str, offset: int = 0, path: str = None, max_tokens: int = None):
+	"""
+	Reads more of a tool result that was shortened before it was added to the conversation.
+	
+	Parameters:
+	- handle (str): The handle from the shortened result
+	- offset (int): Character offset to continue reading from (use next_offset from the previous call)
+	- path (str): Optional dot-separated path into a JSON result, e.g. "paths./users.get" or "items.3"
+	- max_tokens (int): Optional size of the returned chunk
+	
+	Returns:
+	- dict: The requested part of the output and the offset of the next part
+	"""
+	try:
+		return retrieve_output(handle, offset=offset, max_tokens=max_tokens, path=path)
+	except Exception as e:
+		return {"error": f"Failed to retrieve tool output: {str(e)}"}
+
+# Register functions and schemas
+capabilities.register_function_in_registry(RETRIEVE_TOOL_NAME, retrieve_tool_output)
+
+capabilities.register_function_schema({
+	"type": "function",
+	"cache_ttl": 0,
+	"read_only": True,
+	# Chunks are sized to the default per-result cap; leave room for the paging fields
+	"max_result_tokens": TOOL_RESULT_MAX_TOKENS + 200,
+	"function": {
+		"name": RETRIEVE_TOOL_NAME,
+		"description": "Reads more of a tool result that was shortened (marked \"truncated\" with a handle). Page with offset/next_offset or select part of a JSON result with path.",
+		"parameters": {
+			"type": "object",
+			"properties": {
+				"handle": {
+					"type": "string",
+					"description": "The handle from the shortened tool result."
+				},
+				"offset": {
+					"type": "integer",
+					"description": "Character offset to read from; use next_offset from the previous call."
+				},
+				"path": {
+					"type": "string",
+					"description": "Dot-separated path into a JSON result (keys and list indices), e.g. \"paths./users.get\"."
+				},
+				"max_tokens": {
+					"type": "integer",
+					"description": "Maximum size of the returned chunk in tokens."
+				}
+			},
+			"required": ["handle"]
+		}
+	}
+})
@@ -0,0 +1,51 @@
+# Usage and latency reporting for LLM requests, tool executions and turns
+
+import src.Boring.capabilities as capabilities
+from src.Boring.usage import usage_store
+
+def get_usage_stats(window_minutes: int = 60, include_recent: int = 0):
+	"""
+	Reports token usage, provider latency and tool time for recent turns.
+	
+	Parameters:
+	- window_minutes (int): How far back to summarize
+	- include_recent (int): Number of most recent raw events to include
+	
+	Returns:
+	- dict: Summary totals, per-interval rollups and optionally recent events
+	"""
+	try:
+		window_minutes = max(1, int(window_minutes))
+		stats = usage_store.summary(window_seconds=window_minutes * 60)
+		stats["rollups"] = usage_store.rollups(minutes=window_minutes)
+		if include_recent:
+			stats["recent_events"] = usage_store.events(limit=max(1, int(include_recent)))
+		return {"status": "success", "usage": stats}
+	except Exception as e:
+		return {"status": "error", "message": f"Failed to read usage stats: {str(e)}"}
+
+# Register functions and schemas
+capabilities.register_function_in_registry("get_usage_stats", get_usage_stats)
+
+capabilities.register_function_schema({
+	"type": "function",
+	"cache_ttl": 0,
+	"function": {
+		"name": "get_usage_stats",
+		"description": "Reports LLM token usage, provider latency, tool execution time and turn latency for Vortex over a recent time window.",
+		"parameters": {
+			"type": "object",
+			"properties": {
+				"window_minutes": {
+					"type": "integer",
+					"description": "How many minutes back to summarize (default 60)."
+				},
+				"include_recent": {
+					"type": "integer",
+					"description": "Number of most recent raw usage events to include (default 0)."
+				}
+			},
+			"required": []
+		}
+	}
+})
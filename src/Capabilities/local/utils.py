@@ -72,6 +72,9 @@ if not _has_powershell:
     # Register schema
     capabilities.register_function_schema({
         "type": "function",
+        "side_effects": True,
+        "serial": True,
+        "timeout": 120,
         "function": {
             "name": "powershell",
             "description": "Executes a PowerShell command. Some commands require explicit permission for security reasons.",
@@ -120,6 +123,7 @@ if not _has_capability_manager:
     # Register schema
     capabilities.register_function_schema({
         "type": "function",
+        "side_effects": True,
         "function": {
             "name": "add_new_capability",
             "description": "Dynamically adds a new capability (function) to VORTEX.",
@@ -289,6 +289,8 @@ capabilities.register_function_in_registry("modify_email", modify_email)
 
 capabilities.register_function_schema({
 	"type": "function",
+	"cache_ttl": 0,
+	"read_only": True,
 	"function": {
 		"name": "get_time",
 		"description": "Gets the current time in different formats.",
@@ -302,6 +304,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
 	"function": {
 		"name": "create_event",
 		"description": "Creates a calendar event using Google Calendar API.",
@@ -328,6 +331,8 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"cache_ttl": 120,
+	"read_only": True,
 	"function": {
 		"name": "list_events",
 		"description": "Lists upcoming events from Google Calendar.",
@@ -359,6 +364,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"cache_ttl": 60,
 	"function": {
 		"name": "read_gmail",
 		"description": "Reads the most recent emails from Gmail.",
@@ -377,6 +383,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
 	"function": {
 		"name": "send_email",
 		"description": "Sends an email using Gmail.",
@@ -403,6 +410,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
 	"function": {
 		"name": "modify_email",
 		"description": "Modifies an email (mark as read, trash, etc.).",
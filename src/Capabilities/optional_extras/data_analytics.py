@@ -202,6 +202,7 @@ capabilities.register_function_in_registry("data_analytics", generate_ai_code)
 
 capabilities.register_function_schema({
 	"type": "function",
+	"timeout": 300,
 	"function": {
 		"name": "data_analytics",
 		"description": "Analyzes spreadsheet data using Python and generates statistical insights, visualizations, and reports.",
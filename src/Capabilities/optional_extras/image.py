@@ -144,6 +144,8 @@ capabilities.register_function_in_registry("analyze_image", analyze_image)
 # Register schemas for image functions
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
+	"timeout": 120,
 	"function": {
 		"name": "generate_image",
 		"description": "Generates an image using OpenAI's DALL-E API based on a text prompt.",
@@ -166,6 +168,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"timeout": 120,
 	"function": {
 		"name": "analyze_image",
 		"description": "Analyzes an image using OpenAI's Vision API.",
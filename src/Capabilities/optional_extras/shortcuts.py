@@ -128,6 +128,7 @@ capabilities.register_function_in_registry("get_shortcuts", get_shortcuts)
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
 	"function": {
 		"name": "clarify_and_launch",
 		"description": "Launches a program based on a clarified program name.",
@@ -146,6 +147,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
 	"function": {
 		"name": "launch_shortcut",
 		"description": "Launches a program shortcut.",
@@ -134,6 +134,9 @@ capabilities.register_function_in_registry("speak_text", speak_text)
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
+	"serial": True,
+	"timeout": 120,
 	"function": {
 		"name": "speak_text",
 		"description": "Converts text to speech with appropriate pauses and plays it.",
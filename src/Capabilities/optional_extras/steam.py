@@ -64,6 +64,7 @@ capabilities.register_function_schema({
 
 capabilities.register_function_schema({
 	"type": "function",
+	"side_effects": True,
 	"function":{
 		"name": "start_steam_app",
 		"description": "Opens a steam app by id",
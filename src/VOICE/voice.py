@@ -149,9 +149,10 @@ WAKE_WORD_VARIATIONS = [
 WAKE_WORD_CONFIDENCE = 0.7  # Minimum confidence level (0-1)
 
 # TTS queue setup
-tts_queue = []
+tts_queue = []  # (text, cancel token or None)
 tts_queue_lock = threading.Lock()
 tts_is_speaking = False
+tts_interrupt = threading.Event()  # Set by stop_speaking to cut off the utterance being spoken
 tts_available = False
 tts_thread = None
 
@@ -274,12 +275,21 @@ except Exception as e:
     print(f"⚠️ Error starting TTS initialization: {e}")
     tts_available = False
 
-def tts_speak(text):
-    """Add text to the TTS queue for speaking."""
+def _speech_interrupted(cancel_token=None):
+    """True once stop_speaking was called or the turn that produced the speech was cancelled."""
+    return tts_interrupt.is_set() or (cancel_token is not None and cancel_token.cancelled)
+
+def tts_speak(text, cancel_token=None):
+    """
+    Add text to the TTS queue for speaking. If cancel_token (the turn's
+    CancellationToken) fires, the text is dropped or cut off mid-utterance.
+    """
     global tts_queue, tts_thread
     
     if not text or text.strip() == "":
         return
+    if cancel_token is not None and cancel_token.cancelled:
+        return
     
     # Visual indicator that VORTEX is speaking
     print(f"{COLOR_GREEN}[💬 VORTEX Speaking...]{COLOR_RESET}")
@@ -316,7 +326,11 @@ def tts_speak(text):
             }
             
             # Make the API request
+            tts_interrupt.clear()
             response = requests.post(url, headers=headers, json=data)
+            if _speech_interrupted(cancel_token):
+                log_debug_event("OpenAI TTS: speech cancelled before playback.")
+                return
             
             if response.status_code == 200:
                 # Save the audio to a file
@@ -326,7 +340,7 @@ def tts_speak(text):
                 log_debug_event(f"OpenAI TTS: Generated audio saved to {speech_file_path}")
                 
                 # Play the generated audio
-                play_audio(speech_file_path)
+                play_audio(speech_file_path, should_stop=lambda: _speech_interrupted(cancel_token))
                 return
             else:
                 print(f"[ERROR] OpenAI TTS API request failed with status {response.status_code}: {response.text}")
@@ -337,7 +351,7 @@ def tts_speak(text):
     
     # Local TTS handling (existing code)
     with tts_queue_lock:
-        tts_queue.append(text)
+        tts_queue.append((text, cancel_token))
         log_debug_event(f"Added to TTS queue: {text[:30]}{'...' if len(text) > 30 else ''}")
     
     # Start the TTS thread if not already running
@@ -346,6 +360,16 @@ def tts_speak(text):
         tts_thread.daemon = True
         tts_thread.start()
 
+def stop_speaking():
+    """Drops all queued speech and cuts off the utterance being spoken. Returns the number dropped."""
+    with tts_queue_lock:
+        dropped = len(tts_queue)
+        tts_queue.clear()
+        tts_interrupt.set()
+    if dropped:
+        log_debug_event(f"Dropped {dropped} queued TTS item(s).")
+    return dropped
+
 def process_tts_queue():
     """Process the TTS queue in a separate thread."""
     global tts_is_speaking, tts_queue, tts_available
@@ -357,7 +381,11 @@ def process_tts_queue():
             text_to_speak = None
             with tts_queue_lock:
                 if tts_queue:
-                    text_to_speak = tts_queue.pop(0)
+                    text_to_speak, cancel_token = tts_queue.pop(0)
+                    tts_interrupt.clear()
+                    if _speech_interrupted(cancel_token):
+                        log_debug_event("Skipping speech of a cancelled turn.")
+                        continue
                     tts_is_speaking = True
                     # Only print in debug mode
                     log_debug_event(f"Processing speech: {text_to_speak[:30]}{'...' if len(text_to_speak) > 30 else ''}")
@@ -366,7 +394,10 @@ def process_tts_queue():
                 # If TTS is not available, just print the text
                 if not tts_available:
                     print(f"[TTS TEXT]: {text_to_speak}")
-                    time.sleep(len(text_to_speak) * 0.05)  # Simulate speaking time
+                    # Simulate speaking time, in short steps so a stop takes effect quickly
+                    speaking_until = time.monotonic() + len(text_to_speak) * 0.05
+                    while time.monotonic() < speaking_until and not _speech_interrupted(cancel_token):
+                        time.sleep(0.05)
                 else:
                     # Only print in debug mode
                     log_debug_event(f"Speaking: {text_to_speak}")
@@ -376,6 +407,8 @@ def process_tts_queue():
                         engine = pyttsx3.init()
                         engine.setProperty('rate', TTS_RATE)
                         engine.setProperty('volume', TTS_VOLUME)
+                        # Checked at every word; stopping the engine ends runAndWait early
+                        engine.connect('started-word', lambda name, location, length: engine.stop() if _speech_interrupted(cancel_token) else None)
                         engine.say(text_to_speak)
                         engine.runAndWait()
                         engine.stop()
@@ -590,8 +623,11 @@ def detect_wake_word(return_buffer=False, ignore_if_speaking=True):
 # ------------------------------
 # Audio Playback
 # ------------------------------
-def play_audio(mp3_path):
-    """Play an MP3 file, first converting it to WAV using ffmpeg if needed."""
+def play_audio(mp3_path, should_stop=None):
+    """
+    Play an MP3 file, first converting it to WAV using ffmpeg if needed.
+    Playback ends early once should_stop() returns True (checked every chunk).
+    """
     if not os.path.exists(mp3_path):
         print(f"Audio file not found: {mp3_path}")
         return False
@@ -620,6 +656,9 @@ def play_audio(mp3_path):
             
             # Play audio
             while len(data) > 0:
+                if should_stop and should_stop():
+                    log_debug_event("Audio playback stopped.")
+                    break
                 stream.write(data)
                 data = wf.readframes(chunk_size)
                 
@@ -821,10 +860,13 @@ def record_audio(filename="temp/recorded_audio.wav", silence_threshold=100, sile
 
     return filename
 
-async def transcribe_audio(audio_path):
+async def transcribe_audio(audio_path, on_partial=None):
     """
     Transcribes the audio file using either Whisper (OpenAI) or Vosk (offline).
     Returns the transcription text or None on error.
+    With Vosk, on_partial (if given) is called from a worker thread with the transcript
+    so far as decoding progresses, so the turn can start preparing before it finishes.
+    Whisper returns the whole transcript at once and never calls it.
     """
     if get_debug_mode():
         log_debug_event(f"Transcribing audio: {audio_path}")
@@ -859,7 +901,7 @@ async def transcribe_audio(audio_path):
         print("[ERROR] Vosk model not found for transcription")
         return None
     
-    try:
+    def decode():
         # Load the audio file
         wf = wave.open(audio_path, "rb")
         
@@ -874,6 +916,7 @@ async def transcribe_audio(audio_path):
         
         # Process the entire audio file
         transcript = ""
+        last_partial = ""
         while True:
             data = wf.readframes(4000)
             if len(data) == 0:
@@ -882,13 +925,26 @@ async def transcribe_audio(audio_path):
                 result = json.loads(rec.Result())
                 if "text" in result and result["text"]:
                     transcript += " " + result["text"]
+                    partial = transcript.strip()
+                else:
+                    continue
+            else:
+                partial = (transcript + " " + json.loads(rec.PartialResult()).get("partial", "")).strip()
+            if on_partial and partial and partial != last_partial:
+                last_partial = partial
+                on_partial(partial)
         
         # Get final result
         final_result = json.loads(rec.FinalResult())
         if "text" in final_result and final_result["text"]:
             transcript += " " + final_result["text"]
-        
-        transcript = transcript.strip()
+        return transcript.strip()
+
+    try:
+        # Decoding is CPU-bound; keep it off the event loop so speculative work can run meanwhile
+        transcript = await asyncio.to_thread(decode)
+        if transcript is None:
+            return None
         print(f"[Transcription]: '{transcript}'")
         
         return transcript if transcript else "I didn't catch that"
@@ -21,6 +21,7 @@ import logging
 import traceback
 from typing import Optional, Tuple
 import requests
+import uuid
 
 # Add the project root to the Python path to import VORTEX modules
 project_root = Path(__file__).parent.parent.parent.absolute()
@@ -88,7 +89,7 @@ setup_tts_temp_dir()
 
 # Import VORTEX functionality
 try:
-    from src.Boring.boring import call_ai_provider, add_user_input
+    from src.Boring.boring import run_turn, drop_session, SchedulerBusyError, get_scheduler_metrics, get_provider_stats, get_response_cache_stats, get_prompt_cache_stats, get_usage_summary, trace_recorder, get_intent_stats, speculative_turn, get_pipeline_stats, cancel_turn, TurnCancelledError, get_cancellation_stats, Deadline, get_deadline_stats, get_coalescer_stats, get_cascade_stats
     from src.VOICE.voice import transcribe_audio
     from src.Capabilities.debug_mode import get_debug_mode, set_debug_mode
     VORTEX_IMPORTS_OK = True
@@ -325,6 +326,33 @@ def validate_audio_data(audio_bytes, expected_format="webm"):
     
     return True, "Audio data looks valid"
 
+# A turn answers within its deadline; this covers the hand-back to the request thread
+RESPONSE_WAIT_GRACE = 5  # Seconds
+
+def wait_for_turn(response_event, deadline):
+    """
+    Waits for a turn's reply until its deadline plus RESPONSE_WAIT_GRACE. The deadline is
+    re-read after each wait, since capabilities with long declared timeouts extend it.
+    """
+    while not response_event.wait(timeout=deadline.remaining() + RESPONSE_WAIT_GRACE):
+        if deadline.expired():
+            return False
+    return True
+
+# Conversation sessions: HTTP clients are identified by a cookie, sockets by their sid
+SESSION_COOKIE_NAME = 'vortex_session'
+
+def get_http_session_id():
+    """Returns the session ID from the request cookie, or a new one if the client has none."""
+    session_id = request.cookies.get(SESSION_COOKIE_NAME)
+    return session_id or f"web-{uuid.uuid4().hex}"
+
+def with_session_cookie(response, session_id):
+    """Attaches the session cookie to a Flask response (or a (response, status) tuple)."""
+    response_obj = response[0] if isinstance(response, tuple) else response
+    response_obj.set_cookie(SESSION_COOKIE_NAME, session_id, httponly=True, samesite='Lax')
+    return response
+
 def cleanup_temp_files(file_paths, delay=0):
     """Clean up temporary files with optional delay"""
     def _cleanup():
@@ -367,8 +395,59 @@ def health():
         "whisper_available": OPENAI_AVAILABLE,
         "using_whisper": should_use_whisper()
     }
+    if VORTEX_IMPORTS_OK:
+        status["scheduler"] = get_scheduler_metrics()
+        status["providers"] = get_provider_stats()
+        status["response_cache"] = get_response_cache_stats()
+        status["prompt_cache"] = get_prompt_cache_stats()
+        status["intents"] = get_intent_stats()
+        status["pipeline"] = get_pipeline_stats()
+        status["cancellation"] = get_cancellation_stats()
+        status["deadline"] = get_deadline_stats()
+        status["coalescer"] = get_coalescer_stats()
+        status["cascade"] = get_cascade_stats()
     return jsonify(status)
 
+@app.route('/api/scheduler')
+def scheduler_metrics():
+    """Turn scheduler metrics: queue depth, wait times and in-flight turns"""
+    if not VORTEX_IMPORTS_OK:
+        return jsonify({"error": "VORTEX modules not available"}), 500
+    return jsonify(get_scheduler_metrics())
+
+@app.route('/api/usage')
+def usage_summary():
+    """Token usage, provider latency and tool time over the last `window` seconds"""
+    if not VORTEX_IMPORTS_OK:
+        return jsonify({"error": "VORTEX modules not available"}), 500
+    window = request.args.get('window', default=3600, type=int)
+    return jsonify(get_usage_summary(max(60, min(window, 86400))))
+
+@app.route('/api/traces')
+def list_traces():
+    """Summaries of recently traced turns, newest first (tracing: VORTEX_TRACE or debug mode)"""
+    if not VORTEX_IMPORTS_OK:
+        return jsonify({"error": "VORTEX modules not available"}), 500
+    limit = request.args.get('limit', default=50, type=int)
+    session_id = request.args.get('session')
+    return jsonify({"stats": trace_recorder.get_stats(), "turns": trace_recorder.list_turns(limit=max(1, limit), session_id=session_id)})
+
+@app.route('/api/traces/<turn_id>')
+def get_trace(turn_id):
+    """Full records of one traced turn"""
+    if not VORTEX_IMPORTS_OK:
+        return jsonify({"error": "VORTEX modules not available"}), 500
+    trace = trace_recorder.get_turn(turn_id)
+    if trace is None:
+        return jsonify({"error": f"Trace {turn_id} not found"}), 404
+    return jsonify(trace)
+
+def busy_response(session_id, error):
+    """503 response for a turn rejected because the scheduler queue is full"""
+    response = jsonify({"error": str(error), "busy": True})
+    response.headers['Retry-After'] = '2'
+    return with_session_cookie((response, 503), session_id)
+
 @app.route('/api/text', methods=['POST'])
 def process_text():
     """Process text input directly from the web interface"""
@@ -381,19 +460,23 @@ def process_text():
     if not VORTEX_IMPORTS_OK:
         return jsonify({"error": "VORTEX modules not available"}), 500
     
+    session_id = get_http_session_id()
+    deadline = Deadline()  # The turn budget counts from when the input arrived
+    
     try:
-        # Add user input to conversation history
-        add_user_input(text)
-        
         # Process with VORTEX and get response
         # Use a thread event to coordinate async
         response_event = threading.Event()
-        response_data = {"response": None, "error": None}
+        response_data = {"response": None, "error": None, "busy": None, "cancelled": None}
         
         async def process_async():
             try:
-                result = await call_ai_provider()
+                result = await run_turn(text, session_id, deadline=deadline)
                 response_data["response"] = result
+            except SchedulerBusyError as e:
+                response_data["busy"] = e
+            except TurnCancelledError as e:
+                response_data["cancelled"] = e.reason
             except Exception as e:
                 response_data["error"] = str(e)
             response_event.set()
@@ -402,13 +485,19 @@ def process_text():
         asyncio.run(process_async())
         
         # Wait for response with timeout
-        if not response_event.wait(timeout=60):
-            return jsonify({"error": "Request timed out"}), 504
+        if not wait_for_turn(response_event, deadline):
+            return with_session_cookie((jsonify({"error": "Request timed out"}), 504), session_id)
+            
+        if response_data["busy"]:
+            return busy_response(session_id, response_data["busy"])
+            
+        if response_data["cancelled"]:
+            return with_session_cookie(jsonify({"cancelled": True, "reason": response_data["cancelled"]}), session_id)
             
         if response_data["error"]:
-            return jsonify({"error": response_data["error"]}), 500
+            return with_session_cookie((jsonify({"error": response_data["error"]}), 500), session_id)
             
-        return jsonify({"response": response_data["response"]})
+        return with_session_cookie(jsonify({"response": response_data["response"]}), session_id)
         
     except Exception as e:
         app.logger.error(f"Error processing text: {e}")
@@ -422,6 +511,8 @@ def process_audio():
         return jsonify({"error": "VORTEX modules not available"}), 500
     
     temp_files = []  # Keep track of temp files for cleanup
+    session_id = get_http_session_id()
+    deadline = Deadline()  # Transcription counts against the turn budget
     
     try:
         # Check if we received audio data
@@ -452,12 +543,13 @@ def process_audio():
         
         # Process the audio file
         response_event = threading.Event()
-        response_data = {"transcription": None, "response": None, "error": None}
+        response_data = {"transcription": None, "response": None, "error": None, "busy": None, "cancelled": None}
         
         async def process_audio_async():
             try:
                 # Determine whether to use Whisper or local transcription
                 use_whisper = should_use_whisper()
+                speculation = None
                 
                 # Transcribe the audio
                 if use_whisper:
@@ -465,22 +557,26 @@ def process_audio():
                     transcription = await transcribe_with_whisper(str(wav_path))
                 else:
                     app.logger.info("Using local transcription")
-                    transcription = await transcribe_audio(str(wav_path))
+                    # Partial transcripts start memory retrieval and tool selection early
+                    speculation = speculative_turn(session_id)
+                    transcription = await transcribe_audio(str(wav_path), on_partial=speculation.update)
                 
                 response_data["transcription"] = transcription
                 
                 if not transcription or transcription == "I didn't catch that":
+                    if speculation: speculation.close()
                     response_data["error"] = "Could not understand audio"
                     response_event.set()
                     return
                 
-                # Add transcription to conversation history
-                add_user_input(transcription)
-                
-                # Process with VORTEX and get response
-                result = await call_ai_provider()
+                # Process the transcription as a turn in this client's session; a new utterance barges in
+                result = await run_turn(transcription, session_id, speculation=speculation, interrupt=True, deadline=deadline)
                 response_data["response"] = result
                 
+            except SchedulerBusyError as e:
+                response_data["busy"] = e
+            except TurnCancelledError as e:
+                response_data["cancelled"] = e.reason
             except Exception as e:
                 app.logger.error(f"Error processing audio: {e}")
                 app.logger.error(traceback.format_exc())
@@ -494,20 +590,30 @@ def process_audio():
         thread.start()
         
         # Wait for response with timeout
-        if not response_event.wait(timeout=60):
+        if not wait_for_turn(response_event, deadline):
             cleanup_temp_files(temp_files)
-            return jsonify({"error": "Request timed out"}), 504
+            return with_session_cookie((jsonify({"error": "Request timed out"}), 504), session_id)
         
         # Clean up temporary files with a delay to ensure they're not in use
         cleanup_temp_files(temp_files, delay=1)
         
+        if response_data["busy"]:
+            return busy_response(session_id, response_data["busy"])
+        
+        if response_data["cancelled"]:
+            return with_session_cookie(jsonify({
+                "transcription": response_data["transcription"],
+                "cancelled": True,
+                "reason": response_data["cancelled"]
+            }), session_id)
+        
         if response_data["error"]:
-            return jsonify({"error": response_data["error"]}), 500
+            return with_session_cookie((jsonify({"error": response_data["error"]}), 500), session_id)
         
-        return jsonify({
+        return with_session_cookie(jsonify({
             "transcription": response_data["transcription"],
             "response": response_data["response"]
-        })
+        }), session_id)
         
     except Exception as e:
         app.logger.error(f"Error processing audio: {e}")
@@ -515,6 +621,20 @@ def process_audio():
         cleanup_temp_files(temp_files)
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/stop', methods=['POST'])
+def stop_turn():
+    """Cancel this client's running and queued turns (the UI stop button)"""
+    if not VORTEX_IMPORTS_OK:
+        return jsonify({"error": "VORTEX modules not available"}), 500
+    session_id = get_http_session_id()
+    return with_session_cookie(jsonify({"cancelled": cancel_turn(session_id, "stop")}), session_id)
+
+@socketio.on('stop')
+def handle_stop():
+    """Cancel the running and queued turns of this socket's session"""
+    if VORTEX_IMPORTS_OK:
+        emit('status', {"status": "stopped", "cancelled": cancel_turn(request.sid, "stop")})
+
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
@@ -537,11 +657,15 @@ def handle_connect():
 def handle_disconnect():
     """Handle client disconnection"""
     app.logger.info(f"Client disconnected: {request.sid}")
+    if VORTEX_IMPORTS_OK:
+        drop_session(request.sid)
 
 @socketio.on('audio_stream')
 def handle_audio_stream(data):
     """Process audio stream from the client"""
     temp_files = []  # Keep track of temp files for cleanup
+    session_id = request.sid  # Each socket connection is its own conversation
+    deadline = Deadline()  # Transcription counts against the turn budget
     
     try:
         if not VORTEX_IMPORTS_OK:
@@ -591,6 +715,7 @@ def handle_audio_stream(data):
                 
                 # Determine whether to use Whisper or local transcription
                 use_whisper = should_use_whisper()
+                speculation = None
                 
                 # Transcribe audio
                 if use_whisper:
@@ -598,24 +723,28 @@ def handle_audio_stream(data):
                     transcription = await transcribe_with_whisper(str(wav_path))
                 else:
                     emit('status', {"status": "transcribing locally"})
-                    transcription = await transcribe_audio(str(wav_path))
+                    # Partial transcripts start memory retrieval and tool selection early
+                    speculation = speculative_turn(session_id)
+                    transcription = await transcribe_audio(str(wav_path), on_partial=speculation.update)
                 
                 if not transcription or transcription == "I didn't catch that":
+                    if speculation: speculation.close()
                     emit('error', {"message": "Could not understand audio"})
                     return
                 
                 # Send transcription to client
                 emit('transcription', {"text": transcription})
                 
-                # Add to conversation history
-                add_user_input(transcription)
-                
-                # Get AI response
-                ai_response = await call_ai_provider()
+                # Get AI response within this socket's session; a new utterance barges in
+                ai_response = await run_turn(transcription, session_id, speculation=speculation, interrupt=True, deadline=deadline)
                 
                 # Send response to client
                 emit('response', {"text": ai_response})
                 
+            except SchedulerBusyError as e:
+                emit('error', {"message": str(e), "busy": True})
+            except TurnCancelledError as e:
+                emit('cancelled', {"reason": e.reason})
             except Exception as e:
                 app.logger.error(f"Error processing stream: {e}")
                 app.logger.error(traceback.format_exc())
@@ -18,6 +18,7 @@ let recognition = null;
 let wakeWordModel = null;
 let selectedOpenAIVoice = 'nova'; // Default OpenAI voice
 let currentPlayingTTSAudio = null; // To keep track of backend TTS audio object
+let pendingTurns = 0; // Requests waiting for a response; the stop button is shown while any are
 
 // DOM Elements
 const conversationElement = document.getElementById('conversation');
@@ -35,11 +36,17 @@ const micStatusElement = document.getElementById('mic-status');
 const vortexVoiceSelectorContainerElement = document.getElementById('vortexVoiceSelector'); // Updated ID
 const voiceChipElements = document.querySelectorAll('.voice-chip'); // Get all voice chips
 const stopSpeakingButtonElement = document.getElementById('stopSpeakingButton'); // New stop button
+const stopTurnButtonElement = document.getElementById('stopTurnButton');
+const usageStatsElement = document.getElementById('usageStats');
+const traceListElement = document.getElementById('traceList');
+const traceDetailElement = document.getElementById('traceDetail');
+const refreshTracesButtonElement = document.getElementById('refreshTracesButton');
 
 // Constants
 const WAKE_WORD = 'vortex';
 const MAX_RECORDING_TIME = 15000; // 15 seconds
 const WAKE_WORD_SENSITIVITY = 0.7; // 0-1 range
+const USAGE_REFRESH_INTERVAL = 30000; // 30 seconds
 
 // Initialize application when DOM is loaded
 document.addEventListener('DOMContentLoaded', () => {
@@ -66,6 +73,14 @@ async function initializeApplication() {
         
         // Check health of backend server
         await checkServerHealth();
+
+        // Poll usage totals for the sidebar panel
+        refreshUsageStats();
+        setInterval(refreshUsageStats, USAGE_REFRESH_INTERVAL);
+
+        // Turn traces are loaded on demand
+        if (refreshTracesButtonElement) refreshTracesButtonElement.addEventListener('click', refreshTraceList);
+        refreshTraceList();
         
         // Disable wake word toggle
         wakeWordToggleElement.checked = false;
@@ -95,6 +110,9 @@ function setupEventListeners() {
     // Microphone button (for recording)
     micButtonElement.addEventListener('click', toggleRecording);
     
+    // Stop button - cancels the response in progress
+    if (stopTurnButtonElement) stopTurnButtonElement.addEventListener('click', stopCurrentTurn);
+    
     // Enable Microphone button (for permission)
     enableMicButtonElement.addEventListener('click', requestMicrophoneAccess);
 
@@ -153,19 +171,51 @@ function setupVoiceChipListeners() {
 function setupStopSpeakingButtonListener() {
     if (!stopSpeakingButtonElement) return;
 
-    stopSpeakingButtonElement.addEventListener('click', () => {
-        if (currentPlayingTTSAudio) {
-            currentPlayingTTSAudio.pause();
-            currentPlayingTTSAudio.src = ''; // Stop download/buffering
-            currentPlayingTTSAudio = null;
-            updateStopSpeakingButtonVisibility(false);
-            logDebug('Backend TTS playback stopped by user.');
-        } else if (window.speechSynthesis && speechSynthesis.speaking) {
-            speechSynthesis.cancel(); // This should trigger utterance.onend
-            // updateStopSpeakingButtonVisibility(false); // onend should handle this
-            logDebug('Browser speech synthesis stopped by user.');
-        }
-    });
+    stopSpeakingButtonElement.addEventListener('click', stopSpeechPlayback);
+}
+
+/**
+ * Stop any speech that is playing (backend TTS audio or browser speech synthesis)
+ */
+function stopSpeechPlayback() {
+    if (currentPlayingTTSAudio) {
+        currentPlayingTTSAudio.pause();
+        currentPlayingTTSAudio.src = ''; // Stop download/buffering
+        currentPlayingTTSAudio = null;
+        updateStopSpeakingButtonVisibility(false);
+        logDebug('Backend TTS playback stopped by user.');
+    } else if (window.speechSynthesis && speechSynthesis.speaking) {
+        speechSynthesis.cancel(); // This should trigger utterance.onend
+        // updateStopSpeakingButtonVisibility(false); // onend should handle this
+        logDebug('Browser speech synthesis stopped by user.');
+    }
+}
+
+/**
+ * Track requests in flight and show the stop button while there are any
+ * @param {number} delta - +1 when a request starts, -1 when it finishes
+ */
+function updatePendingTurns(delta) {
+    pendingTurns = Math.max(0, pendingTurns + delta);
+    if (stopTurnButtonElement) {
+        stopTurnButtonElement.style.display = pendingTurns > 0 ? 'flex' : 'none';
+    }
+}
+
+/**
+ * Cancel the response in progress: the server aborts the provider call and tools,
+ * and any speech that is playing stops
+ */
+async function stopCurrentTurn() {
+    stopSpeechPlayback();
+    if (socket) socket.emit('stop');
+    try {
+        const response = await fetch('/api/stop', { method: 'POST' });
+        const data = await response.json();
+        logDebug(`Stop requested (${data.cancelled || 0} turn(s) cancelled)`);
+    } catch (error) {
+        logDebug(`Error stopping turn: ${error.message}`, true);
+    }
 }
 
 /**
@@ -206,6 +256,10 @@ function initializeSocketConnection() {
         logDebug(`Status: ${data.status}`);
     });
     
+    socket.on('cancelled', (data) => {
+        logDebug(`Response cancelled (${data.reason})`);
+    });
+    
     socket.on('error', (data) => {
         logDebug(`Error: ${data.message}`, true);
     });
@@ -482,10 +536,16 @@ async function toggleRecording() {
                 addMessageToChatWindow('Processing...', 'system');
                 
                 // Send audio to server
-                const response = await fetch('/api/audio', {
-                    method: 'POST',
-                    body: formData
-                });
+                updatePendingTurns(1);
+                let response;
+                try {
+                    response = await fetch('/api/audio', {
+                        method: 'POST',
+                        body: formData
+                    });
+                } finally {
+                    updatePendingTurns(-1);
+                }
                 
                 if (!response.ok) {
                     const error = await response.json();
@@ -502,6 +562,10 @@ async function toggleRecording() {
                     addMessageToChatWindow(data.transcription, 'user');
                 }
                 
+                if (data.cancelled) {
+                    addMessageToChatWindow('Stopped.', 'system');
+                }
+                
                 if (data.response) {
                     addMessageToChatWindow(data.response, 'assistant');
                     
@@ -511,6 +575,9 @@ async function toggleRecording() {
                 }
             }
         } else {
+            // Speaking again interrupts VORTEX; the server cancels the previous turn when the new one arrives
+            stopSpeechPlayback();
+            
             // Start recording
             await audioRecorder.startRecording();
             isListening = true;
@@ -544,13 +611,19 @@ async function handleSendButtonClick() {
     
     try {
         // Send text to server
-        const response = await fetch('/api/text', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ text })
-        });
+        updatePendingTurns(1);
+        let response;
+        try {
+            response = await fetch('/api/text', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({ text })
+            });
+        } finally {
+            updatePendingTurns(-1);
+        }
         
         if (!response.ok) {
             const error = await response.json();
@@ -559,6 +632,10 @@ async function handleSendButtonClick() {
         
         const data = await response.json();
         
+        if (data.cancelled) {
+            addMessageToChatWindow('Stopped.', 'system');
+        }
+        
         // Add response to chat
         if (data.response) {
             addMessageToChatWindow(data.response, 'assistant');
@@ -681,6 +758,104 @@ async function checkServerHealth() {
     }
 }
 
+/**
+ * Fetch token usage and latency totals for the last hour and render them in the sidebar
+ */
+async function refreshUsageStats() {
+    if (!usageStatsElement) return;
+    try {
+        const response = await fetch('/api/usage?window=3600');
+        if (!response.ok) {
+            throw new Error(`Usage request failed: ${response.status}`);
+        }
+
+        const data = await response.json();
+        const formatSeconds = (value) => value === null || value === undefined ? '-' : `${value.toFixed(2)}s`;
+        const rows = [
+            ['Turns', data.turns.count],
+            ['Turn p50 / p95', `${formatSeconds(data.turns.latency_p50)} / ${formatSeconds(data.turns.latency_p95)}`],
+            ['LLM calls', data.llm.errors ? `${data.llm.calls} (${data.llm.errors} failed)` : data.llm.calls],
+            ['Prompt tokens', data.llm.prompt_tokens],
+            ['Cached tokens', data.llm.cached_tokens],
+            ['Completion tokens', data.llm.completion_tokens],
+            ['Tool calls', data.tools.calls],
+            ['Tool time', formatSeconds(data.tools.time)],
+        ];
+
+        usageStatsElement.innerHTML = '';
+        rows.forEach(([label, value]) => {
+            const row = document.createElement('div');
+            row.className = 'usage-row';
+            const labelElement = document.createElement('span');
+            labelElement.textContent = label;
+            const valueElement = document.createElement('span');
+            valueElement.textContent = value;
+            row.appendChild(labelElement);
+            row.appendChild(valueElement);
+            usageStatsElement.appendChild(row);
+        });
+    } catch (error) {
+        usageStatsElement.textContent = 'Usage stats unavailable';
+    }
+}
+
+/**
+ * Load recent turn trace summaries into the sidebar
+ */
+async function refreshTraceList() {
+    if (!traceListElement) return;
+    try {
+        const response = await fetch('/api/traces?limit=30');
+        if (!response.ok) {
+            throw new Error(`Trace request failed: ${response.status}`);
+        }
+
+        const data = await response.json();
+        traceListElement.innerHTML = '';
+        if (!data.turns.length) {
+            traceListElement.textContent = data.stats.enabled ? 'No turns traced yet' : 'Tracing is off (set VORTEX_TRACE=true or enable debug mode)';
+            return;
+        }
+        data.turns.forEach((turn) => {
+            const item = document.createElement('div');
+            item.className = 'trace-item' + (turn.status === 'ok' ? '' : ' trace-error');
+            const time = new Date(turn.started_at * 1000).toLocaleTimeString();
+            item.textContent = `${time} · ${Math.round(turn.duration_ms || 0)}ms · ${turn.requests}/${turn.tool_calls} · ${turn.input}`;
+            item.title = `${turn.requests} provider request(s), ${turn.tool_calls} tool call(s), status ${turn.status}`;
+            item.addEventListener('click', () => showTraceDetail(turn.turn_id, item));
+            traceListElement.appendChild(item);
+        });
+    } catch (error) {
+        traceListElement.textContent = 'Traces unavailable';
+    }
+}
+
+/**
+ * Show the full records of one traced turn
+ * @param {string} turnId - Trace turn ID
+ * @param {HTMLElement} item - The clicked list entry
+ */
+async function showTraceDetail(turnId, item) {
+    try {
+        const response = await fetch(`/api/traces/${encodeURIComponent(turnId)}`);
+        if (!response.ok) {
+            throw new Error(`Trace request failed: ${response.status}`);
+        }
+        const trace = await response.json();
+        traceListElement.querySelectorAll('.trace-item.selected').forEach((el) => el.classList.remove('selected'));
+        item.classList.add('selected');
+        traceDetailElement.textContent = trace.records
+            .map((record) => {
+                const { kind, t_ms, ...fields } = record;
+                return `+${t_ms}ms ${kind} ${JSON.stringify(fields)}`;
+            })
+            .join('\n');
+        traceDetailElement.style.display = 'block';
+    } catch (error) {
+        logDebug(`Failed to load trace ${turnId}: ${error.message}`, true);
+    }
+}
+
 /**
  * Use the Web Speech API to speak text
  * @param {string} text - Text to speak